@@ -0,0 +1,73 @@
+# benchmarks/parser_benchmark.py
+"""
+Measures how fast YouTube descriptions are parsed into SermonMetadata.
+
+Usage:
+    python -m benchmarks.parser_benchmark --count 10000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, Any, List
+from sermon_publisher.plugins.advanced_sermons_wp.parser import parse_sermons, normalize_book_name
+from sermon_publisher.utils.helpers import convert_to_iso
+
+BOOKS = ['Genesis', 'Psalm', 'Romans', ' 1 John', '2 Timothy', 'Song of Solomon', 'Revelation']
+SPEAKERS = ['Pastor Smith', 'Pastor Jones', 'Guest Speaker']
+ORDINALS = {1: 'st', 2: 'nd', 3: 'rd', 21: 'st', 22: 'nd', 23: 'rd', 31: 'st'}
+
+def make_videos(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Builds synthetic playlist items with the description layout the parser expects,
+    one sermon per week going back from today.
+    """
+    rng = random.Random(seed)
+    videos = []
+    for i in range(count):
+        day = date.today() - timedelta(weeks=i)
+        book = rng.choice(BOOKS)
+        description = '\n'.join([
+            f'Sermon {i}',
+            f'{book} {rng.randint(1, 20)}:{rng.randint(1, 30)}-{rng.randint(31, 40)}',
+            f'Series: {book.strip()}',
+            rng.choice(SPEAKERS),
+            f"{day.strftime('%B')} {day.day}{ORDINALS.get(day.day, 'th')}, {day.year}",
+            '',
+            'Join us on Sunday mornings at 10am.',
+        ])
+        videos.append({
+            'snippet': {
+                'title': f'Sermon {i}',
+                'description': description,
+                'resourceId': {'videoId': f'video{i:06d}'},
+                'thumbnails': {'maxres': {'url': f'https://i.ytimg.com/vi/video{i:06d}/maxresdefault.jpg'}},
+            }
+        })
+    return videos
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sermon description parser benchmark")
+    parser.add_argument('--count', type=int, default=10000, help='Number of descriptions per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs')
+    args = parser.parse_args()
+
+    videos = make_videos(args.count)
+    timings = []
+    for run in range(args.repeat):
+        # The first run starts with cold caches; later runs show the memoized cost
+        if run == 0:
+            convert_to_iso.cache_clear()
+            normalize_book_name.cache_clear()
+        start = time.perf_counter()
+        parsed, invalid = parse_sermons(videos)
+        timings.append(time.perf_counter() - start)
+
+    cold, warm = timings[0], min(timings[1:] or timings)
+    print(f"Parsed {len(parsed)} descriptions ({len(invalid)} invalid) per run.")
+    print(f"Cold caches: {cold * 1000:.1f} ms ({args.count / cold:,.0f} descriptions/s)")
+    print(f"Warm caches: {warm * 1000:.1f} ms ({args.count / warm:,.0f} descriptions/s)")
+
+if __name__ == '__main__':
+    main()
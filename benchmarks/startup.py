@@ -0,0 +1,80 @@
+# benchmarks/startup.py
+"""
+Measures how long importing the CLI takes, using python -X importtime, and fails
+if it exceeds a threshold or pulls in a library that should only load with its plugin.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --threshold 150
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Libraries that plugin modules import only once the plugin is built
+DEFERRED_MODULES = ['yt_dlp', 'googleapiclient', 'requests', 'colorlog']
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Imports a module in a fresh interpreter.
+
+    :param module: Module to import.
+    :return: Cumulative import time in microseconds of every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument('--module', default='sermon_publisher.main', help='Module to import')
+    parser.add_argument('--runs', type=int, default=5, help='Number of timed imports')
+    parser.add_argument('--threshold', type=float, default=150.0, help='Maximum median import time in ms')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to list')
+    args = parser.parse_args()
+
+    runs: List[Dict[str, int]] = [measure(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(run[args.module] for run in runs) / 1000
+
+    # Every module seen, slowest first by median cumulative time
+    names = set().union(*runs)
+    slowest = sorted(
+        ((statistics.median(run.get(name, 0) for run in runs) / 1000, name) for name in names if name != args.module),
+        reverse=True,
+    )[:args.top]
+
+    print(f"Importing {args.module}: {median_ms:.1f} ms median of {args.runs} runs (threshold {args.threshold:.0f} ms).")
+    print("Slowest imports (cumulative):")
+    for elapsed, name in slowest:
+        print(f"  {elapsed:8.1f} ms  {name}")
+
+    failures = []
+    if median_ms > args.threshold:
+        failures.append(f"import time {median_ms:.1f} ms exceeds {args.threshold:.0f} ms")
+    loaded = [name for name in DEFERRED_MODULES if name in names]
+    if loaded:
+        failures.append(f"imported at startup: {', '.join(loaded)}")
+    if failures:
+        print(f"FAIL: {'; '.join(failures)}")
+        sys.exit(1)
+    print("OK")
+
+if __name__ == '__main__':
+    main()
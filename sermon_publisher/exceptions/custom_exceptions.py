@@ -26,8 +26,24 @@ class YouTubeAPIError(SermonPublisherError):
     """Exception raised for YouTube API related errors."""
     pass
 
+class YouTubeQuotaError(YouTubeAPIError):
+    """Exception raised when a YouTube API call would exceed the quota budget."""
+    pass
+
 class SermonWPError(SermonPublisherError):
     """Exception raised for Advanced Sermons WP related errors."""
     pass
 
+class SermonParseError(SermonWPError):
+    """Exception raised when a YouTube description cannot be parsed into sermon metadata."""
+    pass
+
+class LedgerError(SermonPublisherError):
+    """Exception raised for publication ledger errors."""
+    pass
+
+class MediaManifestError(SermonPublisherError):
+    """Exception raised when a media manifest cannot be written."""
+    pass
+
 # Add more specific exceptions as needed
@@ -2,11 +2,25 @@
 
 import argparse
 import logging
+from datetime import datetime
 from sermon_publisher.workflows.workflow import Workflow
 from sermon_publisher.utils.config_manager import ConfigManager
 from sermon_publisher.utils.logging_config import setup_logging
 from sermon_publisher.exceptions.custom_exceptions import SermonPublisherError
 
+def iso_date(value: str) -> str:
+    """
+    Validates a YYYY-MM-DD command-line date.
+
+    :param value: Date string from the command line.
+    :return: The unchanged date string.
+    """
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+    return value
+
 def parse_args():
     parser = argparse.ArgumentParser(description="Sermon Publisher Client")
 
@@ -25,6 +39,61 @@ def parse_args():
         action='store_true',
         help='Run all publishing tasks'
     )
+    parser.add_argument(
+        '--full-sync',
+        action='store_true',
+        help='Scan the whole YouTube playlist instead of stopping at the last published video'
+    )
+    parser.add_argument(
+        '--since',
+        type=iso_date,
+        help='Only publish YouTube videos added on or after this date (YYYY-MM-DD)'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        help='Publish at most this many of the newest YouTube videos'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of YouTube sermons to publish in parallel (overrides sermon_workers)'
+    )
+    parser.add_argument(
+        '--download-audio',
+        metavar='DIR',
+        help='Download the audio of every sermon video not yet in DIR'
+    )
+    parser.add_argument(
+        '--download-video',
+        metavar='DIR',
+        help='Download every sermon video not yet in DIR'
+    )
+    parser.add_argument(
+        '--snapshot',
+        action='store_true',
+        help='Save a snapshot of YouTube, WordPress and Podbean for --plan'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Show the writes a run would make, computed from the saved snapshot'
+    )
+    parser.add_argument(
+        '--apply-plan',
+        action='store_true',
+        help='Make exactly the writes listed in the saved plan'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and repeat the publishing tasks on the [DAEMON] intervals'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and publish new audio files to Podbean as soon as they are written'
+    )
     parser.add_argument(
         '--log-level',
         type=str,
@@ -48,6 +117,13 @@ def main():
         logger.error(f"Failed to load configuration: {e}", exc_info=True)
         return
 
+    if args.full_sync:
+        config['incremental_sync'] = False
+    config['youtube_sync_since'] = args.since
+    config['youtube_sync_limit'] = args.limit
+    if args.workers is not None:
+        config['sermon_workers'] = args.workers
+
     try:
         workflow = Workflow(config)
     except SermonPublisherError as e:
@@ -55,18 +131,38 @@ def main():
         return
 
     try:
-        if args.all:
+        if args.watch:
+            workflow.watch_unpublished_audio()
+        elif args.daemon:
+            names = None
+            if args.youtube or args.podbean:
+                names = [name for name, selected in (('youtube', args.youtube), ('podbean', args.podbean)) if selected]
+            workflow.run_daemon(names)
+        elif args.all:
             workflow.run_all()
         else:
             if args.youtube:
                 workflow.publish_all_youtube_sermons_to_website()
             if args.podbean:
                 workflow.publish_podbean_episode()
+        if args.snapshot:
+            workflow.take_snapshot()
+        if args.plan:
+            workflow.plan()
+        if args.apply_plan:
+            workflow.apply_plan()
+        if args.download_audio:
+            workflow.download_playlist_media(args.download_audio)
+        if args.download_video:
+            workflow.download_playlist_media(args.download_video, download_video=True)
     except SermonPublisherError as e:
         logger.error(f"An error occurred during workflow execution: {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
 
+    if not (args.daemon or args.watch):
+        # The daemon and the watcher report after each run themselves
+        workflow.report_metrics()
     logger.info("Sermon Publisher finished.")
 
 if __name__ == "__main__":
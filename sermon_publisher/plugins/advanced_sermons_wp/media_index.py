@@ -0,0 +1,77 @@
+# sermon_publisher/plugins/advanced_sermons_wp/media_index.py
+
+import re
+import logging
+import threading
+from typing import Callable, Dict, List, Any, Optional
+from sermon_publisher.utils.helpers import slugify
+
+class MediaIndex:
+    """
+    In-memory index of the WordPress media library, mapping media slugs to media IDs.
+
+    Built from one paged listing on first use and updated as images are uploaded,
+    so finding a series image is a dictionary lookup instead of a media search.
+    """
+
+    # WordPress appends "-2", "-3", ... to the slug of duplicate uploads
+    DUPLICATE_SUFFIX = re.compile(r'-\d+$')
+
+    def __init__(self, fetch_media: Callable[[], List[Dict[str, Any]]]):
+        """
+        :param fetch_media: Returns every media item with at least 'id' and 'slug'.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.fetch_media = fetch_media
+        self._slugs: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if self._slugs is not None:
+                return
+            self._load(self.fetch_media())
+
+    def _load(self, items: List[Dict[str, Any]]) -> None:
+        slugs = {}
+        # Oldest first, so the original upload wins over later duplicates
+        for item in sorted(items, key=lambda item: item['id']):
+            self._add(slugs, item['slug'], item['id'])
+        self._slugs = slugs
+        self.logger.debug(f"Indexed {len(items)} media items.")
+
+    def load(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Replaces the index with known media items, e.g. from a snapshot, without fetching.
+
+        :param items: Media items with at least 'id' and 'slug'.
+        """
+        with self._lock:
+            self._load(items)
+
+    def _add(self, slugs: Dict[str, int], slug: str, media_id: int) -> None:
+        slug = slugify(slug)
+        slugs.setdefault(slug, media_id)
+        slugs.setdefault(self.DUPLICATE_SUFFIX.sub('', slug), media_id)
+
+    def get(self, name: str) -> Optional[int]:
+        """
+        Returns the ID of the media item uploaded under a name.
+
+        :param name: Upload name, e.g. a series name.
+        :return: Media ID, or None if no such media exists.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return self._slugs.get(slugify(name))
+
+    def add(self, name: str, media_id: int) -> None:
+        """
+        Adds a newly uploaded media item to the index.
+
+        :param name: Upload name, e.g. a series name.
+        :param media_id: ID of the uploaded media item.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self._add(self._slugs, name, media_id)
@@ -0,0 +1,117 @@
+# sermon_publisher/plugins/advanced_sermons_wp/parser.py
+
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, NamedTuple, Tuple
+from sermon_publisher.utils.helpers import convert_to_iso
+from sermon_publisher.exceptions.custom_exceptions import SermonParseError
+
+# Description layout, one field per line:
+#   Title
+#   Bible passage, e.g. "Romans 8:28-39" or " 1 John 4:7"
+#   Series, e.g. "Series: Romans"
+#   Speaker
+#   Date, e.g. "October 6th, 2024"
+DESCRIPTION_LINES = 5
+
+BOOK_PATTERN = re.compile(r'^\s*((?:[1-3]\s*)?[A-Za-z]+(?:\s+of\s+[A-Za-z]+)?)')
+NUMBERED_BOOK_PATTERN = re.compile(r'^([1-3])\s*')
+SERIES_PATTERN = re.compile(r'^[^:]*:\s*(.*)$')
+
+# Thumbnail sizes to use as the featured image, best first
+THUMBNAIL_SIZES = ('maxres', 'standard', 'high')
+
+class SermonMetadata(NamedTuple):
+    """
+    Sermon fields parsed and validated from a YouTube playlist item.
+    """
+    video_id: str
+    title: str
+    slug: str
+    bible_passage: str
+    book_name: str
+    series_name: str
+    speaker_name: str
+    date: str
+    image_url: str
+
+@lru_cache(maxsize=256)
+def normalize_book_name(bible_passage: str) -> str:
+    """
+    Extracts the book name from a Bible passage. Results are memoized.
+
+    :param bible_passage: Passage line, e.g. "1John 4:7" or "Song of Solomon 2:4".
+    :return: Book name with single spaces, e.g. "1 John", or "" if there is none.
+    """
+    match = BOOK_PATTERN.match(bible_passage)
+    if not match:
+        return ''
+    book_name = ' '.join(match.group(1).split())
+    return NUMBERED_BOOK_PATTERN.sub(r'\1 ', book_name)
+
+def parse_sermon(youtube_video: Dict[str, Any]) -> SermonMetadata:
+    """
+    Parses the description of a YouTube playlist item into sermon metadata.
+
+    :param youtube_video: YouTube playlist item.
+    :return: Validated sermon metadata.
+    :raises SermonParseError: If the description lacks a field or has an invalid date.
+    """
+    snippet = youtube_video['snippet']
+    video_id = snippet['resourceId']['videoId']
+    lines = [line.strip() for line in snippet.get('description', '').splitlines()]
+    if len(lines) < DESCRIPTION_LINES:
+        raise SermonParseError(
+            f"Video {video_id}: description has {len(lines)} lines, expected {DESCRIPTION_LINES}."
+        )
+
+    title, bible_passage, series_line, speaker_name, date_line = lines[:DESCRIPTION_LINES]
+    series_match = SERIES_PATTERN.match(series_line)
+    series_name = series_match.group(1).strip() if series_match else series_line
+    book_name = normalize_book_name(bible_passage)
+    date = convert_to_iso(date_line)
+
+    for field, value in (
+        ('title', title),
+        ('bible passage', book_name),
+        ('series', series_name),
+        ('speaker', speaker_name),
+        ('date', date),
+    ):
+        if not value:
+            raise SermonParseError(f"Video {video_id}: missing or invalid {field} in description.")
+
+    thumbnails = snippet.get('thumbnails', {})
+    size = next((size for size in THUMBNAIL_SIZES if size in thumbnails), None)
+    if size is None:
+        raise SermonParseError(f"Video {video_id}: no thumbnail to use as the featured image.")
+
+    return SermonMetadata(
+        video_id=video_id,
+        title=title,
+        slug=title.replace(' ', '-').lower(),
+        bible_passage=bible_passage,
+        book_name=book_name,
+        series_name=series_name,
+        speaker_name=speaker_name,
+        date=date,
+        image_url=thumbnails[size]['url'],
+    )
+
+def parse_sermons(
+    youtube_videos: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[Dict[str, Any], SermonMetadata]], List[Tuple[Dict[str, Any], SermonParseError]]]:
+    """
+    Parses a batch of YouTube playlist items, separating valid from invalid ones.
+
+    :param youtube_videos: YouTube playlist items.
+    :return: Tuple of (video, metadata) pairs and (video, error) pairs, each in input order.
+    """
+    parsed = []
+    invalid = []
+    for video in youtube_videos:
+        try:
+            parsed.append((video, parse_sermon(video)))
+        except SermonParseError as e:
+            invalid.append((video, e))
+    return parsed, invalid
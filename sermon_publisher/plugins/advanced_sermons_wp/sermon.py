@@ -1,10 +1,18 @@
 # sermon_publisher/plugins/advanced_sermons_wp/sermon.py
 
+import os
+import hashlib
 import logging
+import tempfile
+import threading
 import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from requests.auth import HTTPBasicAuth
-from sermon_publisher.utils.helpers import convert_to_iso
+from sermon_publisher.utils.helpers import detect_image_type
+from sermon_publisher.plugins.advanced_sermons_wp.taxonomy import TaxonomyResolver
+from sermon_publisher.plugins.advanced_sermons_wp.media_index import MediaIndex
+from sermon_publisher.plugins.advanced_sermons_wp.parser import SermonMetadata, parse_sermon
+from sermon_publisher.utils.http_transport import HttpTransport
 from sermon_publisher.exceptions.custom_exceptions import SermonWPError
 
 class Sermon:
@@ -12,60 +20,132 @@ class Sermon:
     Handles interactions with the Advanced Sermons WP plugin.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], http: Optional[HttpTransport] = None):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = config
+        self.http = http or HttpTransport(config)
+        self.image_cache_path = self.config.get('image_cache_path') or os.path.join(os.getcwd(), 'cache', 'images')
         self.base_url = self.config.get('aswp_url')
         self.auth = HTTPBasicAuth(self.config.get('aswp_username'), self.config.get('aswp_app_password'))
-        self.sermon_book = self.get_taxonomy_terms("sermon_book")
+        self.taxonomies = {
+            taxonomy: TaxonomyResolver(taxonomy, self.get_taxonomy_terms, self.create_taxonomy_term)
+            for taxonomy in ("sermon_series", "sermon_speaker", "sermon_book")
+        }
+        self.media_index = MediaIndex(self.get_media_items)
+        self._image_locks: Dict[str, threading.Lock] = {}
+        self._image_locks_lock = threading.Lock()
+        # Filled by preload_sermons(); None means existence checks go to WordPress
+        self.sermon_slugs: Optional[Dict[str, int]] = None
+        self.sermon_videos: Dict[str, int] = {}
 
         if not all([self.base_url, self.auth.username, self.auth.password]):
             self.logger.error("ASWP configuration is incomplete.")
             raise SermonWPError("ASWP configuration is incomplete.")
 
     def get_sermons(self) -> requests.Response:
-        return requests.get(f"{self.base_url}/sermons", auth=self.auth)
-
-    def post_youtube_sermon(self, youtube_video: Dict[str, Any], podbean_embed: str) -> None:
-        video_id = youtube_video['snippet']['resourceId']['videoId']
-        description = youtube_video['snippet']['description'].split('\n')
-        title = description[0]
-        slug = title.replace(' ', '-').lower()
+        return self.http.get(f"{self.base_url}/sermons", auth=self.auth)
+
+    def preload_sermons(self) -> None:
+        """
+        Loads the slug and YouTube video ID of every existing sermon into memory, using a
+        trimmed field projection, so existence checks during the run need no requests.
+        """
+        self._index_sermons(self.list_sermons())
+        self.logger.info(f"Preloaded {len(self.sermon_slugs)} existing sermons.")
+
+    def list_sermons(self) -> List[Dict[str, Any]]:
+        """
+        Lists every existing sermon with its slug and YouTube video ID.
+
+        :return: Dictionaries with id, slug and video_id (None if the sermon has no video).
+        """
+        sermons = self._get_paginated("sermons", {"_fields": "id,slug,meta"})
+        return [
+            {
+                'id': sermon['id'],
+                'slug': sermon['slug'],
+                'video_id': self._get_video_id_from_url((sermon.get('meta') or {}).get('asp_sermon_youtube', '')),
+            }
+            for sermon in sermons
+        ]
+
+    def _index_sermons(self, sermons: List[Dict[str, Any]]) -> None:
+        self.sermon_slugs = {sermon['slug']: sermon['id'] for sermon in sermons}
+        self.sermon_videos = {sermon['video_id']: sermon['id'] for sermon in sermons if sermon['video_id']}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Captures the sermons, taxonomy terms and media the publisher depends on.
+
+        :return: JSON-serializable snapshot for load_snapshot() and the reconciliation planner.
+        """
+        return {
+            'sermons': self.list_sermons(),
+            'taxonomies': {taxonomy: self.get_taxonomy_terms(taxonomy) for taxonomy in self.taxonomies},
+            'media': [{'id': item['id'], 'slug': item['slug']} for item in self.get_media_items()],
+        }
 
-        if self.check_sermon_exists_by_slug(slug):
+    def load_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """
+        Fills the sermon, taxonomy and media indexes from a snapshot, so publishing
+        only makes the writes that the snapshot shows to be missing.
+
+        :param snapshot: Snapshot returned by snapshot().
+        """
+        self._index_sermons(snapshot['sermons'])
+        for taxonomy, terms in snapshot['taxonomies'].items():
+            self.taxonomies[taxonomy].load(terms)
+        self.media_index.load(snapshot['media'])
+        self.logger.debug(f"Loaded snapshot of {len(self.sermon_slugs)} sermons.")
+
+    def _get_video_id_from_url(self, youtube_url: str) -> Optional[str]:
+        if 'v=' not in youtube_url:
+            return None
+        return youtube_url.split('v=', 1)[1].split('&', 1)[0] or None
+
+    def post_youtube_sermon(
+        self,
+        youtube_video: Dict[str, Any],
+        podbean_embed: str,
+        metadata: Optional[SermonMetadata] = None
+    ) -> Optional[int]:
+        """
+        Posts a YouTube video as a sermon unless a sermon with the same slug exists.
+
+        :param youtube_video: YouTube playlist item.
+        :param podbean_embed: Podbean embed HTML for the sermon audio.
+        :param metadata: The video's parsed description; parsed here if not given.
+        :return: ID of the new or already existing sermon, None if the image upload failed.
+        :raises SermonParseError: If the description cannot be parsed.
+        """
+        if metadata is None:
+            metadata = parse_sermon(youtube_video)
+        video_id = metadata.video_id
+        title = metadata.title
+        slug = metadata.slug
+
+        existing_id = self.sermon_videos.get(video_id)
+        if existing_id is None:
+            existing_id = self.get_sermon_id_by_slug(slug)
+        if existing_id is not None:
             self.logger.info(f"Sermon '{slug}' already exists. Skipping.")
-            return
+            return existing_id
 
-        image_url = youtube_video['snippet']['thumbnails']['maxres']['url']
         youtube_url = f'https://www.youtube.com/watch?v={video_id}'
-
-        bible_passage = description[1]
-        if bible_passage.startswith(' '):
-            tmp = bible_passage.strip().split(' ')
-            book_name = f"{tmp[0]} {tmp[1]}" if len(tmp) > 1 else tmp[0]
-        else:
-            book_name = bible_passage.split(' ')[0]
-
-        series_name = description[2].split(':')[1].strip() if ':' in description[2] else description[2].strip()
-        speaker_name = description[3]
-        book = self.get_book_value(book_name)
-        speaker = self.get_or_create_speaker(speaker_name)
-        series = self.get_or_create_sermon_series(series_name)
-        date = convert_to_iso(description[4])
-        media_id = self.search_media_by_filename(series_name)
-
+        book = self.get_book_value(metadata.book_name)
+        speaker = self.get_or_create_speaker(metadata.speaker_name)
+        series = self.get_or_create_sermon_series(metadata.series_name)
+        date = metadata.date
+        media_id = self.get_or_upload_series_image(metadata.series_name, metadata.image_url)
         if media_id is None:
-            image_content = self.download_image(image_url)
-            media_id = self.upload_image_to_wordpress(image_content, series_name)
-            if media_id is None:
-                self.logger.error("Failed to upload image. Cannot proceed with sermon posting.")
-                return
+            self.logger.error("Failed to upload image. Cannot proceed with sermon posting.")
+            return None
 
         meta = {
             'asp_sermon_video_type_select': 'youtube',
             'asp_sermon_youtube': youtube_url,
             'asp_sermon_audio_embed': podbean_embed,
-            'asp_sermon_bible_passage': bible_passage,
+            'asp_sermon_bible_passage': metadata.bible_passage,
         }
 
         payload = {
@@ -83,31 +163,42 @@ class Sermon:
         }
 
         try:
-            response = requests.post(f"{self.base_url}/sermons", auth=self.auth, json=payload)
+            response = self.http.post(f"{self.base_url}/sermons", auth=self.auth, json=payload)
             response.raise_for_status()
             self.logger.info(f"Sermon '{title}' posted successfully.")
+            sermon_id = response.json().get('id')
+            if self.sermon_slugs is not None:
+                self.sermon_slugs[slug] = sermon_id
+                self.sermon_videos[video_id] = sermon_id
+            return sermon_id
         except requests.RequestException as e:
             self.logger.error(f"HTTP Error: Could not publish sermon to website: {e}")
             raise SermonWPError(f"Could not publish sermon '{title}': {e}") from e
 
-    def get_taxonomy_terms(self, taxonomy: str) -> Dict[str, int]:
-        url = f"{self.base_url}/{taxonomy}"
-        all_terms = []
+    def _get_paginated(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetches every item of a WP REST collection, 100 per page.
+
+        :param endpoint: Collection endpoint relative to the base URL, e.g. "sermons".
+        :param params: Extra query parameters, e.g. a "_fields" projection.
+        :return: All items of the collection.
+        :raises SermonWPError: If a page cannot be fetched.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        all_items = []
         page = 1
 
         while True:
-            params = {
+            page_params = {
+                **(params or {}),
                 "per_page": 100,
                 "page": page,
-                "orderby": "name",
-                "order": "asc",
             }
 
             try:
-                response = requests.get(url, params=params, auth=self.auth)
+                response = self.http.get(url, params=page_params, auth=self.auth)
                 response.raise_for_status()
-                terms = response.json()
-                all_terms.extend(terms)
+                all_items.extend(response.json())
 
                 total_pages = int(response.headers.get('X-WP-TotalPages', 1))
                 if page >= total_pages:
@@ -115,156 +206,193 @@ class Sermon:
                 else:
                     page += 1
             except requests.exceptions.RequestException as e:
-                self.logger.error(f"Failed to fetch taxonomy terms: {e}")
-                raise SermonWPError(f"Failed to fetch taxonomy terms: {e}") from e
+                self.logger.error(f"Failed to fetch {endpoint}: {e}")
+                raise SermonWPError(f"Failed to fetch {endpoint}: {e}") from e
+
+        return all_items
 
+    def get_taxonomy_terms(self, taxonomy: str) -> Dict[str, int]:
+        all_terms = self._get_paginated(taxonomy, {"orderby": "name", "order": "asc"})
         self.logger.debug(f"Fetched {len(all_terms)} taxonomy terms for '{taxonomy}'.")
         return {term['name']: term['id'] for term in all_terms}
 
     def get_book_value(self, book: str) -> Optional[int]:
-        return self.sermon_book.get(book)
+        return self.taxonomies["sermon_book"].get(book)
+
+    def create_taxonomy_term(self, taxonomy: str, name: str) -> int:
+        """
+        Creates a taxonomy term, or returns the existing term's ID if WordPress reports it already exists.
 
-    def download_image(self, image_url: str) -> Optional[bytes]:
+        :param taxonomy: Taxonomy endpoint name, e.g. "sermon_speaker".
+        :param name: Term name.
+        :return: Term ID.
+        :raises requests.exceptions.RequestException: If the term cannot be created.
+        """
+        payload = {
+            'name': name,
+            'slug': name.replace(' ', '-').lower()
+        }
+        response = self.http.post(f"{self.base_url}/{taxonomy}", json=payload, auth=self.auth)
+        if response.status_code == 400:
+            # Created elsewhere since the terms were loaded
+            error = response.json()
+            if error.get('code') == 'term_exists':
+                term_id = error.get('data', {}).get('term_id')
+                self.logger.debug(f"Term '{name}' already exists in '{taxonomy}' with ID {term_id}.")
+                return term_id
+        response.raise_for_status()
+        term_id = response.json()['id']
+        self.logger.info(f"Created new '{taxonomy}' term '{name}' with ID {term_id}.")
+        return term_id
+
+    def download_image(self, image_url: str) -> Optional[str]:
+        """
+        Downloads an image into the on-disk cache in chunks, keyed by its URL, so the
+        whole image is never held in memory and the same URL is only fetched once.
+
+        :param image_url: URL of the image, e.g. a YouTube thumbnail.
+        :return: Path of the cached image, or None if the download failed.
+        """
+        cache_file = os.path.join(self.image_cache_path, hashlib.sha256(image_url.encode()).hexdigest())
+        if os.path.exists(cache_file):
+            self.logger.debug(f"Using cached image for {image_url}")
+            return cache_file
+
+        tmp_path = None
         try:
-            response = requests.get(image_url, stream=True)
-            response.raise_for_status()
+            os.makedirs(self.image_cache_path, exist_ok=True)
+            with self.http.get(image_url, stream=True) as response:
+                response.raise_for_status()
 
-            content_type = response.headers.get('Content-Type', '')
-            if not content_type.startswith('image/'):
-                self.logger.error(f"The URL does not point to an image. Content-Type: {content_type}")
-                return None
+                content_type = response.headers.get('Content-Type', '')
+                if not content_type.startswith('image/'):
+                    self.logger.error(f"The URL does not point to an image. Content-Type: {content_type}")
+                    return None
 
+                fd, tmp_path = tempfile.mkstemp(dir=self.image_cache_path, prefix='.tmp-')
+                with os.fdopen(fd, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+            os.replace(tmp_path, cache_file)
             self.logger.debug(f"Image downloaded from {image_url}")
-            return response.content
-        except requests.exceptions.RequestException as e:
+            return cache_file
+        except (requests.exceptions.RequestException, OSError) as e:
             self.logger.error(f"Failed to download image: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return None
 
+    def get_media_items(self) -> List[Dict[str, Any]]:
+        return self._get_paginated("media", {"media_type": "image", "_fields": "id,slug,source_url"})
+
     def search_media_by_filename(self, filename: str) -> Optional[int]:
         try:
-            params = {
-                'search': filename,
-                'per_page': 100,
-                'media_type': 'image'
-            }
-            response = requests.get(f"{self.base_url}/media", params=params, auth=self.auth)
-            response.raise_for_status()
-            media_items = response.json()
-
-            for item in media_items:
-                if 'slug' in item and filename.lower().replace(' ', '-') in item['slug'].lower():
-                    self.logger.debug(f"Found existing media ID {item['id']} for filename '{filename}'.")
-                    return item['id']
-            self.logger.info(f"No existing media found for filename '{filename}'.")
-            return None
-        except requests.exceptions.RequestException as e:
+            media_id = self.media_index.get(filename)
+        except SermonWPError as e:
             self.logger.error(f"Failed to search media: {e}")
             return None
 
-    def upload_image_to_wordpress(self, image_content: bytes, filename: str) -> Optional[int]:
-        if not image_content:
+        if media_id is not None:
+            self.logger.debug(f"Found existing media ID {media_id} for filename '{filename}'.")
+        else:
+            self.logger.info(f"No existing media found for filename '{filename}'.")
+        return media_id
+
+    def get_or_upload_series_image(self, series_name: str, image_url: str) -> Optional[int]:
+        """
+        Returns the media ID of a series image, uploading the image if the series has none yet.
+        Concurrent calls for the same series upload the image only once.
+
+        :param series_name: Series name, used as the image's upload name.
+        :param image_url: URL of the image to upload if none exists.
+        :return: Media ID, or None if the image could not be uploaded.
+        """
+        with self._image_locks_lock:
+            series_lock = self._image_locks.setdefault(series_name.lower(), threading.Lock())
+
+        with series_lock:
+            media_id = self.search_media_by_filename(series_name)
+            if media_id is None:
+                image_path = self.download_image(image_url)
+                media_id = self.upload_image_to_wordpress(image_path, series_name)
+                if media_id is not None:
+                    self.media_index.add(series_name, media_id)
+            return media_id
+
+    def upload_image_to_wordpress(self, image_path: Optional[str], filename: str) -> Optional[int]:
+        """
+        Streams an image file to the WP media library, detecting its real content type.
+
+        :param image_path: Path of the image file, usually returned by download_image().
+        :param filename: File name for the upload, without extension.
+        :return: The new media ID, or None if the upload failed.
+        """
+        if not image_path:
             self.logger.error("No image content to upload.")
             return None
 
-        headers = {
-            'Content-Disposition': f'attachment; filename={filename}.jpg',
-            'Content-Type': 'image/jpeg',  # Adjust if not JPEG
-        }
-
         try:
-            response = requests.post(
-                f"{self.base_url}/media",
-                headers=headers,
-                data=image_content,
-                auth=self.auth
-            )
+            with open(image_path, 'rb') as f:
+                image_type = detect_image_type(f.read(12))
+                if image_type is None:
+                    self.logger.error(f"Unsupported image format in {image_path}.")
+                    return None
+                content_type, extension = image_type
+                f.seek(0)
+
+                headers = {
+                    'Content-Disposition': f'attachment; filename={filename}.{extension}',
+                    'Content-Type': content_type,
+                }
+                response = self.http.post(
+                    f"{self.base_url}/media",
+                    headers=headers,
+                    data=f,
+                    auth=self.auth
+                )
             response.raise_for_status()
             media_id = response.json().get('id')
-            self.logger.info(f"Uploaded image '{filename}.jpg' with media ID {media_id}.")
+            self.logger.info(f"Uploaded image '{filename}.{extension}' with media ID {media_id}.")
             return media_id
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, OSError) as e:
             self.logger.error(f"Failed to upload image: {e}")
-            self.logger.debug(f"Response: {response.text}")
+            if getattr(e, 'response', None) is not None:
+                self.logger.debug(f"Response: {e.response.text}")
             return None
 
     def get_or_create_sermon_series(self, series_name: str) -> Optional[int]:
         try:
-            # Search for existing sermon series
-            params = {
-                'search': series_name,
-                'per_page': 100,
-            }
-            response = requests.get(f"{self.base_url}/sermon_series", params=params, auth=self.auth)
-            response.raise_for_status()
-            series_items = response.json()
-
-            for item in series_items:
-                if item['name'].lower() == series_name.lower():
-                    self.logger.debug(f"Found existing sermon series '{series_name}' with ID {item['id']}.")
-                    return item['id']
-
-            # Create new sermon series
-            payload = {
-                'name': series_name,
-                'slug': series_name.replace(' ', '-').lower()
-            }
-            create_response = requests.post(f"{self.base_url}/sermon_series", json=payload, auth=self.auth)
-            create_response.raise_for_status()
-            new_series = create_response.json()
-            self.logger.info(f"Created new sermon series '{series_name}' with ID {new_series['id']}.")
-            return new_series['id']
-
+            return self.taxonomies["sermon_series"].get_or_create(series_name)
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error in get_or_create_sermon_series for '{series_name}': {e}")
-            self.logger.debug(f"Response: {response.text}")
             raise SermonWPError(f"Error in get_or_create_sermon_series for '{series_name}': {e}") from e
 
     def get_or_create_speaker(self, speaker_name: str) -> Optional[int]:
         try:
-            # Search for existing speaker
-            params = {
-                'search': speaker_name,
-                'per_page': 100,
-            }
-            response = requests.get(f"{self.base_url}/sermon_speaker", params=params, auth=self.auth)
-            response.raise_for_status()
-            speaker_items = response.json()
-
-            for item in speaker_items:
-                if item['name'].lower() == speaker_name.lower():
-                    self.logger.debug(f"Found existing speaker '{speaker_name}' with ID {item['id']}.")
-                    return item['id']
-
-            # Create new speaker
-            payload = {
-                'name': speaker_name,
-                'slug': speaker_name.replace(' ', '-').lower()
-            }
-            create_response = requests.post(f"{self.base_url}/sermon_speaker", json=payload, auth=self.auth)
-            create_response.raise_for_status()
-            new_speaker = create_response.json()
-            self.logger.info(f"Created new speaker '{speaker_name}' with ID {new_speaker['id']}.")
-            return new_speaker['id']
-
+            return self.taxonomies["sermon_speaker"].get_or_create(speaker_name)
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error in get_or_create_speaker for '{speaker_name}': {e}")
-            self.logger.debug(f"Response: {response.text}")
             raise SermonWPError(f"Error in get_or_create_speaker for '{speaker_name}': {e}") from e
 
     def check_sermon_exists_by_slug(self, slug: str) -> bool:
+        return self.get_sermon_id_by_slug(slug) is not None
+
+    def get_sermon_id_by_slug(self, slug: str) -> Optional[int]:
+        if self.sermon_slugs is not None:
+            return self.sermon_slugs.get(slug)
+
         try:
             search_endpoint = f"{self.base_url}/sermons?slug={slug}"
-            response = requests.get(search_endpoint, auth=self.auth)
+            response = self.http.get(search_endpoint, auth=self.auth)
             response.raise_for_status()
             sermons = response.json()
 
-            exists = bool(sermons)
-            if exists:
+            if sermons:
                 self.logger.info(f"Sermon with slug '{slug}' exists.")
-            else:
-                self.logger.debug(f"Sermon with slug '{slug}' does not exist.")
-            return exists
+                return sermons[0]['id']
+            self.logger.debug(f"Sermon with slug '{slug}' does not exist.")
+            return None
 
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error checking sermon existence for slug '{slug}': {e}")
-            return False
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -0,0 +1,92 @@
+# sermon_publisher/plugins/advanced_sermons_wp/taxonomy.py
+
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+class TaxonomyResolver:
+    """
+    Resolves term names of one WordPress taxonomy to term IDs from memory.
+
+    All terms are fetched once on first use. Lookups are case-insensitive, concurrent
+    lookups of the same missing name are coalesced so only one term is created, and
+    created terms are added to the cache.
+    """
+
+    def __init__(
+        self,
+        taxonomy: str,
+        fetch_terms: Callable[[str], Dict[str, int]],
+        create_term: Callable[[str, str], int]
+    ):
+        """
+        :param taxonomy: Taxonomy endpoint name, e.g. "sermon_series".
+        :param fetch_terms: Returns a name -> ID mapping of every term of a taxonomy.
+        :param create_term: Creates a term in a taxonomy and returns its ID.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.taxonomy = taxonomy
+        self.fetch_terms = fetch_terms
+        self.create_term = create_term
+        self._terms: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._name_locks: Dict[str, threading.Lock] = {}
+
+    def preload(self) -> None:
+        """
+        Fetches all terms of the taxonomy, replacing the cached ones.
+        """
+        self.load(self.fetch_terms(self.taxonomy))
+
+    def load(self, terms: Dict[str, int]) -> None:
+        """
+        Replaces the cached terms with known ones, e.g. from a snapshot, without fetching.
+
+        :param terms: Name -> ID mapping of every term of the taxonomy.
+        """
+        with self._lock:
+            self._terms = {name.lower(): term_id for name, term_id in terms.items()}
+        self.logger.debug(f"Cached {len(terms)} '{self.taxonomy}' terms.")
+
+    def _ensure_loaded(self) -> None:
+        with self._load_lock:
+            if self._terms is None:
+                self.preload()
+
+    def get(self, name: str) -> Optional[int]:
+        """
+        Returns the ID of an existing term.
+
+        :param name: Term name.
+        :return: Term ID, or None if the term does not exist.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            return self._terms.get(name.lower())
+
+    def get_or_create(self, name: str) -> int:
+        """
+        Returns the ID of a term, creating the term if it does not exist yet.
+
+        :param name: Term name.
+        :return: Term ID.
+        """
+        key = name.lower()
+        self._ensure_loaded()
+        with self._lock:
+            if key in self._terms:
+                return self._terms[key]
+            name_lock = self._name_locks.setdefault(key, threading.Lock())
+
+        # Only the first caller for a name creates it; the others wait and read the cache
+        with name_lock:
+            with self._lock:
+                if key in self._terms:
+                    return self._terms[key]
+
+            term_id = self.create_term(self.taxonomy, name)
+            with self._lock:
+                self._terms[key] = term_id
+                self._name_locks.pop(key, None)
+            return term_id
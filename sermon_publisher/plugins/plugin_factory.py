@@ -1,67 +1,119 @@
-import os
 import logging
-from typing import Optional, Dict, Any
-from sermon_publisher.plugins.podbean.client import PodbeanClient
-from sermon_publisher.plugins.podbean.authenticate import PodbeanAuthenticator
-from sermon_publisher.plugins.youtube.api import YouTubeAPI
-from sermon_publisher.plugins.advanced_sermons_wp.sermon import Sermon
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from sermon_publisher.exceptions.custom_exceptions import PluginInitializationError
 
+if TYPE_CHECKING:
+    from sermon_publisher.plugins.podbean.client import PodbeanClient
+    from sermon_publisher.plugins.podbean.authenticate import PodbeanAuthenticator
+    from sermon_publisher.plugins.youtube.api import YouTubeAPI
+    from sermon_publisher.plugins.advanced_sermons_wp.sermon import Sermon
+    from sermon_publisher.utils.ledger import PublicationLedger
+    from sermon_publisher.utils.http_transport import HttpTransport
+    from sermon_publisher.utils.metrics import MetricsRegistry
+
 class PluginFactory:
     """
     Factory for creating plugin instances based on configuration.
+
+    Plugin modules are imported when a plugin is first created, so a run only
+    loads the libraries (requests, googleapiclient, yt_dlp) of the services it uses.
     """
 
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._ledger = None
+        self._http = None
+        self._metrics = None
+
+    def create_ledger(self) -> 'PublicationLedger':
+        from sermon_publisher.utils.ledger import PublicationLedger
+
+        # The ledger is shared by every plugin and strategy of a run
+        if self._ledger is None:
+            try:
+                self.logger.debug("Initializing PublicationLedger.")
+                self._ledger = PublicationLedger(self.config.get('ledger_path'))
+            except Exception as e:
+                self.logger.error(f"Failed to initialize PublicationLedger: {e}")
+                raise PluginInitializationError("PublicationLedger initialization failed.") from e
+        return self._ledger
+
+    def create_metrics(self) -> 'MetricsRegistry':
+        from sermon_publisher.utils.metrics import MetricsRegistry
+
+        # One registry collects the calls of every plugin of a run
+        if self._metrics is None:
+            self.logger.debug("Initializing MetricsRegistry.")
+            self._metrics = MetricsRegistry()
+            self._metrics.register_service('wp', self.config.get('aswp_url'))
+            self._metrics.register_service('podbean', self.config.get('podbean_api_url'))
+        return self._metrics
+
+    def create_http_transport(self) -> 'HttpTransport':
+        from sermon_publisher.utils.http_transport import HttpTransport
+
+        # One transport keeps a single connection pool per host for every plugin
+        if self._http is None:
+            self.logger.debug("Initializing HttpTransport.")
+            self._http = HttpTransport(self.config, metrics=self.create_metrics())
+        return self._http
 
-    def create_podbean_authenticator(self) -> Optional[PodbeanAuthenticator]:
+    def create_podbean_authenticator(self) -> Optional['PodbeanAuthenticator']:
         if self.config.get('podbean'):
             try:
+                from sermon_publisher.plugins.podbean.authenticate import PodbeanAuthenticator
                 self.logger.debug("Initializing PodbeanAuthenticator.")
                 key = self.config.get('podbean_api_key')
                 secret = self.config.get('podbean_api_secret')
                 podbean_api_url = self.config.get('podbean_api_url')
                 # Set token_dir to None to default to project root
-                return PodbeanAuthenticator(key, secret, podbean_api_url)
+                return PodbeanAuthenticator(key, secret, podbean_api_url, http=self.create_http_transport())
             except Exception as e:
                 self.logger.error(f"Failed to initialize PodbeanAuthenticator: {e}")
                 raise PluginInitializationError("PodbeanAuthenticator initialization failed.") from e
         self.logger.debug("PodbeanAuthenticator not enabled.")
         return None
 
-    def create_podbean_client(self) -> Optional[PodbeanClient]:
+    def create_podbean_client(self) -> Optional['PodbeanClient']:
         if self.config.get('podbean'):
             try:
+                from sermon_publisher.plugins.podbean.client import PodbeanClient
                 self.logger.debug("Initializing PodbeanClient.")
                 authenticator = self.create_podbean_authenticator()
                 if not authenticator:
                     self.logger.error("PodbeanAuthenticator is required for PodbeanClient.")
                     raise PluginInitializationError("PodbeanAuthenticator is required for PodbeanClient.")
-                return PodbeanClient(authenticator, self.config)
+                return PodbeanClient(
+                    authenticator,
+                    self.config,
+                    ledger=self.create_ledger(),
+                    http=self.create_http_transport()
+                )
             except Exception as e:
                 self.logger.error(f"Failed to initialize PodbeanClient: {e}")
                 raise PluginInitializationError("PodbeanClient initialization failed.") from e
         self.logger.debug("PodbeanClient not enabled.")
         return None
 
-    def create_youtube_api(self) -> Optional[YouTubeAPI]:
+    def create_youtube_api(self) -> Optional['YouTubeAPI']:
         if self.config.get('youtube'):
             try:
+                from sermon_publisher.plugins.youtube.api import YouTubeAPI
                 self.logger.debug("Initializing YouTubeAPI.")
-                return YouTubeAPI(self.config)
+                return YouTubeAPI(self.config, metrics=self.create_metrics())
             except Exception as e:
                 self.logger.error(f"Failed to initialize YouTubeAPI: {e}")
                 raise PluginInitializationError("YouTubeAPI initialization failed.") from e
         self.logger.debug("YouTubeAPI not enabled.")
         return None
 
-    def create_sermon(self) -> Optional[Sermon]:
+    def create_sermon(self) -> Optional['Sermon']:
         if self.config.get('advanced_sermons'):
             try:
+                from sermon_publisher.plugins.advanced_sermons_wp.sermon import Sermon
                 self.logger.debug("Initializing Sermon.")
-                return Sermon(self.config)
+                return Sermon(self.config, http=self.create_http_transport())
             except Exception as e:
                 self.logger.error(f"Failed to initialize Sermon: {e}")
                 raise PluginInitializationError("Sermon initialization failed.") from e
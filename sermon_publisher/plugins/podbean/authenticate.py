@@ -2,17 +2,45 @@ import os
 import json
 import base64
 import logging
+import tempfile
+import threading
 import requests
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, Optional
 from sermon_publisher.exceptions.custom_exceptions import PodbeanAuthError
+from sermon_publisher.utils.http_transport import HttpTransport
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; token file updates are then only atomic, not exclusive
+    fcntl = None
 
 class PodbeanAuthenticator:
     """
     Handles authentication with the Podbean API.
+
+    The access token is kept in memory and refreshed shortly before it expires, so
+    concurrent upload workers can share one authenticator. token.json is shared with
+    other runs: it is only rewritten under an exclusive file lock and replaced
+    atomically, and a token another run just obtained is reused instead of
+    requesting a new one.
     """
 
-    def __init__(self, key: str, secret: str, podbean_api_url: str, token_dir: str = None):
+    # Refresh this long before expiry, so no request is sent with an expiring token
+    REFRESH_MARGIN = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        key: str,
+        secret: str,
+        podbean_api_url: str,
+        token_dir: str = None,
+        http: HttpTransport = None
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.http = http or HttpTransport({})
         self.key = key
         self.secret = secret
         self.podbean_api_url = podbean_api_url.rstrip('/')  # Ensure no trailing slash
@@ -21,19 +49,97 @@ class PodbeanAuthenticator:
             self.token_path = os.path.join(os.getcwd(), 'token.json')
         else:
             self.token_path = os.path.join(token_dir, 'token.json')
-        self.access_token = None
+        self.lock_path = f"{self.token_path}.lock"
+        self._access_token: Optional[str] = None
+        self._expiration_time: Optional[datetime] = None
+        self._lock = threading.Lock()
         self.authenticate()
 
+    @property
+    def access_token(self) -> str:
+        return self.get_access_token()
+
     def authenticate(self) -> None:
         """
         Authenticates with Podbean API and retrieves an access token.
         """
-        if self.validate_token():
-            self.logger.debug("Existing token is valid.")
-            self.access_token = self.get_token()['access_token']
+        self.get_access_token()
+
+    def get_access_token(self) -> str:
+        """
+        Returns a valid access token, refreshing it first if it expires soon.
+
+        :return: The access token.
+        :raises PodbeanAuthError: If a new token cannot be obtained.
+        """
+        with self._lock:
+            if self._is_fresh(self._expiration_time):
+                return self._access_token
+        return self.refresh_token()
+
+    def refresh_token(self, rejected: Optional[str] = None) -> str:
+        """
+        Replaces the in-memory token with the one in token.json if that is still fresh,
+        otherwise with a new token from Podbean.
+
+        :param rejected: A token Podbean refused, which must not be reused.
+        :return: The access token.
+        :raises PodbeanAuthError: If a new token cannot be obtained.
+        """
+        with self._lock:
+            # Another worker may have refreshed while this one waited for the lock
+            if self._is_fresh(self._expiration_time) and self._access_token != rejected:
+                return self._access_token
+
+            with self._file_lock():
+                token_data = self._read_token_file()
+                if token_data and token_data['access_token'] != rejected:
+                    expiration_time = datetime.fromisoformat(token_data['expiration_time'])
+                    if self._is_fresh(expiration_time):
+                        self.logger.debug("Existing token is valid.")
+                        self._access_token = token_data['access_token']
+                        self._expiration_time = expiration_time
+                        return self._access_token
+
+                self.logger.debug("Existing token is invalid or not found. Initiating authentication.")
+                self._request_token()
+                return self._access_token
+
+    def _is_fresh(self, expiration_time: Optional[datetime]) -> bool:
+        return expiration_time is not None and datetime.now() + self.REFRESH_MARGIN < expiration_time
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
             return
+        try:
+            lock_file = open(self.lock_path, 'a')
+        except OSError as e:
+            self.logger.error(f"Failed to open token lock file: {e}")
+            raise PodbeanAuthError("Failed to lock access token.") from e
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _read_token_file(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.token_path):
+            self.logger.debug("Token file does not exist.")
+            return None
+        try:
+            token_data = self.get_token()
+            datetime.fromisoformat(token_data['expiration_time'])
+            if not token_data.get('access_token'):
+                raise KeyError('access_token')
+            return token_data
+        except (PodbeanAuthError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Failed to validate token: {e}")
+            return None
 
-        self.logger.debug("Existing token is invalid or not found. Initiating authentication.")
+    def _request_token(self) -> None:
         credentials = f"{self.key}:{self.secret}".encode()
         encoded_credentials = base64.b64encode(credentials).decode()
 
@@ -44,16 +150,22 @@ class PodbeanAuthenticator:
         self.logger.debug(f"OAuth Token URL: {oauth_token_url}")
 
         try:
-            response = requests.post(oauth_token_url, headers=headers, data=data)
+            response = self.http.post(oauth_token_url, headers=headers, data=data)
             response.raise_for_status()
             token_data = response.json()
-            self.access_token = token_data['access_token']
+            access_token = token_data['access_token']
             expires_in = token_data['expires_in']
-            self.save_token(self.access_token, expires_in)
-            self.logger.info("Authentication successful. Access token obtained.")
         except requests.RequestException as e:
             self.logger.error(f"Failed to authenticate with Podbean API: {e}")
             raise PodbeanAuthError("Authentication with Podbean API failed.") from e
+        except (ValueError, KeyError) as e:
+            self.logger.error(f"Unexpected token response from Podbean API: {e}")
+            raise PodbeanAuthError("Authentication with Podbean API failed.") from e
+
+        self._access_token = access_token
+        self._expiration_time = datetime.now() + timedelta(seconds=expires_in)
+        self.save_token(access_token, expires_in)
+        self.logger.info("Authentication successful. Access token obtained.")
 
     def validate_token(self) -> bool:
         """
@@ -61,19 +173,12 @@ class PodbeanAuthenticator:
 
         :return: True if valid, False otherwise.
         """
-        if not os.path.exists(self.token_path):
-            self.logger.debug("Token file does not exist.")
-            return False
-
-        try:
-            token_data = self.get_token()
-            expiration_time = datetime.fromisoformat(token_data['expiration_time'])
-            is_valid = datetime.now() <= expiration_time
-            self.logger.debug(f"Token valid: {is_valid}")
-            return is_valid
-        except (IOError, ValueError, KeyError) as e:
-            self.logger.warning(f"Failed to validate token: {e}")
+        token_data = self._read_token_file()
+        if not token_data:
             return False
+        is_valid = datetime.now() <= datetime.fromisoformat(token_data['expiration_time'])
+        self.logger.debug(f"Token valid: {is_valid}")
+        return is_valid
 
     def save_token(self, access_token: str, expires_in: int) -> None:
         """
@@ -88,11 +193,18 @@ class PodbeanAuthenticator:
             'expiration_time': expiration_time.isoformat()
         }
 
+        # Write to a temporary file and rename, so other runs never read a torn token
+        tmp_path = None
         try:
-            with open(self.token_path, 'w') as f:
+            directory = os.path.dirname(os.path.abspath(self.token_path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
                 json.dump(token_data, f)
+            os.replace(tmp_path, self.token_path)
             self.logger.debug(f"Token saved to {self.token_path}.")
         except IOError as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             self.logger.error(f"Failed to save token: {e}")
             raise PodbeanAuthError("Failed to save access token.") from e
 
@@ -113,8 +225,11 @@ class PodbeanAuthenticator:
 
     def remove_token(self) -> None:
         """
-        Removes the token file.
+        Removes the token file and forgets the in-memory token.
         """
+        with self._lock:
+            self._access_token = None
+            self._expiration_time = None
         try:
             if os.path.exists(self.token_path):
                 os.remove(self.token_path)
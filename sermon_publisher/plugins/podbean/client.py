@@ -1,7 +1,11 @@
+import os
 import logging
 from typing import Dict, Any, Optional
 from sermon_publisher.plugins.podbean.authenticate import PodbeanAuthenticator
 from sermon_publisher.plugins.podbean.episode import EpisodeProcessor
+from sermon_publisher.plugins.podbean.journal import UploadJournal
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.utils.http_transport import HttpTransport
 from sermon_publisher.exceptions.custom_exceptions import PodbeanClientError
 
 class PodbeanClient:
@@ -9,10 +13,18 @@ class PodbeanClient:
     Handles general interactions with the Podbean API.
     """
 
-    def __init__(self, authenticator: PodbeanAuthenticator, config: Dict[str, Any]):
+    def __init__(
+        self,
+        authenticator: PodbeanAuthenticator,
+        config: Dict[str, Any],
+        ledger: Optional[PublicationLedger] = None,
+        http: Optional[HttpTransport] = None
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.authenticator = authenticator
         self.config = config
+        self.ledger = ledger
+        self.http = http or HttpTransport(config)
         self.urls = {
             'auth_upload': f"{self.config.get('podbean_api_url')}/upload",
             'episodes': f"{self.config.get('podbean_api_url')}/episodes",
@@ -28,6 +40,9 @@ class PodbeanClient:
         """
         try:
             self.logger.debug("Initializing EpisodeProcessor.")
+            journal_path = self.config.get('podbean_upload_journal_path') or os.path.join(
+                self.config.get('unpublished_audio_path'), '.upload_journal'
+            )
             return EpisodeProcessor(
                 unpublished_audio_path=self.config.get('unpublished_audio_path'),
                 published_audio_path=self.config.get('published_audio_path'),
@@ -35,7 +50,11 @@ class PodbeanClient:
                 content=self.config.get('episode_content'),
                 publish=self.config.get('publish_audio'),
                 urls=self.urls,
-                authenticator=self.authenticator
+                authenticator=self.authenticator,
+                ledger=self.ledger,
+                http=self.http,
+                upload_workers=self.config.get('podbean_upload_workers'),
+                journal=UploadJournal(journal_path)
             )
         except Exception as e:
             self.logger.error(f"Failed to create EpisodeProcessor: {e}")
@@ -1,9 +1,16 @@
 import os
+import time
 import logging
 import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from sermon_publisher.exceptions.custom_exceptions import PodbeanEpisodeError
 from sermon_publisher.plugins.podbean.authenticate import PodbeanAuthenticator
+from sermon_publisher.plugins.podbean.journal import UploadJournal
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.utils.http_transport import HttpTransport
+from sermon_publisher.utils.helpers import file_checksum
+from sermon_publisher.utils.manifest import MediaManifest
 
 class EpisodeProcessor:
     """
@@ -18,7 +25,11 @@ class EpisodeProcessor:
         content: str, 
         publish: bool,
         urls: Dict[str, str],
-        authenticator: PodbeanAuthenticator
+        authenticator: PodbeanAuthenticator,
+        ledger: Optional[PublicationLedger] = None,
+        http: Optional[HttpTransport] = None,
+        upload_workers: int = 1,
+        journal: Optional[UploadJournal] = None
     ):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.unpublished_audio_path = unpublished_audio_path
@@ -28,11 +39,99 @@ class EpisodeProcessor:
         self.publish = publish
         self.urls = urls
         self.authenticator = authenticator
-        self.access_token = self.authenticator.access_token
+        self.ledger = ledger
+        self.http = http or HttpTransport({})
+        self.upload_workers = upload_workers or 1
+        self.journal = journal
 
-    def process_unpublished_files(self) -> None:
+    def _podbean_request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
         """
-        Processes and uploads all unpublished audio files.
+        Sends a Podbean API request with a current access token. If Podbean rejects
+        the token, it is refreshed and the request is sent once more.
+
+        :param method: HTTP method.
+        :param url: Podbean API URL.
+        :param params: Query parameters; the token is added here unless data is given.
+        :param data: Form data; the token is added here if given.
+        :return: The response.
+        """
+        token = self.authenticator.get_access_token()
+        for attempt in range(2):
+            if data is not None:
+                response = self.http.request(method, url, params=params, data={**data, 'access_token': token})
+            else:
+                response = self.http.request(method, url, params={**(params or {}), 'access_token': token})
+            if response.status_code != 401 or attempt:
+                return response
+            self.logger.info("Podbean rejected the access token. Refreshing it and retrying.")
+            token = self.authenticator.refresh_token(rejected=token)
+        return response
+
+    def process_unpublished_files(self) -> List[str]:
+        """
+        Processes and uploads all unpublished audio files, up to upload_workers files
+        at a time. Each file is authorized, uploaded and created in order.
+
+        :return: Names of the files that failed to publish.
+        """
+        files = self.list_unpublished_files()
+        if not files:
+            return []
+
+        started = time.monotonic()
+        if self.upload_workers > 1 and len(files) > 1:
+            self.logger.info(f"Uploading {len(files)} files with {self.upload_workers} workers.")
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as executor:
+                results = list(executor.map(self._process_file_timed, files))
+        else:
+            results = [self._process_file_timed(filename) for filename in files]
+
+        self._log_upload_summary(files, results, time.monotonic() - started)
+        return [filename for filename, (success, _, _) in zip(files, results) if not success]
+
+    def _process_file_timed(self, filename: str) -> Tuple[bool, int, float]:
+        filepath = os.path.join(self.unpublished_audio_path, filename)
+        try:
+            filesize = os.path.getsize(filepath)
+        except OSError:
+            filesize = 0
+        started = time.monotonic()
+        try:
+            success = self.process_file(filename)
+        except Exception as e:
+            self.logger.error(f"Error processing file {filename}: {e}")
+            success = False
+        return success, filesize, time.monotonic() - started
+
+    def _log_upload_summary(self, files: List[str], results: List[Tuple[bool, int, float]], elapsed: float) -> None:
+        total_bytes = 0
+        for filename, (success, filesize, duration) in zip(files, results):
+            status = 'published' if success else 'failed'
+            rate = filesize / duration / 1_000_000 if duration else 0.0
+            self.logger.info(
+                f"{filename}: {status}, {filesize / 1_000_000:.1f} MB in {duration:.1f}s ({rate:.2f} MB/s)"
+            )
+            if success:
+                total_bytes += filesize
+
+        published = sum(1 for success, _, _ in results if success)
+        rate = total_bytes / elapsed / 1_000_000 if elapsed else 0.0
+        self.logger.info(
+            f"Published {published} of {len(files)} files, {total_bytes / 1_000_000:.1f} MB "
+            f"in {elapsed:.1f}s ({rate:.2f} MB/s overall)."
+        )
+
+    def list_unpublished_files(self) -> List[str]:
+        """
+        Lists the audio files waiting in unpublished_audio_path.
+
+        :return: Names of the unpublished .mp3 files.
         """
         try:
             files = os.listdir(self.unpublished_audio_path)
@@ -41,43 +140,147 @@ class EpisodeProcessor:
             self.logger.error(f"Failed to list directory {self.unpublished_audio_path}: {e}")
             raise PodbeanEpisodeError(f"Failed to list directory {self.unpublished_audio_path}") from e
 
-        for filename in files:
-            if filename.lower().endswith('.mp3'):
-                filepath = os.path.join(self.unpublished_audio_path, filename)
-                self.logger.info(f"Processing file: {filename}")
-                try:
-                    success = self.upload_audio_file(filepath)
-                    if success:
-                        self.logger.info(f"File upload successful: {filename}")
-                        # Move the file to the published_audio_path
-                        new_filepath = os.path.join(self.published_audio_path, filename)
-                        os.rename(filepath, new_filepath)
-                        self.logger.debug(f"Moved file to {new_filepath}")
-                    else:
-                        self.logger.warning(f"File upload unsuccessful: {filename}")
-                except PodbeanEpisodeError as e:
-                    self.logger.error(f"Error processing file {filename}: {e}")
-
-    def upload_audio_file(self, filepath: str) -> bool:
-        """
-        Uploads an audio file to Podbean.
+        return sorted(filename for filename in files if filename.lower().endswith('.mp3'))
+
+    def process_file(self, filename: str) -> bool:
+        """
+        Uploads one unpublished audio file and moves it to published_audio_path on success.
+
+        :param filename: Name of the file in unpublished_audio_path.
+        :return: True if the episode was published, False otherwise.
+        """
+        filepath = os.path.join(self.unpublished_audio_path, filename)
+        title = self.get_episode_title(filename)
+        self.logger.info(f"Processing file: {filename}")
+        try:
+            checksum = file_checksum(filepath) if self.ledger or self.journal else None
+            published = self.find_published_episode(checksum)
+            if published:
+                # Same audio content, not just the same title, was already published
+                self.logger.warning(
+                    f"{filename} has the same audio as episode '{published['title']}', which is already "
+                    f"published. Moving it to {self.published_audio_path} without uploading."
+                )
+                episode = None
+                success = True
+            else:
+                episode = self.upload_audio_file(filepath, checksum)
+                success = episode is not None
+                if success:
+                    self.logger.info(f"File upload successful: {filename}")
+            if success:
+                new_filepath = self._get_published_path(filename)
+                os.rename(filepath, new_filepath)
+                self.logger.debug(f"Moved file to {new_filepath}")
+                if self.ledger and episode is not None:
+                    # Recorded once the file is in place, so the ledger never points at the old path
+                    self.ledger.record_episode(
+                        checksum, title, media_key=episode['media_key'], episode_id=episode['episode_id'],
+                        audio_path=new_filepath, video_id=self._get_video_id(filename)
+                    )
+                if self.journal:
+                    self.journal.clear(filename)
+            else:
+                self.logger.warning(f"File upload unsuccessful: {filename}")
+            return success
+        except PodbeanEpisodeError as e:
+            self.logger.error(f"Error processing file {filename}: {e}")
+            return False
+
+    def find_published_episode(self, checksum: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the episode already published from audio with the same content.
+
+        :param checksum: SHA-256 checksum of the audio file.
+        :return: Ledger entry of the episode, or None if the audio was never uploaded.
+        """
+        if not self.ledger or not checksum:
+            return None
+        published = self.ledger.get_episode(checksum)
+        return published if published and published.get('podbean_media_key') else None
+
+    def _get_published_path(self, filename: str) -> str:
+        """
+        Returns where to move a published file, never replacing an earlier published
+        file with the same name.
+        """
+        stem, extension = os.path.splitext(filename)
+        new_filepath = os.path.join(self.published_audio_path, filename)
+        number = 2
+        while os.path.exists(new_filepath):
+            new_filepath = os.path.join(self.published_audio_path, f"{stem} ({number}){extension}")
+            number += 1
+        if number > 2:
+            self.logger.warning(
+                f"{filename} already exists in {self.published_audio_path}. Saving it as {os.path.basename(new_filepath)}."
+            )
+        return new_filepath
+
+    def _get_video_id(self, filename: str) -> Optional[str]:
+        """
+        Returns the YouTube video an audio file was downloaded from, according to the
+        media manifest of unpublished_audio_path, if there is one.
+        """
+        entry = MediaManifest(self.unpublished_audio_path).find_by_filename(filename)
+        return entry['video_id'] if entry else None
+
+    def upload_audio_file(self, filepath: str, checksum: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Uploads an audio file to Podbean. With an upload journal, each completed stage is
+        recorded and a retry resumes after the last one, so accepted bytes are never re-sent.
 
         :param filepath: Path to the audio file.
-        :return: True if upload is successful, False otherwise.
+        :param checksum: SHA-256 checksum of the file; computed if needed and not given.
+        :return: The episode's media_key and episode_id if the upload succeeded, None otherwise.
         """
         filename = os.path.basename(filepath)
         filesize = os.path.getsize(filepath)
+        if checksum is None and (self.journal or self.ledger):
+            checksum = file_checksum(filepath)
+        entry = self._load_journal(filename, filesize, checksum)
+
+        if self.journal and self.journal.reached(entry, UploadJournal.CREATED):
+            self.logger.info(f"Episode for {filename} was already created. Skipping upload.")
+            return {'media_key': entry.get('file_key'), 'episode_id': entry.get('episode_id')}
+
+        if self.journal and self.journal.reached(entry, UploadJournal.UPLOADED):
+            file_key = entry['file_key']
+            self.logger.info(f"File {filename} was already uploaded. Resuming at episode creation.")
+        else:
+            file_key = self._upload_to_storage(filepath, filename, filesize, checksum)
+            if file_key is None:
+                return None
+
+        return self._create_episode(filename, file_key)
+
+    def _load_journal(self, filename: str, filesize: int, checksum: Optional[str]) -> Dict[str, Any]:
+        if not self.journal:
+            return {}
+        entry = self.journal.load(filename)
+        if entry and (entry.get('size') != filesize or entry.get('checksum') != checksum):
+            self.logger.info(f"File {filename} changed since its last upload attempt. Starting over.")
+            self.journal.clear(filename)
+            return {}
+        return entry
+
+    def _upload_to_storage(
+        self,
+        filepath: str,
+        filename: str,
+        filesize: int,
+        checksum: Optional[str]
+    ) -> Optional[str]:
         self.logger.debug(f"Uploading file: {filename}, Size: {filesize} bytes")
 
         params = {
-            'access_token': self.access_token,
             'filename': filename,
             'filesize': filesize,
             'content_type': 'audio/mpeg'
         }
 
         try:
-            response = requests.get(
+            response = self._podbean_request(
+                'GET',
                 self.urls['auth_upload'],
                 params=params
             )
@@ -88,15 +291,20 @@ class EpisodeProcessor:
             self.logger.debug(f"Received presigned URL for {filename}")
         except requests.RequestException as e:
             self.logger.error(f"Failed to retrieve file upload authorization for {filename}: {e}")
-            return False
+            return None
         except KeyError as e:
             self.logger.error(f"Missing key in upload authorization response: {e}")
-            return False
+            return None
+
+        if self.journal:
+            self.journal.record(
+                filename, UploadJournal.AUTHORIZED, file_key=file_key, size=filesize, checksum=checksum
+            )
 
         self.logger.info(f"Uploading file {filename} to AWS S3.")
         try:
             with open(filepath, 'rb') as f:
-                upload_response = requests.put(
+                upload_response = self.http.put(
                     presigned_url,
                     data=f
                 )
@@ -104,14 +312,18 @@ class EpisodeProcessor:
             self.logger.info(f"Upload successful: {filename}")
         except requests.RequestException as e:
             self.logger.error(f"Failed to upload file to AWS for {filename}: {e}")
-            return False
+            return None
+
+        if self.journal:
+            self.journal.record(filename, UploadJournal.UPLOADED, file_key=file_key)
+        return file_key
 
+    def _create_episode(self, filename: str, file_key: str) -> Optional[Dict[str, Any]]:
         # Create the episode in Podbean
-        title = os.path.splitext(filename)[0].replace('_', ':')
+        title = self.get_episode_title(filename)
         status = 'publish' if self.publish else 'draft'
 
         data = {
-            'access_token': self.access_token,
             'title': title,
             'content': self.content,
             'status': status,
@@ -121,16 +333,60 @@ class EpisodeProcessor:
 
         self.logger.info(f"Creating episode for {title}")
         try:
-            post_response = requests.post(
+            post_response = self._podbean_request(
+                'POST',
                 self.urls['episodes'],
                 data=data
             )
             post_response.raise_for_status()
             self.logger.info(f"Episode created successfully: {title}")
-            return True
+            try:
+                episode_id = post_response.json()['episode']['id']
+            except (ValueError, KeyError):
+                episode_id = None
+            if self.journal:
+                self.journal.record(filename, UploadJournal.CREATED, episode_id=episode_id)
+            return {'media_key': file_key, 'episode_id': episode_id}
         except requests.RequestException as e:
             self.logger.error(f"Failed to create episode for {title}: {e}")
-            return False
+            return None
+
+    def list_episodes(self) -> List[Dict[str, Any]]:
+        """
+        Lists every episode of the podcast, 100 per request.
+
+        :return: Episodes as returned by Podbean, with at least 'id' and 'title'.
+        :raises PodbeanEpisodeError: If a page cannot be fetched.
+        """
+        episodes = []
+        offset = 0
+        while True:
+            params = {'offset': offset, 'limit': 100}
+            try:
+                response = self._podbean_request('GET', self.urls['episodes'], params=params)
+                response.raise_for_status()
+                data = response.json()
+            except (requests.RequestException, ValueError) as e:
+                self.logger.error(f"Failed to list episodes at offset {offset}: {e}")
+                raise PodbeanEpisodeError("Failed to list episodes.") from e
+
+            page = data.get('episodes', [])
+            episodes.extend(page)
+            offset += len(page)
+            if not page or not data.get('has_more'):
+                break
+
+        self.logger.debug(f"Fetched {len(episodes)} episodes.")
+        return episodes
+
+    def get_episode_title(self, filename: str) -> str:
+        """
+        Derives the episode title from an audio file name.
+
+        :param filename: Audio file name, e.g. "Sermon_ Title.mp3".
+        :return: Episode title with underscores restored to colons.
+        """
+        return os.path.splitext(filename)[0].replace('_', ':')
 
     def get_podcast_id(self) -> str:
         """
@@ -138,13 +394,12 @@ class EpisodeProcessor:
 
         :return: Podcast ID if successful, 'error' otherwise.
         """
-        data = {'access_token': self.access_token}
-
         self.logger.debug("Retrieving podcast ID.")
         try:
-            response = requests.post(
+            response = self._podbean_request(
+                'POST',
                 self.urls['podcast_id'],
-                data=data
+                data={}
             )
             response.raise_for_status()
             podcast_id = response.json()['podcast']['id']
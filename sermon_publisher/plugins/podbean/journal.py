@@ -0,0 +1,102 @@
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, Any
+from sermon_publisher.exceptions.custom_exceptions import PodbeanEpisodeError
+
+class UploadJournal:
+    """
+    Records how far each audio file got through the Podbean upload, so an
+    interrupted upload resumes from its last completed stage.
+
+    Each file has its own small JSON journal, written atomically after every stage
+    and removed once the file is published and moved; the ledger keeps the
+    permanent record.
+    """
+
+    AUTHORIZED = 'authorized'
+    UPLOADED = 'uploaded'
+    CREATED = 'created'
+    STAGES = (AUTHORIZED, UPLOADED, CREATED)
+
+    def __init__(self, journal_path: str):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.journal_path = journal_path
+        try:
+            os.makedirs(self.journal_path, exist_ok=True)
+        except OSError as e:
+            self.logger.error(f"Failed to create upload journal directory {self.journal_path}: {e}")
+            raise PodbeanEpisodeError(f"Failed to create upload journal directory {self.journal_path}") from e
+
+    def _entry_path(self, filename: str) -> str:
+        return os.path.join(self.journal_path, f"{filename}.json")
+
+    def load(self, filename: str) -> Dict[str, Any]:
+        """
+        Returns the journal of a file.
+
+        :param filename: Audio file name.
+        :return: Journal entry, empty if the file has no usable journal.
+        """
+        path = self._entry_path(filename)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable upload journal for {filename}: {e}")
+            return {}
+
+    def record(self, filename: str, stage: str, **data: Any) -> Dict[str, Any]:
+        """
+        Marks a stage as completed for a file, keeping the data of earlier stages.
+
+        :param filename: Audio file name.
+        :param stage: One of STAGES.
+        :param data: Stage data, e.g. file_key, size and checksum.
+        :return: The updated journal entry.
+        """
+        entry = self.load(filename)
+        entry.update(data)
+        entry['stage'] = stage
+        entry['updated_at'] = datetime.now().isoformat()
+
+        # Write to a temporary file and rename so a crash never leaves a torn journal
+        fd, tmp_path = tempfile.mkstemp(dir=self.journal_path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._entry_path(filename))
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.logger.error(f"Failed to write upload journal for {filename}: {e}")
+            raise PodbeanEpisodeError(f"Failed to write upload journal for {filename}") from e
+
+        self.logger.debug(f"Upload journal for {filename}: stage '{stage}'.")
+        return entry
+
+    def clear(self, filename: str) -> None:
+        """
+        Removes the journal of a file.
+
+        :param filename: Audio file name.
+        """
+        try:
+            os.remove(self._entry_path(filename))
+        except FileNotFoundError:
+            pass
+
+    def reached(self, entry: Dict[str, Any], stage: str) -> bool:
+        """
+        Checks whether a journal entry has completed a stage.
+
+        :param entry: Journal entry returned by load() or record().
+        :param stage: One of STAGES.
+        :return: True if the entry's stage is the given stage or a later one.
+        """
+        current = entry.get('stage')
+        return current in self.STAGES and self.STAGES.index(current) >= self.STAGES.index(stage)
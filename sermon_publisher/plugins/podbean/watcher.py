@@ -0,0 +1,221 @@
+# sermon_publisher/plugins/podbean/watcher.py
+
+import os
+import time
+import select
+import signal
+import struct
+import logging
+import threading
+import ctypes
+import ctypes.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple, TYPE_CHECKING
+from sermon_publisher.exceptions.custom_exceptions import PodbeanEpisodeError
+
+if TYPE_CHECKING:
+    from sermon_publisher.plugins.podbean.episode import EpisodeProcessor
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')
+
+class AudioWatcher:
+    """
+    Watches unpublished_audio_path and uploads each new audio file as soon as it
+    has been fully written.
+
+    Changes are picked up with inotify on Linux and by rescanning the directory
+    every poll_interval seconds elsewhere. A file is only handed to the episode
+    processor once its size and modification time have not changed for
+    settle_time seconds, so recordings that are still being exported are never
+    uploaded.
+    """
+
+    def __init__(
+        self,
+        episode_processor: 'EpisodeProcessor',
+        settle_time: float = 10.0,
+        poll_interval: float = 2.0,
+        on_processed: Optional[Callable[[], None]] = None
+    ):
+        """
+        :param episode_processor: Processor that uploads files from unpublished_audio_path.
+        :param settle_time: Seconds a file must stay unchanged before it is uploaded.
+        :param poll_interval: Seconds between stability checks, and between rescans without inotify.
+        :param on_processed: Called after each upload attempt, e.g. to write metrics.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.episode_processor = episode_processor
+        self.path = episode_processor.unpublished_audio_path
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.on_processed = on_processed
+        # filename -> (size, mtime, monotonic time the file was last seen changing)
+        self._pending: Dict[str, Tuple[int, float, float]] = {}
+        # filename -> (size, mtime) of a failed upload, retried once the file changes
+        self._failed: Dict[str, Tuple[int, float]] = {}
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._inotify_fd: Optional[int] = None
+
+    def run(self) -> None:
+        """
+        Uploads the files already waiting, then watches for new ones until stop() is
+        called or the process receives SIGINT or SIGTERM.
+        """
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda signum, frame: self.stop())
+        self._inotify_fd = self._open_inotify()
+        if self._inotify_fd is None:
+            self.logger.info(f"Watching {self.path} by polling every {self.poll_interval}s.")
+        else:
+            self.logger.info(f"Watching {self.path} with inotify.")
+
+        workers = self.episode_processor.upload_workers
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                self._scan()
+                while not self._stop.is_set():
+                    changed = self._wait_for_changes(self.poll_interval)
+                    if changed is None:
+                        self._scan()
+                    else:
+                        for filename in changed:
+                            self._touch(filename)
+                    for filename in self._settled():
+                        executor.submit(self._upload, filename)
+        finally:
+            if self._inotify_fd is not None:
+                os.close(self._inotify_fd)
+                self._inotify_fd = None
+        self.logger.info("Stopped watching for audio files.")
+
+    def stop(self) -> None:
+        """
+        Stops watching after the current wait. Uploads in progress are finished.
+        """
+        self._stop.set()
+
+    def _open_inotify(self) -> Optional[int]:
+        libc_name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            inotify_init1 = libc.inotify_init1
+            inotify_add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError, TypeError):
+            return None
+
+        fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            self.logger.warning(f"inotify is unavailable: {os.strerror(ctypes.get_errno())}")
+            return None
+        if inotify_add_watch(fd, os.fsencode(self.path), WATCH_MASK) < 0:
+            self.logger.warning(f"Failed to watch {self.path} with inotify: {os.strerror(ctypes.get_errno())}")
+            os.close(fd)
+            return None
+        return fd
+
+    def _wait_for_changes(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Waits up to timeout seconds for changes in the directory.
+
+        :return: Names of the changed files, or None if the directory must be rescanned.
+        """
+        if self._inotify_fd is None:
+            self._stop.wait(timeout)
+            return None
+
+        readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._inotify_fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                self.logger.warning("inotify queue overflowed; rescanning the directory.")
+                return None
+            if name:
+                changed.add(os.fsdecode(name))
+        return changed
+
+    def _scan(self) -> None:
+        try:
+            filenames = self.episode_processor.list_unpublished_files()
+        except PodbeanEpisodeError:
+            return
+        for filename in filenames:
+            self._touch(filename)
+
+    def _touch(self, filename: str) -> None:
+        """
+        Starts or continues tracking a file, resetting its settle timer if it changed.
+        """
+        if not filename.lower().endswith('.mp3'):
+            return
+        try:
+            stat = os.stat(os.path.join(self.path, filename))
+        except FileNotFoundError:
+            self._pending.pop(filename, None)
+            return
+        state = (stat.st_size, stat.st_mtime)
+        with self._lock:
+            if filename in self._in_flight or self._failed.get(filename) == state:
+                return
+        previous = self._pending.get(filename)
+        if previous is None or previous[:2] != state:
+            self._pending[filename] = (*state, time.monotonic())
+
+    def _settled(self) -> Set[str]:
+        """
+        Rechecks every pending file and returns those unchanged for settle_time seconds.
+        """
+        now = time.monotonic()
+        settled = set()
+        for filename in list(self._pending):
+            self._touch(filename)
+            entry = self._pending.get(filename)
+            if entry and now - entry[2] >= self.settle_time:
+                del self._pending[filename]
+                with self._lock:
+                    self._in_flight.add(filename)
+                settled.add(filename)
+        return settled
+
+    def _upload(self, filename: str) -> None:
+        filepath = os.path.join(self.path, filename)
+        self.logger.info(f"New audio file ready: {filename}")
+        try:
+            success = self.episode_processor.process_file(filename)
+        except Exception as e:
+            self.logger.error(f"Error processing file {filename}: {e}")
+            success = False
+        with self._lock:
+            self._in_flight.discard(filename)
+            try:
+                stat = None if success else os.stat(filepath)
+            except FileNotFoundError:
+                stat = None
+            if stat:
+                self._failed[filename] = (stat.st_size, stat.st_mtime)
+                self.logger.warning(f"{filename} will be retried once it changes or the watcher restarts.")
+            else:
+                self._failed.pop(filename, None)
+        if self.on_processed:
+            self.on_processed()
@@ -1,19 +1,28 @@
 import os
 import logging
-from typing import Dict, Any, Optional, List
-import googleapiclient.discovery
-import yt_dlp
-from sermon_publisher.exceptions.custom_exceptions import YouTubeAPIError
+from typing import Dict, Any, Optional, List, Iterator
+from sermon_publisher.exceptions.custom_exceptions import YouTubeAPIError, YouTubeQuotaError
+from sermon_publisher.plugins.youtube.quota import QuotaTracker
+from sermon_publisher.plugins.youtube.playlist_index import PlaylistIndex
+from sermon_publisher.plugins.youtube.downloader import DownloadManager, download_media, get_media_title, get_video_id
+from sermon_publisher.utils.manifest import MediaManifest
+from sermon_publisher.utils.metrics import MetricsRegistry
 
 class YouTubeAPI:
     """
     A client for interacting with the YouTube API.
     """
 
-    def __init__(self, config: Dict[str, Any]):
+    # videos.list accepts at most 50 IDs per call
+    MAX_IDS_PER_REQUEST = 50
+    # Google's batch endpoint accepts at most 1000 calls per batch
+    MAX_BATCH_REQUESTS = 1000
+
+    def __init__(self, config: Dict[str, Any], metrics: Optional[MetricsRegistry] = None):
         """
         :param config: The config from ConfigManager() in main.py
         :type config: Dict[str, Any]
+        :param metrics: Registry that records each API call; a private one if None
         :return: Class object of YouTubeAPI
         :raises YouTubeAPIError: If the API Key is not found
         :raises YouTubeAPIError: If the YouTube client cannot be initialized
@@ -21,20 +30,63 @@ class YouTubeAPI:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.config = config
         self.channel = self.config.get('youtube_channel')
-        self.channel_id = self.get_channel_id()
         self.api_key = self.config.get('youtube_api_key')
+        self.metrics = metrics or MetricsRegistry()
+        self.quota = QuotaTracker(
+            daily_limit=self.config.get('youtube_daily_quota') or 10000,
+            reserve=self.config.get('youtube_quota_reserve') or 0,
+            state_path=self.config.get('youtube_quota_path')
+        )
 
         if not self.api_key:
             self.logger.error("YouTube API key is missing.")
             raise YouTubeAPIError("YouTube API key is required.")
 
         try:
+            # Deferred: googleapiclient takes a noticeable part of the CLI's startup to import
+            import googleapiclient.discovery
             self.yt = googleapiclient.discovery.build("youtube", "v3", developerKey=self.api_key)
             self.logger.debug("YouTube client initialized successfully.")
         except Exception as e:
             self.logger.error(f"Could not setup YouTube client. Check API Key.\n{e}")
             raise YouTubeAPIError("Failed to initialize YouTube client.") from e
 
+        # Resolving the channel may need the client, so it comes after the build
+        self.channel_id = self.get_channel_id()
+
+        ttl = self.config.get('playlist_cache_ttl')
+        self.playlist_index = PlaylistIndex(
+            self.list_playlists,
+            self.channel_id,
+            cache_path=self.config.get('playlist_cache_path'),
+            ttl=86400 if ttl is None else ttl
+        )
+
+    def _execute(self, request: Any, method: str, priority: str = QuotaTracker.HIGH) -> Dict[str, Any]:
+        """
+        Executes a YouTube API request after charging its quota cost.
+
+        :param request: Request built from self.yt
+        :param str method: API method, e.g. "playlistItems.list", used for quota accounting
+        :param str priority: QuotaTracker.HIGH or QuotaTracker.LOW
+        :return: The API response
+        :raises YouTubeQuotaError: If the budget does not allow the call
+        """
+        self.quota.charge(method, priority)
+        with self.metrics.track('youtube', method, getattr(request, 'method', 'GET')):
+            return request.execute()
+
+    def log_quota_usage(self) -> None:
+        """
+        Logs the YouTube quota units used today, in total and per method.
+        """
+        usage = self.quota.summary()
+        by_method = ', '.join(f"{method}: {units}" for method, units in sorted(usage['by_method'].items()))
+        self.logger.info(
+            f"YouTube quota used today: {usage['used']}/{usage['limit']} units "
+            f"({usage['remaining']} remaining){f' [{by_method}]' if by_method else ''}."
+        )
+
     def _download(self, download_video: bool, video: Dict[str, Any], save_path: str) -> None:
         """
         An internally called function to handle all downloading, video or audio
@@ -45,47 +97,75 @@ class YouTubeAPI:
         :rtype: None
         :raises YouTubeAPIError: If the download fails
         """
-        title = video['snippet']['title'].replace(':', '_')
-        video_id = video['id']
-        url = f'https://www.youtube.com/watch?v={video_id}'
-
-        if not download_video:
-            if os.path.exists(f'{save_path}/{title}.mp3'):
-                self.logger.info(f"[*] Audio already exists: {title}.mp3")
-                return
-            opts = {
-                'format': 'bestaudio/best',
-                'outtmpl': f'{save_path}/{title}',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'quiet': True,
-                'no_warnings': True,
-            }
-        else:
-            if os.path.exists(f'{save_path}/{title}.mp4'):
-                self.logger.info(f"[*] Video already exists: {title}.mp4")
-                return
-            opts = {
-                'outtmpl': f'{save_path}/{title}',
-                'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]',
-                'merge_output_format': 'mp4',
-                'quiet': True,
-                'no_warnings': True,
-            }
-
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            try:
-                ydl.download([url])
-                if download_video:
-                    self.logger.info(f"[+] Video downloaded: {title}.mp4")
-                else:
-                    self.logger.info(f"[+] Audio downloaded: {title}.mp3")
-            except Exception as e:
-                self.logger.error(f"[-] Failed to download {'video' if download_video else 'audio'} for {title}: {e}")
-                raise YouTubeAPIError(f"Download failed for {title}") from e
+        video_id = get_video_id(video)
+        title = get_media_title(video)
+        kind = 'Video' if download_video else 'Audio'
+        extension = 'mp4' if download_video else 'mp3'
+
+        manifest = MediaManifest(save_path)
+        existing = manifest.locate(video_id, title, (extension,))
+        if existing:
+            self.logger.info(f"[*] {kind} already exists: {existing['filename']}")
+            return
+        title = manifest.unique_title(video_id, title, (extension,))
+
+        try:
+            result = download_media(
+                download_video,
+                video_id,
+                title,
+                save_path,
+                self.config.get('youtube_fragment_concurrency') or 4
+            )
+            manifest.record(
+                video_id, result['filename'], title=title,
+                duration=result['duration'], checksum=result['checksum']
+            )
+            self.logger.info(f"[+] {kind} downloaded: {result['filename']}")
+        except Exception as e:
+            self.logger.error(f"[-] Failed to download {kind.lower()} for {title}: {e}")
+            raise YouTubeAPIError(f"Download failed for {title}") from e
+
+    def download_missing_from_playlist(
+        self,
+        playlist: str,
+        save_path: str,
+        download_video: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        External function used to download the media of every video in a YouTube
+        playlist that is not in the save path yet, several at a time.
+
+        :param str playlist: YouTube playlist name
+        :param str save_path: File path to save media to
+        :param bool download_video: True to download videos, False to download audio
+        :return: Results of the completed downloads
+        :raises YouTubeAPIError: If any download failed
+        :raises YouTubeQuotaError: If listing the playlist would dip into the quota reserve
+        """
+        playlist_id = self.get_playlist_id(playlist)
+        # A backfill must not spend the quota reserved for publishing the latest sermon
+        videos = [
+            video for video in self.iter_playlist_videos(playlist_id, QuotaTracker.LOW)
+            # Private and deleted videos stay in the playlist but cannot be downloaded
+            if video['snippet']['title'] not in ('Private video', 'Deleted video')
+        ]
+        manager = DownloadManager(
+            workers=self.config.get('youtube_download_workers') or 2,
+            fragment_concurrency=self.config.get('youtube_fragment_concurrency') or 4,
+            transcode_workers=self.config.get('youtube_transcode_workers'),
+            passthrough_formats=self.config.get('youtube_passthrough_audio_formats') or ('mp3',)
+        )
+        return manager.download(videos, save_path, download_video)
+
+    def get_media_manifest(self, save_path: str) -> MediaManifest:
+        """
+        External function used to query the media downloaded into a directory.
+
+        :param str save_path: File path media was saved to
+        :return: The directory's manifest, keyed by video ID
+        """
+        return MediaManifest(save_path)
 
     def download_latest_video(self, playlist: str, save_path: str) -> None:
         """
@@ -139,20 +219,97 @@ class YouTubeAPI:
         else:
             self.logger.warning(f"[-] Video with ID {video_id} not found.")
 
+    def download_audios(self, video_ids: List[str], save_path: str) -> None:
+        """
+        External function used to download the audio of many YouTube videos, fetching
+        their details 50 at a time.
+
+        :param List[str] video_ids: YouTube video IDs
+        :param str save_path: File path to save media to
+        :rtype: None
+        """
+        videos = self.get_videos_by_ids(video_ids)
+        for video in videos.values():
+            self._download(False, video, save_path)
+
+    def download_videos(self, video_ids: List[str], save_path: str) -> None:
+        """
+        External function used to download many YouTube videos, fetching their
+        details 50 at a time.
+
+        :param List[str] video_ids: YouTube video IDs
+        :param str save_path: File path to save media to
+        :rtype: None
+        """
+        videos = self.get_videos_by_ids(video_ids)
+        for video in videos.values():
+            self._download(True, video, save_path)
+
     def get_video_by_id(self, video_id: str) -> Optional[Dict[str, Any]]:
-        request = self.yt.videos().list(part='snippet', id=video_id)
-        response = request.execute()
+        video = self.get_videos_by_ids([video_id]).get(video_id)
+        if video:
+            self.logger.debug(f"Video details retrieved for ID: {video_id}")
+        return video
 
-        if not response['items']:
-            self.logger.warning(f"No video found with ID: {video_id}")
-            return None
+    def get_videos_by_ids(self, video_ids: List[str], use_batch: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetches the details of many videos, up to 50 IDs per videos.list call.
 
-        self.logger.debug(f"Video details retrieved for ID: {video_id}")
-        return response['items'][0]
+        :param List[str] video_ids: YouTube video IDs
+        :param bool use_batch: Send all videos.list calls in one batch HTTP request
+        :return: Videos keyed by ID; IDs that were not found are left out and logged
+        :raises YouTubeAPIError: If a batched call fails
+        """
+        # Keep the first occurrence of each ID, in order
+        video_ids = list(dict.fromkeys(video_ids))
+        chunks = [
+            video_ids[i:i + self.MAX_IDS_PER_REQUEST]
+            for i in range(0, len(video_ids), self.MAX_IDS_PER_REQUEST)
+        ]
+        videos: Dict[str, Dict[str, Any]] = {}
+
+        if use_batch and len(chunks) > 1:
+            failures = []
+
+            def collect(request_id, response, exception):
+                if exception is not None:
+                    failures.append(exception)
+                    return
+                for item in response.get('items', []):
+                    videos[item['id']] = item
+
+            for start in range(0, len(chunks), self.MAX_BATCH_REQUESTS):
+                batch = self.yt.new_batch_http_request(callback=collect)
+                for chunk in chunks[start:start + self.MAX_BATCH_REQUESTS]:
+                    # Every call in a batch is charged like a separate call
+                    self.quota.charge('videos.list')
+                    batch.add(self.yt.videos().list(part='snippet', id=','.join(chunk), maxResults=len(chunk)))
+                with self.metrics.track('youtube', 'batch', 'POST'):
+                    batch.execute()
+
+            if failures:
+                self.logger.error(f"{len(failures)} batched videos.list call(s) failed: {failures[0]}")
+                raise YouTubeAPIError("Failed to fetch video details.") from failures[0]
+        else:
+            for chunk in chunks:
+                request = self.yt.videos().list(part='snippet', id=','.join(chunk), maxResults=len(chunk))
+                response = self._execute(request, 'videos.list')
+                for item in response.get('items', []):
+                    videos[item['id']] = item
+
+        missing = [video_id for video_id in video_ids if video_id not in videos]
+        if missing:
+            self.logger.warning(f"No video found with ID(s): {', '.join(missing)}")
+        self.logger.debug(f"Fetched details of {len(videos)} of {len(video_ids)} videos in {len(chunks)} request(s).")
+        return videos
 
     def get_playlist_id(self, playlist_name: str) -> str:
-        playlist = self.get_playlist(playlist_name)
-        return playlist['id']
+        playlist_id = self.playlist_index.get(playlist_name)
+        if not playlist_id:
+            self.logger.error(f'Playlist "{playlist_name}" not found.')
+            raise YouTubeAPIError(f'Playlist "{playlist_name}" not found.')
+        self.logger.debug(f"Found playlist '{playlist_name}' with ID: {playlist_id}")
+        return playlist_id
 
     def get_channel_id(self) -> str:
         if not self.channel:
@@ -164,7 +321,7 @@ class YouTubeAPI:
             return self.config.get('youtube_channel_id')
 
         request = self.yt.search().list(part='snippet', q=self.channel, type='channel', maxResults=1)
-        response = request.execute()
+        response = self._execute(request, 'search.list')
 
         if 'items' in response and len(response['items']) > 0:
             channel_id = response['items'][0]['snippet']['channelId']
@@ -179,21 +336,40 @@ class YouTubeAPI:
             self.logger.error('Channel ID is not available.')
             raise YouTubeAPIError('Channel ID is not available.')
 
-        request = self.yt.playlists().list(part='snippet', channelId=self.channel_id, maxResults=25)
-        response = request.execute()
-        self.logger.debug(f"Fetched {len(response.get('items', []))} playlists.")
-        return response.get('items', [])
+        playlists = []
+        page_token = None
+        while True:
+            request = self.yt.playlists().list(
+                part='snippet',
+                channelId=self.channel_id,
+                maxResults=50,
+                pageToken=page_token
+            )
+            response = self._execute(request, 'playlists.list')
+            playlists.extend(response.get('items', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        self.logger.debug(f"Fetched {len(playlists)} playlists.")
+        return playlists
 
     def get_playlist(self, playlist_name: str) -> Dict[str, Any]:
-        playlists = self.list_playlists()
-        for playlist in playlists:
-            if playlist['snippet']['title'] == playlist_name:
-                self.logger.debug(f"Found playlist '{playlist_name}' with ID: {playlist['id']}")
-                return playlist
-        self.logger.error(f'Playlist "{playlist_name}" not found.')
-        raise YouTubeAPIError(f'Playlist "{playlist_name}" not found.')
-
-    def get_playlist_videos(self, playlist_id: str, count: int = 1) -> List[Dict[str, Any]]:
+        """
+        Resolves a playlist by title through the playlist index.
+
+        :param str playlist_name: Exact playlist title
+        :return: Playlist resource with 'id' and 'snippet.title'
+        :raises YouTubeAPIError: If the channel has no such playlist
+        """
+        playlist_id = self.get_playlist_id(playlist_name)
+        return {'id': playlist_id, 'snippet': {'title': playlist_name}}
+
+    def get_playlist_videos(
+        self,
+        playlist_id: str,
+        count: int = 1,
+        priority: str = QuotaTracker.HIGH
+    ) -> List[Dict[str, Any]]:
         videos = []
         next_page = None
 
@@ -205,7 +381,7 @@ class YouTubeAPI:
                 pageToken=next_page
             )
 
-            response = request.execute()
+            response = self._execute(request, 'playlistItems.list', priority)
             items = response.get('items', [])
 
             if not items:
@@ -225,7 +401,35 @@ class YouTubeAPI:
 
         return videos[:count]
 
-    def get_playlist_video_count(self, playlist_id: str) -> int:
+    def iter_playlist_videos(self, playlist_id: str, priority: str = QuotaTracker.HIGH) -> Iterator[Dict[str, Any]]:
+        """
+        Yields playlist items newest first, fetching one page of 50 at a time
+        so callers can stop paging as soon as they have what they need.
+
+        :param str playlist_id: YouTube playlist ID
+        :param str priority: QuotaTracker.HIGH or QuotaTracker.LOW
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        next_page = None
+
+        while True:
+            request = self.yt.playlistItems().list(
+                part="snippet",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=next_page
+            )
+
+            response = self._execute(request, 'playlistItems.list', priority)
+            items = response.get('items', [])
+            self.logger.debug(f"Fetched {len(items)} videos from playlist.")
+            yield from items
+
+            next_page = response.get('nextPageToken')
+            if not items or not next_page:
+                break
+
+    def get_playlist_video_count(self, playlist_id: str, priority: str = QuotaTracker.HIGH) -> int:
         request = self.yt.playlistItems().list(
             part="contentDetails",
             playlistId=playlist_id,
@@ -233,10 +437,12 @@ class YouTubeAPI:
         )
 
         try:
-            response = request.execute()
+            response = self._execute(request, 'playlistItems.list', priority)
             count = response['pageInfo']['totalResults']
             self.logger.debug(f"Total videos in playlist {playlist_id}: {count}")
             return count
+        except YouTubeQuotaError:
+            raise
         except Exception as e:
             self.logger.error(f'Could not retrieve video count for playlist {playlist_id}: {e}')
             raise YouTubeAPIError(f'Could not retrieve video count: {e}') from e
@@ -253,7 +459,69 @@ class YouTubeAPI:
         videos = self.get_playlist_videos(playlist_id, 1)
         return videos[0] if videos else None
 
-    def get_all_youtube_videos_from_playlist(self, playlist: str) -> List[Dict[str, Any]]:
+    def get_all_youtube_videos_from_playlist(
+        self,
+        playlist: str,
+        priority: str = QuotaTracker.LOW
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches every video of a playlist. Full rescans are low priority by default, so
+        they are refused before they can eat into the quota reserve.
+
+        :param str playlist: YouTube playlist name
+        :param str priority: QuotaTracker.HIGH or QuotaTracker.LOW
+        :rtype: List[Dict[str, Any]]
+        :raises YouTubeQuotaError: If the remaining quota does not allow the rescan
+        """
+        playlist_id = self.get_playlist_id(playlist)
+        video_count = self.get_playlist_video_count(playlist_id, priority)
+        # Refuse up front rather than failing partway through the rescan
+        pages = -(-video_count // 50)
+        if priority == QuotaTracker.LOW and self.quota.remaining() - pages < self.quota.reserve:
+            raise YouTubeQuotaError(
+                f"Not enough YouTube quota to rescan {video_count} videos: {self.quota.remaining()} units left today."
+            )
+        return self.get_playlist_videos(playlist_id, video_count, priority)
+
+    def get_new_youtube_videos_from_playlist(
+        self,
+        playlist: str,
+        high_water_mark: Optional[Dict[str, str]] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches the videos added to a playlist after the high-water mark, stopping
+        at the first already-known video instead of paging through the whole playlist.
+
+        :param str playlist: YouTube playlist name
+        :param high_water_mark: Newest video seen by a previous sync, with 'video_id' and 'published_at' keys
+        :param since: Only return videos published on or after this ISO 8601 date
+        :param limit: Return at most this many videos
+        :return: New videos, newest first
+        :rtype: List[Dict[str, Any]]
+        """
         playlist_id = self.get_playlist_id(playlist)
-        video_count = self.get_playlist_video_count(playlist_id)
-        return self.get_playlist_videos(playlist_id, video_count)
+        known_video_id = high_water_mark.get('video_id') if high_water_mark else None
+        known_published_at = high_water_mark.get('published_at') if high_water_mark else None
+        videos = []
+
+        for video in self.iter_playlist_videos(playlist_id):
+            video_id = video['snippet']['resourceId']['videoId']
+            # ISO 8601 UTC timestamps compare correctly as strings
+            published_at = video['snippet'].get('publishedAt', '')
+
+            if video_id == known_video_id or (known_published_at and published_at <= known_published_at):
+                self.logger.debug(f"Reached known video {video_id}. Stopping playlist sync.")
+                break
+            if since and published_at < since:
+                self.logger.debug(f"Reached video published before {since}. Stopping playlist sync.")
+                break
+
+            videos.append(video)
+            if limit and len(videos) >= limit:
+                self.logger.debug(f"Reached limit of {limit} videos. Stopping playlist sync.")
+                break
+
+        self.logger.info(f"Found {len(videos)} new videos in playlist '{playlist}'.")
+        return videos
@@ -0,0 +1,460 @@
+# sermon_publisher/plugins/youtube/downloader.py
+
+import os
+import time
+import queue
+import logging
+import threading
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+from sermon_publisher.exceptions.custom_exceptions import YouTubeAPIError
+from sermon_publisher.utils.manifest import MediaManifest
+from sermon_publisher.utils.helpers import file_checksum
+
+def get_video_id(video: Dict[str, Any]) -> str:
+    """
+    Returns the video ID of a video or playlist item resource.
+
+    :param video: Resource from videos.list or playlistItems.list.
+    :return: YouTube video ID.
+    """
+    # Playlist items carry their own ID; the video's is in the resourceId
+    return video['snippet'].get('resourceId', {}).get('videoId', video['id'])
+
+def get_media_title(video: Dict[str, Any]) -> str:
+    """
+    Returns the file name stem media of a video is saved under.
+
+    :param video: Resource from videos.list or playlistItems.list.
+    :return: Video title with ':' replaced, as Podbean episode titles expect.
+    """
+    return video['snippet']['title'].replace(':', '_')
+
+def build_download_options(
+    download_video: bool,
+    save_path: str,
+    title: str,
+    fragment_concurrency: int = 1,
+    extract_audio: bool = True
+) -> Dict[str, Any]:
+    """
+    Builds the yt-dlp options for one download.
+
+    :param download_video: True for an MP4 video, False for MP3 audio.
+    :param save_path: Directory to save the media to.
+    :param title: File name stem, without extension.
+    :param fragment_concurrency: Fragments of a DASH/HLS stream downloaded at once.
+    :param extract_audio: False to keep the downloaded audio stream in its source
+        format and extension, for transcoding in a separate stage.
+    :return: Options for yt_dlp.YoutubeDL.
+    """
+    opts = {
+        'outtmpl': f'{save_path}/{title}' if extract_audio or download_video else f'{save_path}/{title}.%(ext)s',
+        'concurrent_fragment_downloads': max(1, fragment_concurrency),
+        'quiet': True,
+        'no_warnings': True,
+    }
+    if download_video:
+        opts.update({
+            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]',
+            'merge_output_format': 'mp4',
+        })
+    elif not extract_audio:
+        opts['format'] = 'bestaudio/best'
+    else:
+        opts.update({
+            'format': 'bestaudio/best',
+            'postprocessors': [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': 'mp3',
+                'preferredquality': '192',
+            }],
+        })
+    return opts
+
+def download_media(
+    download_video: bool,
+    video_id: str,
+    title: str,
+    save_path: str,
+    fragment_concurrency: int = 1,
+    extract_audio: bool = True
+) -> Dict[str, Any]:
+    """
+    Downloads the media of one video. Runs in DownloadManager's worker processes,
+    so it only takes and returns picklable values.
+
+    :param download_video: True for an MP4 video, False for MP3 audio.
+    :param video_id: YouTube video ID.
+    :param title: File name stem, without extension.
+    :param save_path: Directory to save the media to.
+    :param fragment_concurrency: Fragments of a DASH/HLS stream downloaded at once.
+    :param extract_audio: False to skip the MP3 conversion and keep the source audio.
+    :return: Dictionary with video_id, title, filename, bytes, elapsed seconds, duration
+        and, unless the source audio was kept for transcoding, the file's checksum.
+    """
+    logger = logging.getLogger('DownloadManager')
+    downloaded = {}
+    reported = {}
+
+    def progress(d: Dict[str, Any]) -> None:
+        # A merged video is downloaded as separate video and audio streams
+        stream = d.get('filename')
+        if d['status'] == 'finished':
+            downloaded[stream] = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+            return
+        if d['status'] != 'downloading':
+            return
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        if not total:
+            return
+        quarter = int(d.get('downloaded_bytes', 0) * 4 / total)
+        if quarter > reported.get(stream, 0) and quarter < 4:
+            reported[stream] = quarter
+            logger.debug(f"[*] {title}: {quarter * 25}% of {total / 1024 / 1024:.1f} MB")
+
+    # Deferred: yt_dlp is slow to import and only the download workers need it
+    import yt_dlp
+
+    opts = build_download_options(download_video, save_path, title, fragment_concurrency, extract_audio)
+    opts['progress_hooks'] = [progress]
+    start = time.monotonic()
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(f'https://www.youtube.com/watch?v={video_id}', download=True)
+
+    if download_video or extract_audio:
+        filename = f"{title}.{'mp4' if download_video else 'mp3'}"
+    else:
+        # The source extension is only known once the stream has been downloaded
+        if not downloaded:
+            raise YouTubeAPIError(f"No audio stream was downloaded for {title}")
+        filename = os.path.basename(next(reversed(downloaded)))
+    return {
+        'video_id': video_id,
+        'title': title,
+        'filename': filename,
+        'bytes': sum(downloaded.values()),
+        'elapsed': time.monotonic() - start,
+        'duration': (info or {}).get('duration'),
+        'checksum': file_checksum(os.path.join(save_path, filename)) if download_video or extract_audio else None,
+    }
+
+def transcode_audio(save_path: str, source: str, title: str, quality: str = '192') -> Dict[str, Any]:
+    """
+    Converts a downloaded audio stream to MP3 with FFmpeg and removes the source.
+    Runs in DownloadManager's transcode processes.
+
+    :param save_path: Directory the source is in and the MP3 is saved to.
+    :param source: File name of the downloaded audio stream.
+    :param title: File name stem of the MP3, without extension.
+    :param quality: MP3 bitrate in kbit/s.
+    :return: Dictionary with filename, bytes, elapsed seconds and checksum.
+    :raises YouTubeAPIError: If FFmpeg fails.
+    """
+    source_path = os.path.join(save_path, source)
+    target_path = os.path.join(save_path, f'{title}.mp3')
+    # Write next to the target and rename, so a partial MP3 never looks downloaded
+    tmp_path = os.path.join(save_path, f'.{title}.part.mp3')
+    start = time.monotonic()
+    command = [
+        'ffmpeg', '-y', '-loglevel', 'error', '-i', source_path,
+        '-vn', '-codec:a', 'libmp3lame', '-b:a', f'{quality}k', tmp_path
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise YouTubeAPIError(f"FFmpeg failed for {source}: {completed.stderr.strip()}")
+
+    os.replace(tmp_path, target_path)
+    os.remove(source_path)
+    return {
+        'filename': f'{title}.mp3',
+        'bytes': os.path.getsize(target_path),
+        'elapsed': time.monotonic() - start,
+        'checksum': file_checksum(target_path),
+    }
+
+class DownloadManager:
+    """
+    Downloads the media of many videos at once.
+
+    Each download runs in its own worker process with its own YoutubeDL, so several
+    downloads proceed in parallel, and each download fetches several stream fragments
+    at once. Audio is fetched in two stages: downloads hand the source audio to a
+    bounded queue, and a pool of transcode processes sized to the CPU cores converts
+    it to MP3, so the network and the CPU are busy at the same time. When transcoding
+    falls behind, the full queue holds back further downloads.
+
+    Completed files are recorded in the save path's MediaManifest, which is also
+    what decides whether a video still needs downloading.
+    """
+
+    # Seconds between checks for cancellation while the download stage waits
+    CANCEL_POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        workers: int = 2,
+        fragment_concurrency: int = 4,
+        transcode_workers: Optional[int] = None,
+        passthrough_formats: Sequence[str] = ('mp3',)
+    ):
+        """
+        :param workers: Number of downloads running at once.
+        :param fragment_concurrency: Fragments of a DASH/HLS stream downloaded at once per download.
+        :param transcode_workers: Number of audio transcodes running at once; defaults to the CPU count.
+        :param passthrough_formats: Audio extensions kept as downloaded instead of transcoded to MP3.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.workers = max(1, workers)
+        self.fragment_concurrency = max(1, fragment_concurrency)
+        self.transcode_workers = max(1, transcode_workers or os.cpu_count() or 1)
+        self.passthrough_formats = tuple(fmt.lower().lstrip('.') for fmt in passthrough_formats)
+
+    def download(self, videos: List[Dict[str, Any]], save_path: str, download_video: bool = False) -> List[Dict[str, Any]]:
+        """
+        Downloads the media of every video that is not in the save path yet.
+
+        :param videos: Resources from videos.list or playlistItems.list.
+        :param save_path: Directory to save the media to.
+        :param download_video: True for MP4 videos, False for MP3 audio.
+        :return: Results of the completed downloads, as returned by download_media().
+        :raises YouTubeAPIError: If any download failed, after all others have finished.
+        """
+        kind = 'Video' if download_video else 'Audio'
+        formats = ('mp4',) if download_video else ('mp3',) + self.passthrough_formats
+        manifest = MediaManifest(save_path)
+        jobs = []
+        claimed = set()
+        for video in videos:
+            video_id = get_video_id(video)
+            title = get_media_title(video)
+            existing = manifest.locate(video_id, title, formats)
+            if existing:
+                self.logger.debug(f"[*] {kind} already exists: {existing['filename']}")
+                continue
+            title = manifest.unique_title(video_id, title, formats)
+            if title in claimed:
+                # Another video of this batch has the same title
+                title = f'{title} [{video_id}]'
+            claimed.add(title)
+            jobs.append((video_id, title))
+
+        if not jobs:
+            self.logger.info(f"[*] All {len(videos)} {kind.lower()} files already exist.")
+            return []
+
+        self.logger.info(f"Downloading {len(jobs)} {kind.lower()} files with {self.workers} worker(s).")
+        start = time.monotonic()
+        if download_video:
+            results, failures = self._download_videos(jobs, save_path, manifest)
+        else:
+            results, failures = self._download_audio(jobs, save_path, manifest)
+
+        total_bytes = sum(result['bytes'] for result in results)
+        self.logger.info(
+            f"Downloaded {len(results)}/{len(jobs)} {kind.lower()} files: "
+            f"{self._format_rate(total_bytes, time.monotonic() - start)}."
+        )
+
+        if failures:
+            raise YouTubeAPIError(f"{len(failures)} download(s) failed: {', '.join(failures)}")
+        return results
+
+    def _download_videos(
+        self,
+        jobs: List[Tuple[str, str]],
+        save_path: str,
+        manifest: MediaManifest
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        results = []
+        failures = []
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+            futures = {
+                executor.submit(download_media, True, video_id, title, save_path, self.fragment_concurrency): title
+                for video_id, title in jobs
+            }
+            for future in as_completed(futures):
+                title = futures[future]
+                try:
+                    result = future.result()
+                    manifest.record(
+                        result['video_id'], result['filename'], title=title,
+                        duration=result['duration'], checksum=result['checksum']
+                    )
+                except Exception as e:
+                    self.logger.error(f"[-] Failed to download video for {title}: {e}")
+                    failures.append(title)
+                    continue
+                results.append(result)
+                self.logger.info(
+                    f"[+] Video downloaded ({len(results) + len(failures)}/{len(jobs)}): {result['filename']} "
+                    f"({self._format_rate(result['bytes'], result['elapsed'])})"
+                )
+        return results, failures
+
+    def _download_audio(
+        self,
+        jobs: List[Tuple[str, str]],
+        save_path: str,
+        manifest: MediaManifest
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        # Downloaded sources waiting for a transcode slot; None marks the end
+        pending: queue.Queue = queue.Queue(maxsize=self.transcode_workers)
+        # Set when the transcode stage fails, so the download stage stops feeding it
+        cancel = threading.Event()
+        # Error that stopped the download stage, raised here once the transcode stage has drained
+        errors: List[Exception] = []
+        thread = threading.Thread(
+            target=self._download_stage,
+            args=(jobs, save_path, pending, cancel, errors),
+            name='download-stage',
+            daemon=True
+        )
+        thread.start()
+        try:
+            results, failures = self._transcode_stage(len(jobs), save_path, manifest, pending)
+        except BaseException:
+            cancel.set()
+            raise
+        finally:
+            thread.join()
+
+        if errors:
+            raise YouTubeAPIError(
+                f"Audio downloads stopped after {len(results) + len(failures)} of {len(jobs)} files: {errors[0]}"
+            ) from errors[0]
+        return results, failures
+
+    def _download_stage(
+        self,
+        jobs: List[Tuple[str, str]],
+        save_path: str,
+        pending: queue.Queue,
+        cancel: threading.Event,
+        errors: List[Exception]
+    ) -> None:
+        def put(item: Optional[Tuple[str, Future]]) -> bool:
+            # Blocks while every transcode slot is busy and the queue is full,
+            # but gives up once the transcode stage is gone
+            while not cancel.is_set():
+                try:
+                    pending.put(item, timeout=self.CANCEL_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        executor = ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)))
+        in_flight: Dict[Future, str] = {}
+        try:
+            remaining = iter(jobs)
+
+            def submit_next() -> None:
+                job = next(remaining, None)
+                if job and not cancel.is_set():
+                    video_id, title = job
+                    future = executor.submit(
+                        download_media, False, video_id, title, save_path, self.fragment_concurrency, False
+                    )
+                    in_flight[future] = title
+
+            for _ in range(self.workers):
+                submit_next()
+            while in_flight and not cancel.is_set():
+                done, _ = wait(in_flight, timeout=self.CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not put((in_flight.pop(future), future)):
+                        break
+                    submit_next()
+        except Exception as e:
+            # E.g. BrokenProcessPool from submit(); the jobs left would silently go missing
+            self.logger.error(f"[-] Audio download stage failed: {e}")
+            errors.append(e)
+        finally:
+            if cancel.is_set() or errors:
+                self.logger.warning(f"Cancelling {len(in_flight)} download(s) in progress.")
+                for future in in_flight:
+                    future.cancel()
+                # Downloads that already started finish in their worker processes
+                executor.shutdown(wait=False)
+            else:
+                executor.shutdown(wait=True)
+            # Lets the transcode stage finish what it already has; a no-op once cancelled
+            put(None)
+
+    def _transcode_stage(
+        self,
+        total: int,
+        save_path: str,
+        manifest: MediaManifest,
+        pending: queue.Queue
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        results = []
+        failures = []
+        lock = threading.Lock()
+        slots = threading.Semaphore(self.transcode_workers)
+
+        def finish(title: str, download: Dict[str, Any], transcode: Optional[Future]) -> None:
+            try:
+                result = dict(download)
+                if transcode is not None:
+                    converted = transcode.result()
+                    result['filename'] = converted['filename']
+                    result['checksum'] = converted['checksum']
+                    result['transcode_elapsed'] = converted['elapsed']
+                manifest.record(
+                    result['video_id'], result['filename'], title=title,
+                    duration=result['duration'], checksum=result['checksum']
+                )
+            except Exception as e:
+                self.logger.error(f"[-] Failed to transcode audio for {title}: {e}")
+                with lock:
+                    failures.append(title)
+                return
+            finally:
+                slots.release()
+            with lock:
+                results.append(result)
+                done = len(results) + len(failures)
+            transcoded = f", transcoded in {result['transcode_elapsed']:.1f}s" if transcode is not None else ''
+            self.logger.info(
+                f"[+] Audio downloaded ({done}/{total}): {result['filename']} "
+                f"({self._format_rate(result['bytes'], result['elapsed'])}{transcoded})"
+            )
+
+        with ProcessPoolExecutor(max_workers=self.transcode_workers) as executor:
+            while True:
+                # Only take the next source once a transcode slot is free
+                slots.acquire()
+                item = pending.get()
+                if item is None:
+                    slots.release()
+                    break
+
+                title, future = item
+                try:
+                    download = future.result()
+                except Exception as e:
+                    self.logger.error(f"[-] Failed to download audio for {title}: {e}")
+                    with lock:
+                        failures.append(title)
+                    slots.release()
+                    continue
+
+                extension = os.path.splitext(download['filename'])[1].lower().lstrip('.')
+                if extension in self.passthrough_formats:
+                    self.logger.debug(f"[*] Keeping {download['filename']} without transcoding.")
+                    finish(title, download, None)
+                    continue
+
+                transcode = executor.submit(transcode_audio, save_path, download['filename'], title)
+                transcode.add_done_callback(lambda done, title=title, download=download: finish(title, download, done))
+
+        return results, failures
+
+    def _format_rate(self, size: int, elapsed: float) -> str:
+        megabytes = size / 1024 / 1024
+        return f"{megabytes:.1f} MB in {elapsed:.1f}s, {megabytes / elapsed if elapsed else 0:.2f} MB/s"
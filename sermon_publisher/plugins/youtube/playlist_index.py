@@ -0,0 +1,125 @@
+# sermon_publisher/plugins/youtube/playlist_index.py
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, List, Any, Optional
+
+class PlaylistIndex:
+    """
+    Index of a channel's playlists, mapping playlist titles to playlist IDs.
+
+    Built from one paged listing of every playlist and saved to disk, so lookups by
+    name cost no API calls until the index is older than `ttl` seconds, on disk or
+    in a long-running process. A title that is missing from the index triggers a
+    refresh, in case the playlist was created after the index was built, at most
+    once every MISS_REFRESH_INTERVAL seconds.
+    """
+
+    # Minimum seconds between refreshes caused by a missing title
+    MISS_REFRESH_INTERVAL = 300
+
+    def __init__(
+        self,
+        fetch_playlists: Callable[[], List[Dict[str, Any]]],
+        channel_id: str,
+        cache_path: Optional[str] = None,
+        ttl: int = 86400
+    ):
+        """
+        :param fetch_playlists: Returns every playlist of the channel, with 'id' and 'snippet.title'.
+        :param channel_id: Channel the playlists belong to; a cache for another channel is ignored.
+        :param cache_path: JSON file the index is saved to.
+        :param ttl: Seconds a saved index stays valid. 0 disables the on-disk cache.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.fetch_playlists = fetch_playlists
+        self.channel_id = channel_id
+        if cache_path is None:
+            # Default to project root, next to token.json
+            cache_path = os.path.join(os.getcwd(), 'youtube_playlists.json')
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._playlists: Optional[Dict[str, str]] = None
+        # Wall-clock time the index in memory was listed, from the cache if loaded from disk
+        self._fetched_at = 0.0
+        # Monotonic time of the last listing in this process
+        self._last_refresh: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> bool:
+        if self.ttl <= 0 or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Failed to read playlist cache from {self.cache_path}: {e}")
+            return False
+        if cache.get('channel_id') != self.channel_id or cache.get('playlists') is None:
+            return False
+        fetched_at = cache.get('fetched_at', 0)
+        if time.time() - fetched_at > self.ttl:
+            self.logger.debug("Playlist cache expired.")
+            return False
+        self._playlists = cache['playlists']
+        self._fetched_at = fetched_at
+        return True
+
+    def _save_cache(self) -> None:
+        if self.ttl <= 0:
+            return
+        cache = {'channel_id': self.channel_id, 'fetched_at': self._fetched_at, 'playlists': self._playlists}
+        try:
+            directory = os.path.dirname(os.path.abspath(self.cache_path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            # A missing cache only costs an API call on the next run
+            self.logger.warning(f"Failed to save playlist cache to {self.cache_path}: {e}")
+
+    def _refresh(self) -> None:
+        playlists = {}
+        for playlist in self.fetch_playlists():
+            playlists.setdefault(playlist['snippet']['title'], playlist['id'])
+        self._playlists = playlists
+        self._fetched_at = time.time()
+        self._last_refresh = time.monotonic()
+        self._save_cache()
+        self.logger.debug(f"Indexed {len(playlists)} playlists.")
+
+    def refresh(self) -> None:
+        """
+        Lists every playlist of the channel again, replacing the index and its cache.
+        """
+        with self._lock:
+            self._refresh()
+
+    def get(self, title: str) -> Optional[str]:
+        """
+        Returns the ID of a playlist.
+
+        :param title: Exact playlist title.
+        :return: Playlist ID, or None if the channel has no such playlist.
+        """
+        with self._lock:
+            if self._playlists is None or self._expired():
+                # Another process may have saved a newer index in the meantime
+                if not self._load_cache():
+                    self._refresh()
+            if title not in self._playlists and self._may_refresh_on_miss():
+                self.logger.debug(f"Playlist '{title}' not in cached index, refreshing.")
+                self._refresh()
+            return self._playlists.get(title)
+
+    def _expired(self) -> bool:
+        # Without a ttl the index is listed once per process
+        return self.ttl > 0 and time.time() - self._fetched_at > self.ttl
+
+    def _may_refresh_on_miss(self) -> bool:
+        return self._last_refresh is None or time.monotonic() - self._last_refresh >= self.MISS_REFRESH_INTERVAL
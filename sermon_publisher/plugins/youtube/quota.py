@@ -0,0 +1,169 @@
+import os
+import json
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, Optional
+from sermon_publisher.exceptions.custom_exceptions import YouTubeQuotaError
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+except Exception:
+    # No tz database available, fall back to Pacific Standard Time
+    QUOTA_TIMEZONE = timezone(timedelta(hours=-8))
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; usage updates are then only atomic, not exclusive
+    fcntl = None
+
+class QuotaTracker:
+    """
+    Tracks YouTube Data API quota units spent per method and per day.
+
+    Usage is persisted so every run of the day shares one budget. Each charge
+    re-reads the usage file under an exclusive file lock and replaces it in one
+    step, so overlapping runs add to each other's counts. The budget resets
+    at midnight Pacific time, like the API's quota. Low-priority calls (such as
+    full-playlist rescans) are refused once the remaining units drop to the reserve,
+    which is kept for high-priority work like publishing the latest sermon.
+    """
+
+    HIGH = 'high'
+    LOW = 'low'
+
+    # Units per call, from the YouTube Data API quota calculator
+    COSTS = {
+        'search.list': 100,
+        'channels.list': 1,
+        'playlists.list': 1,
+        'playlistItems.list': 1,
+        'videos.list': 1,
+    }
+
+    def __init__(self, daily_limit: int = 10000, reserve: int = 1000, state_path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.daily_limit = daily_limit
+        self.reserve = reserve
+        if state_path is None:
+            # Default to project root, next to token.json
+            state_path = os.path.join(os.getcwd(), 'youtube_quota.json')
+        self.state_path = state_path
+        self.lock_path = f"{state_path}.lock"
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def _today(self) -> str:
+        return datetime.now(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    def _empty_state(self) -> Dict[str, Any]:
+        return {'date': self._today(), 'used': 0, 'by_method': {}}
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not os.path.exists(self.state_path):
+            return self._empty_state()
+        try:
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Failed to read quota usage from {self.state_path}: {e}")
+            return self._empty_state()
+        if state.get('date') != self._today():
+            return self._empty_state()
+        return state
+
+    def _save_state(self) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(self.state_path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            # Losing the usage record must not stop the run
+            self.logger.warning(f"Failed to save quota usage to {self.state_path}: {e}")
+
+    def _refresh(self) -> None:
+        # Other processes may have charged calls since the file was last read;
+        # a file from an earlier day loads as an empty budget
+        self._state = self._load_state()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        try:
+            lock_file = open(self.lock_path, 'a')
+        except OSError as e:
+            # An unlocked update can only undercount; it must not stop the run
+            self.logger.warning(f"Failed to lock quota usage file {self.lock_path}: {e}")
+            yield
+            return
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def cost(self, method: str) -> int:
+        """
+        Returns the quota cost of an API method.
+
+        :param method: API method, e.g. "playlistItems.list".
+        :return: Quota units per call.
+        """
+        return self.COSTS.get(method, 1)
+
+    def remaining(self) -> int:
+        """
+        Returns the quota units left today.
+        """
+        with self._lock:
+            self._refresh()
+            return self.daily_limit - self._state['used']
+
+    def charge(self, method: str, priority: str = HIGH) -> None:
+        """
+        Records a call before it is made, refusing it if the budget does not allow it.
+
+        :param method: API method, e.g. "search.list".
+        :param priority: HIGH or LOW. LOW calls may not dip into the reserve.
+        :raises YouTubeQuotaError: If the call would exceed the budget for its priority.
+        """
+        cost = self.cost(method)
+        with self._lock, self._file_lock():
+            self._refresh()
+            remaining = self.daily_limit - self._state['used']
+            floor = self.reserve if priority == self.LOW else 0
+            if remaining - cost < floor:
+                self.logger.warning(
+                    f"Refusing {priority}-priority {method} ({cost} units): {remaining} units left today."
+                )
+                raise YouTubeQuotaError(f"Not enough YouTube quota for {method}: {remaining} units left today.")
+
+            self._state['used'] += cost
+            by_method = self._state['by_method']
+            by_method[method] = by_method.get(method, 0) + cost
+            self._save_state()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns today's usage.
+
+        :return: Dictionary with date, used, remaining, limit and per-method units.
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                'date': self._state['date'],
+                'used': self._state['used'],
+                'remaining': self.daily_limit - self._state['used'],
+                'limit': self.daily_limit,
+                'by_method': dict(self._state['by_method']),
+            }
@@ -37,6 +37,10 @@ class ConfigManager:
             'podbean_image_path': config.get('PODBEAN_PLUGIN', 'podbean_image_path', fallback=None),
             'episode_content': config.get('PODBEAN_PLUGIN', 'episode_content', fallback=''),
             'publish_audio': config.getboolean('PODBEAN_PLUGIN', 'publish_audio', fallback=False),
+            'podbean_upload_workers': config.getint('PODBEAN_PLUGIN', 'upload_workers', fallback=1),
+            'podbean_upload_journal_path': config.get('PODBEAN_PLUGIN', 'upload_journal_path', fallback=None),
+            'podbean_watch_settle_time': config.getfloat('PODBEAN_PLUGIN', 'watch_settle_time', fallback=10.0),
+            'podbean_watch_poll_interval': config.getfloat('PODBEAN_PLUGIN', 'watch_poll_interval', fallback=2.0),
 
             # YOUTUBE_PLUGIN
             'youtube_api_key': config.get('YOUTUBE_PLUGIN', 'youtube_api_key', fallback=None),
@@ -47,16 +51,46 @@ class ConfigManager:
             'stream_playlist': config.get('YOUTUBE_PLUGIN', 'stream_playlist', fallback=None),
             'video_playlist': config.get('YOUTUBE_PLUGIN', 'video_playlist', fallback=None),
             'publish_video_audio': config.getboolean('YOUTUBE_PLUGIN', 'publish_video_audio', fallback=False),
+            'incremental_sync': config.getboolean('YOUTUBE_PLUGIN', 'incremental_sync', fallback=True),
+            'youtube_daily_quota': config.getint('YOUTUBE_PLUGIN', 'daily_quota', fallback=10000),
+            'youtube_quota_reserve': config.getint('YOUTUBE_PLUGIN', 'quota_reserve', fallback=1000),
+            'youtube_quota_path': config.get('YOUTUBE_PLUGIN', 'quota_path', fallback=None),
+            'playlist_cache_ttl': config.getint('YOUTUBE_PLUGIN', 'playlist_cache_ttl', fallback=86400),
+            'playlist_cache_path': config.get('YOUTUBE_PLUGIN', 'playlist_cache_path', fallback=None),
+            'youtube_download_workers': config.getint('YOUTUBE_PLUGIN', 'download_workers', fallback=2),
+            'youtube_fragment_concurrency': config.getint('YOUTUBE_PLUGIN', 'fragment_concurrency', fallback=4),
+            'youtube_transcode_workers': config.getint('YOUTUBE_PLUGIN', 'transcode_workers', fallback=0),
+            'youtube_passthrough_audio_formats': [
+                fmt.strip() for fmt in config.get('YOUTUBE_PLUGIN', 'passthrough_audio_formats', fallback='mp3').split(',')
+                if fmt.strip()
+            ],
 
             # ADVANCED_SERMONS_WP_PLUGIN
             'aswp_url': config.get('ADVANCED_SERMONS_WP_PLUGIN', 'aswp_url', fallback=None),
             'aswp_username': config.get('ADVANCED_SERMONS_WP_PLUGIN', 'aswp_username', fallback=None),
             'aswp_app_password': config.get('ADVANCED_SERMONS_WP_PLUGIN', 'aswp_app_password', fallback=None),
+            'sermon_workers': config.getint('ADVANCED_SERMONS_WP_PLUGIN', 'sermon_workers', fallback=1),
+            'image_cache_path': config.get('ADVANCED_SERMONS_WP_PLUGIN', 'image_cache_path', fallback=None),
 
             # OPTIONS
             'podbean': config.getboolean('OPTIONS', 'podbean', fallback=False),
             'youtube': config.getboolean('OPTIONS', 'youtube', fallback=False),
             'advanced_sermons': config.getboolean('OPTIONS', 'advanced_sermons', fallback=False),
+            'ledger_path': config.get('OPTIONS', 'ledger_path', fallback=None),
+            'snapshot_path': config.get('OPTIONS', 'snapshot_path', fallback=None),
+            'plan_path': config.get('OPTIONS', 'plan_path', fallback=None),
+            'metrics_path': config.get('OPTIONS', 'metrics_path', fallback=None),
+
+            # DAEMON
+            'daemon_youtube_interval': config.getint('DAEMON', 'youtube_interval', fallback=900),
+            'daemon_podbean_interval': config.getint('DAEMON', 'podbean_interval', fallback=900),
+            'daemon_jitter': config.getint('DAEMON', 'jitter', fallback=60),
+
+            # HTTP
+            'http_timeout': config.getfloat('HTTP', 'timeout', fallback=30.0),
+            'http_max_retries': config.getint('HTTP', 'max_retries', fallback=3),
+            'http_backoff_factor': config.getfloat('HTTP', 'backoff_factor', fallback=0.5),
+            'http_pool_size': config.getint('HTTP', 'pool_size', fallback=10),
         }
 
         # Convert string representations to appropriate types
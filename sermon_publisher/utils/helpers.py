@@ -1,7 +1,9 @@
 import os
 import re
+import hashlib
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 
 def end_with_slash(path: str) -> str:
     """
@@ -12,6 +14,28 @@ def end_with_slash(path: str) -> str:
     """
     return path if path.endswith('/') else f"{path}/"
 
+def file_checksum(filepath: str) -> str:
+    """
+    Computes the SHA-256 checksum of a file, reading it in 1 MiB chunks.
+
+    :param filepath: Path to the file.
+    :return: Hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def slugify(value: str) -> str:
+    """
+    Converts a name to a WordPress-style slug.
+
+    :param str value: The original name (e.g., "Romans: Faith Alone").
+    :return: Lowercase slug with runs of other characters replaced by hyphens (e.g., "romans-faith-alone").
+    """
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+
 def strip_break(string: str) -> list:
     """
     Splits a string by <br/> tags.
@@ -21,6 +45,25 @@ def strip_break(string: str) -> list:
     """
     return string.split('<br/>')
 
+def detect_image_type(header: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Detects an image format from the first bytes of the file.
+
+    :param bytes header: At least the first 12 bytes of the image.
+    :return: Tuple of MIME type and file extension (e.g., ("image/jpeg", "jpg")), or None if unknown.
+    """
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg', 'jpg'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png', 'png'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp', 'webp'
+    if header[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif', 'gif'
+    return None
+
+ORDINAL_SUFFIX = re.compile(r'(\d{1,2})(st|nd|rd|th)')
+
 def remove_ordinal_suffix(date_str: str) -> str:
     """
     Removes ordinal suffixes from day numbers in a date string.
@@ -28,12 +71,12 @@ def remove_ordinal_suffix(date_str: str) -> str:
     :param str date_str: The original date string (e.g., "October 6th, 2024").
     :return: Cleaned date string without ordinal suffixes (e.g., "October 6, 2024").
     """
-    pattern = r'(\d{1,2})(st|nd|rd|th)'
-    return re.sub(pattern, r'\1', date_str)
+    return ORDINAL_SUFFIX.sub(r'\1', date_str)
 
+@lru_cache(maxsize=4096)
 def convert_to_iso(date_str: str) -> Optional[str]:
     """
-    Converts a date string with ordinal suffixes to ISO 8601 format.
+    Converts a date string with ordinal suffixes to ISO 8601 format. Results are memoized.
 
     :param date_str: The original date string (e.g., "October 6th, 2024").
     :return: ISO formatted date string (e.g., "2024-10-06T00:00:00").
@@ -0,0 +1,126 @@
+# sermon_publisher/utils/http_transport.py
+
+import logging
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from sermon_publisher.utils.metrics import MetricsRegistry
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default timeout to requests that do not set one.
+    """
+
+    def __init__(self, timeout: float, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+class HttpTransport:
+    """
+    Shared HTTP transport for all plugins.
+
+    Keeps one pooled keep-alive session per host, applies a default timeout and
+    retries idempotent requests with backoff on connection errors, 429 and 5xx.
+    POST requests are never retried, so creates cannot be duplicated. With a
+    metrics registry, every request is recorded per service endpoint.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, config: Dict[str, Any], metrics: Optional[MetricsRegistry] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.timeout = config.get('http_timeout') or 30.0
+        self.max_retries = config.get('http_max_retries')
+        if self.max_retries is None:
+            self.max_retries = 3
+        self.backoff_factor = config.get('http_backoff_factor')
+        if self.backoff_factor is None:
+            self.backoff_factor = 0.5
+        self.pool_size = config.get('http_pool_size') or 10
+        self.metrics = metrics
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = TimeoutHTTPAdapter(
+            self.timeout,
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session_for(self, url: str) -> requests.Session:
+        """
+        Returns the pooled session for the host of a URL, creating it on first use.
+
+        :param url: Request URL.
+        :return: Session for the URL's scheme and host.
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                self.logger.debug(f"Opening HTTP session for {host}.")
+                session = self._create_session()
+                self._sessions[host] = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the session of the URL's host.
+
+        Accepts the same keyword arguments as requests.request.
+        """
+        if self.metrics is None:
+            return self.session_for(url).request(method, url, **kwargs)
+
+        service, endpoint = self.metrics.endpoint_for(url)
+        with self.metrics.track(service, endpoint, method) as call:
+            response = self.session_for(url).request(method, url, **kwargs)
+            call.error = response.status_code >= 400
+            call.bytes_sent = int(response.request.headers.get('Content-Length') or 0)
+            if kwargs.get('stream'):
+                # Reading the body here would defeat streaming
+                call.bytes_received = int(response.headers.get('Content-Length') or 0)
+            else:
+                call.bytes_received = len(response.content)
+        return response
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url: str, data: Any = None, json: Any = None, **kwargs) -> requests.Response:
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def put(self, url: str, data: Any = None, **kwargs) -> requests.Response:
+        return self.request('PUT', url, data=data, **kwargs)
+
+    def close(self) -> None:
+        """
+        Closes every pooled session.
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,213 @@
+# sermon_publisher/utils/ledger.py
+
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+from sermon_publisher.exceptions.custom_exceptions import LedgerError
+
+class PublicationLedger:
+    """
+    Local SQLite record of what has been published where.
+
+    Each row links a YouTube video to its WordPress sermon, its Podbean
+    episode and the local audio file, so later runs can skip finished work
+    with a local lookup instead of a network call. Podbean episodes are also
+    kept in their own table, keyed by the SHA-256 checksum of the uploaded
+    audio, because episode titles come from file names and are not unique.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS publications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT UNIQUE,
+            title TEXT,
+            slug TEXT,
+            wp_sermon_id INTEGER,
+            podbean_episode_id TEXT,
+            podbean_media_key TEXT,
+            audio_path TEXT,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_publications_title ON publications (title);
+        CREATE INDEX IF NOT EXISTS idx_publications_slug ON publications (slug);
+        CREATE TABLE IF NOT EXISTS episodes (
+            checksum TEXT PRIMARY KEY,
+            title TEXT,
+            video_id TEXT,
+            podbean_episode_id TEXT,
+            podbean_media_key TEXT,
+            audio_path TEXT,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_episodes_video_id ON episodes (video_id);
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, ledger_path: Optional[str] = None):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if ledger_path is None:
+            # Default to project root, next to token.json
+            ledger_path = os.path.join(os.getcwd(), 'ledger.db')
+        self.ledger_path = ledger_path
+        self._lock = threading.Lock()
+
+        try:
+            self._conn = sqlite3.connect(self.ledger_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            with self._conn:
+                self._conn.executescript(self.SCHEMA)
+            self.logger.debug(f"Publication ledger opened at {self.ledger_path}.")
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open publication ledger at {self.ledger_path}: {e}")
+            raise LedgerError(f"Failed to open publication ledger at {self.ledger_path}") from e
+
+    def _fetch_one(self, query: str, params: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            try:
+                row = self._conn.execute(query, params).fetchone()
+            except sqlite3.Error as e:
+                self.logger.error(f"Ledger query failed: {e}")
+                raise LedgerError(f"Ledger query failed: {e}") from e
+        return dict(row) if row else None
+
+    def _upsert(self, key_column: str, key: Any, values: Dict[str, Any], table: str = 'publications') -> None:
+        values = {column: value for column, value in values.items() if value is not None}
+        values['updated_at'] = datetime.now().isoformat()
+        assignments = ', '.join(f"{column} = ?" for column in values)
+
+        with self._lock:
+            try:
+                with self._conn:
+                    cursor = self._conn.execute(
+                        f"UPDATE {table} SET {assignments} WHERE {key_column} = ?",
+                        (*values.values(), key)
+                    )
+                    if cursor.rowcount == 0:
+                        values[key_column] = key
+                        columns = ', '.join(values)
+                        placeholders = ', '.join('?' for _ in values)
+                        self._conn.execute(
+                            f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                            tuple(values.values())
+                        )
+            except sqlite3.Error as e:
+                self.logger.error(f"Failed to write ledger entry for {key_column} '{key}': {e}")
+                raise LedgerError(f"Failed to write ledger entry for {key_column} '{key}'") from e
+
+    def get_by_video_id(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the ledger entry for a YouTube video.
+
+        :param video_id: YouTube video ID.
+        :return: Ledger entry as a dictionary, or None if unknown.
+        """
+        return self._fetch_one("SELECT * FROM publications WHERE video_id = ?", (video_id,))
+
+    def is_sermon_published(self, video_id: str) -> bool:
+        """
+        Checks whether a WordPress sermon has been recorded for a YouTube video.
+
+        :param video_id: YouTube video ID.
+        :return: True if a sermon ID is recorded, False otherwise.
+        """
+        entry = self.get_by_video_id(video_id)
+        return bool(entry and entry.get('wp_sermon_id'))
+
+    def get_episode(self, checksum: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the Podbean episode recorded for an audio file.
+
+        :param checksum: SHA-256 checksum of the audio file.
+        :return: Episode entry as a dictionary, or None if unknown.
+        """
+        return self._fetch_one("SELECT * FROM episodes WHERE checksum = ?", (checksum,))
+
+    def record_sermon(self, video_id: str, title: str, slug: str, wp_sermon_id: int) -> None:
+        """
+        Records the WordPress sermon published for a YouTube video.
+
+        :param video_id: YouTube video ID.
+        :param title: YouTube video title, matching the downloaded audio file name.
+        :param slug: WordPress sermon slug.
+        :param wp_sermon_id: WordPress sermon post ID.
+        """
+        self._upsert('video_id', video_id, {
+            'title': title,
+            'slug': slug,
+            'wp_sermon_id': wp_sermon_id,
+        })
+        self.logger.debug(f"Recorded sermon {wp_sermon_id} for video {video_id}.")
+
+    def record_episode(
+        self,
+        checksum: str,
+        title: str,
+        media_key: Optional[str] = None,
+        episode_id: Optional[str] = None,
+        audio_path: Optional[str] = None,
+        video_id: Optional[str] = None
+    ) -> None:
+        """
+        Records a Podbean episode by the checksum of its audio file. With a video ID,
+        the episode is also linked to that YouTube video's publication entry.
+
+        :param checksum: SHA-256 checksum of the audio file.
+        :param title: Episode title.
+        :param media_key: Podbean media key of the uploaded file.
+        :param episode_id: Podbean episode ID.
+        :param audio_path: Local path of the published audio file.
+        :param video_id: YouTube video the audio was downloaded from, if known.
+        """
+        values = {
+            'podbean_episode_id': episode_id,
+            'podbean_media_key': media_key,
+            'audio_path': audio_path,
+        }
+        self._upsert('checksum', checksum, {'title': title, 'video_id': video_id, **values}, table='episodes')
+        if video_id:
+            self._upsert('video_id', video_id, values)
+        self.logger.debug(f"Recorded Podbean episode '{title}' ({checksum[:12]}) with media key {media_key}.")
+
+    def get_sync_state(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a stored sync state, such as a playlist high-water mark.
+
+        :param key: Sync state key, e.g. "playlist:Sermons".
+        :return: Stored state dictionary, or None if nothing is stored.
+        """
+        row = self._fetch_one("SELECT value FROM sync_state WHERE key = ?", (key,))
+        return json.loads(row['value']) if row else None
+
+    def set_sync_state(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Stores a sync state, replacing any previous value.
+
+        :param key: Sync state key, e.g. "playlist:Sermons".
+        :param value: JSON-serializable state dictionary.
+        """
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO sync_state (key, value, updated_at) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), datetime.now().isoformat())
+                    )
+            except sqlite3.Error as e:
+                self.logger.error(f"Failed to write sync state '{key}': {e}")
+                raise LedgerError(f"Failed to write sync state '{key}'") from e
+        self.logger.debug(f"Stored sync state '{key}': {value}")
+
+    def close(self) -> None:
+        """
+        Closes the underlying database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,5 @@
 import logging
 import sys
-from colorlog import ColoredFormatter
 
 def setup_logging(log_level: str = 'INFO') -> None:
     """
@@ -8,6 +7,8 @@ def setup_logging(log_level: str = 'INFO') -> None:
 
     :param log_level: Logging level as a string (DEBUG, INFO, WARNING, ERROR, CRITICAL).
     """
+    from colorlog import ColoredFormatter
+
     # Define log colors for different levels
     LOG_COLORS = {
         'DEBUG': 'cyan',
@@ -0,0 +1,200 @@
+# sermon_publisher/utils/manifest.py
+
+import os
+import json
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+from sermon_publisher.exceptions.custom_exceptions import MediaManifestError
+from sermon_publisher.utils.helpers import file_checksum
+
+class MediaManifest:
+    """
+    Records the media downloaded into one directory, keyed by YouTube video ID.
+
+    The manifest is a JSON file in the directory itself. Each video has one entry
+    per format with the file name, size, duration and checksum, so whether a video
+    was already downloaded is a dictionary lookup that survives title edits and
+    tells apart videos with the same title.
+    """
+
+    FILENAME = '.manifest.json'
+
+    def __init__(self, save_path: str):
+        """
+        :param save_path: Directory the media is downloaded to.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.save_path = save_path
+        self.manifest_path = os.path.join(save_path, self.FILENAME)
+        self._lock = threading.Lock()
+        self._videos: Dict[str, Dict[str, Dict[str, Any]]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f).get('videos', {})
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.warning(f"Ignoring unreadable media manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save(self) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.save_path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'videos': self._videos}, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.logger.error(f"Failed to write media manifest {self.manifest_path}: {e}")
+            raise MediaManifestError(f"Failed to write media manifest {self.manifest_path}") from e
+
+    def get(self, video_id: str, formats: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the manifest entry of a downloaded video whose file is still present.
+
+        :param video_id: YouTube video ID.
+        :param formats: Acceptable formats (file extensions), e.g. ("mp3",). Any format if None.
+        :return: Entry with video_id, title, filename, format, size, duration, checksum
+            and downloaded_at, or None if no such file is in the directory.
+        """
+        with self._lock:
+            entries = dict(self._videos.get(video_id, {}))
+        for fmt, entry in entries.items():
+            if formats is not None and fmt not in formats:
+                continue
+            if os.path.exists(os.path.join(self.save_path, entry['filename'])):
+                return entry
+        return None
+
+    def has(self, video_id: str, formats: Optional[Iterable[str]] = None) -> bool:
+        """
+        Checks whether a video was downloaded into the directory.
+
+        :param video_id: YouTube video ID.
+        :param formats: Acceptable formats (file extensions). Any format if None.
+        :return: True if a manifest entry exists and its file is present.
+        """
+        return self.get(video_id, formats) is not None
+
+    def locate(self, video_id: str, title: str, formats: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Finds the downloaded file of a video, falling back to the title-based file
+        names used before the manifest existed. A file found by title is added to
+        the manifest, so later lookups no longer depend on the title.
+
+        :param video_id: YouTube video ID.
+        :param title: File name stem the video would be saved under.
+        :param formats: Acceptable formats (file extensions), in order of preference.
+        :return: Manifest entry, or None if the video has not been downloaded.
+        """
+        formats = tuple(formats)
+        entry = self.get(video_id, formats)
+        if entry:
+            return entry
+        for fmt in formats:
+            filename = f'{title}.{fmt}'
+            if os.path.exists(os.path.join(self.save_path, filename)) and not self.find_by_filename(filename):
+                self.logger.debug(f"Adding {filename} to the media manifest.")
+                return self.record(video_id, filename, title=title)
+        return None
+
+    def unique_title(self, video_id: str, title: str, formats: Iterable[str]) -> str:
+        """
+        Returns the file name stem to save a video under, so that a video never
+        overwrites the file of another video with the same title.
+
+        :param video_id: YouTube video ID.
+        :param title: File name stem derived from the video title.
+        :param formats: Formats (file extensions) the video may be saved as.
+        :return: The title, or the title with the video ID appended if it is taken.
+        """
+        for fmt in formats:
+            entry = self.find_by_filename(f'{title}.{fmt}')
+            if entry and entry['video_id'] != video_id:
+                return f'{title} [{video_id}]'
+        return title
+
+    def find_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the manifest entry of a file.
+
+        :param filename: File name within the directory.
+        :return: Manifest entry, or None if the file is not in the manifest.
+        """
+        with self._lock:
+            for entries in self._videos.values():
+                for entry in entries.values():
+                    if entry['filename'] == filename:
+                        return dict(entry)
+        return None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Returns every manifest entry.
+
+        :return: Entries of all videos and formats.
+        """
+        with self._lock:
+            return [dict(entry) for entries in self._videos.values() for entry in entries.values()]
+
+    def missing(self, video_ids: Iterable[str], formats: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Returns the videos that have not been downloaded into the directory.
+
+        :param video_ids: YouTube video IDs.
+        :param formats: Acceptable formats (file extensions). Any format if None.
+        :return: IDs without a present file, in the given order.
+        """
+        return [video_id for video_id in video_ids if not self.has(video_id, formats)]
+
+    def record(
+        self,
+        video_id: str,
+        filename: str,
+        title: Optional[str] = None,
+        duration: Optional[float] = None,
+        checksum: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Adds or replaces the entry of a downloaded file.
+
+        :param video_id: YouTube video ID.
+        :param filename: File name within the directory.
+        :param title: Video title at download time.
+        :param duration: Duration in seconds, if known.
+        :param checksum: SHA-256 of the file; computed if not given.
+        :return: The new entry.
+        """
+        path = os.path.join(self.save_path, filename)
+        fmt = os.path.splitext(filename)[1].lower().lstrip('.')
+        entry = {
+            'video_id': video_id,
+            'title': title,
+            'filename': filename,
+            'format': fmt,
+            'size': os.path.getsize(path),
+            'duration': duration,
+            'checksum': checksum or file_checksum(path),
+            'downloaded_at': datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._videos.setdefault(video_id, {})[fmt] = entry
+            self._save()
+        self.logger.debug(f"Recorded {filename} for video {video_id} in the media manifest.")
+        return entry
+
+    def remove(self, video_id: str) -> None:
+        """
+        Removes every entry of a video.
+
+        :param video_id: YouTube video ID.
+        """
+        with self._lock:
+            if self._videos.pop(video_id, None) is not None:
+                self._save()
@@ -0,0 +1,275 @@
+# sermon_publisher/utils/metrics.py
+
+import os
+import re
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf'))
+
+# Path segments that are IDs, e.g. /sermons/123, are reported as one endpoint
+ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+REPEATED_SLASHES = re.compile(r'/{2,}')
+
+class EndpointStats:
+    """
+    Counters of the calls made to one endpoint.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, seconds: float, bytes_sent: int, bytes_received: int, error: bool) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+class CallRecord:
+    """
+    Byte counts and outcome of one call, filled in by the caller while it is tracked.
+    """
+
+    def __init__(self):
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = False
+
+class MetricsRegistry:
+    """
+    Collects the count, latency histogram, bytes transferred and errors of the calls
+    made to each service endpoint, such as "wp:/sermon_speaker GET".
+
+    Services are registered by base URL, so HTTP calls are attributed to a service
+    and a path relative to it. Calls to other hosts, such as presigned upload URLs,
+    are grouped per host. The registry is thread-safe and shared by all plugins of
+    a run; write_reports() saves a JSON report and a Prometheus textfile.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._stats: Dict[Tuple[str, str, str], EndpointStats] = {}
+        self._services: List[Tuple[str, str, str]] = []
+        self._lock = threading.Lock()
+
+    def register_service(self, name: str, base_url: Optional[str]) -> None:
+        """
+        Attributes HTTP calls under a base URL to a service.
+
+        :param name: Service name used in the metrics, e.g. "wp".
+        :param base_url: Base URL of the service's API; ignored if empty.
+        """
+        if not base_url:
+            return
+        parts = urlsplit(base_url)
+        with self._lock:
+            self._services.append((parts.netloc, REPEATED_SLASHES.sub('/', parts.path).rstrip('/'), name))
+            # Longest base path first, so nested APIs on one host resolve correctly
+            self._services.sort(key=lambda service: len(service[1]), reverse=True)
+
+    def endpoint_for(self, url: str) -> Tuple[str, str]:
+        """
+        Returns the service and endpoint an HTTP call is reported under.
+
+        :param url: Request URL.
+        :return: Tuple of service name and endpoint path, with numeric IDs replaced by {id}.
+        """
+        parts = urlsplit(url)
+        path = REPEATED_SLASHES.sub('/', parts.path)
+        with self._lock:
+            services = list(self._services)
+        for netloc, base_path, name in services:
+            if parts.netloc == netloc and (path == base_path or path.startswith(base_path + '/')):
+                endpoint = path[len(base_path):].rstrip('/') or '/'
+                return name, ID_SEGMENT.sub('/{id}', endpoint)
+        return parts.netloc, '*'
+
+    def record(
+        self,
+        service: str,
+        endpoint: str,
+        method: str,
+        seconds: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        error: bool = False
+    ) -> None:
+        """
+        Adds one call to the metrics of an endpoint.
+
+        :param service: Service name, e.g. "podbean".
+        :param endpoint: Endpoint path or API method, e.g. "/upload" or "playlistItems.list".
+        :param method: HTTP method.
+        :param seconds: Time the call took, including retries.
+        :param bytes_sent: Request body size.
+        :param bytes_received: Response body size.
+        :param error: True if the call raised or returned an error status.
+        """
+        key = (service, endpoint, method.upper())
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.add(seconds, bytes_sent, bytes_received, error)
+
+    @contextmanager
+    def track(self, service: str, endpoint: str, method: str) -> Iterator[CallRecord]:
+        """
+        Times a call and records it when the block exits. An exception counts as an error.
+
+        :param service: Service name.
+        :param endpoint: Endpoint path or API method.
+        :param method: HTTP method.
+        :return: Record whose byte counts and error flag the block may set.
+        """
+        call = CallRecord()
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call.error = True
+            raise
+        finally:
+            self.record(
+                service, endpoint, method, time.perf_counter() - start,
+                call.bytes_sent, call.bytes_received, call.error
+            )
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Returns the metrics of every endpoint, slowest in total first.
+
+        :return: Dictionary with generated_at and a list of endpoints.
+        """
+        with self._lock:
+            items = [(key, vars(stats).copy()) for key, stats in self._stats.items()]
+        endpoints = []
+        for (service, endpoint, method), stats in items:
+            endpoints.append({
+                'service': service,
+                'endpoint': endpoint,
+                'method': method,
+                'count': stats['count'],
+                'errors': stats['errors'],
+                'bytes_sent': stats['bytes_sent'],
+                'bytes_received': stats['bytes_received'],
+                'total_seconds': round(stats['total_seconds'], 6),
+                'mean_seconds': round(stats['total_seconds'] / stats['count'], 6),
+                'max_seconds': round(stats['max_seconds'], 6),
+                'latency_buckets': {
+                    ('+Inf' if bound == float('inf') else str(bound)): count
+                    for bound, count in zip(LATENCY_BUCKETS, stats['buckets'])
+                },
+            })
+        endpoints.sort(key=lambda entry: entry['total_seconds'], reverse=True)
+        return {'generated_at': datetime.now().isoformat(), 'endpoints': endpoints}
+
+    def to_prometheus(self, report: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Formats the metrics in the Prometheus text exposition format.
+
+        :param report: Report from report(); taken now if None.
+        :return: Text for the node_exporter textfile collector.
+        """
+        report = report or self.report()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f'# HELP sermon_publisher_{name} {help_text}')
+            lines.append(f'# TYPE sermon_publisher_{name} {kind}')
+
+        def labels(entry: Dict[str, Any], **extra: str) -> str:
+            values = {'service': entry['service'], 'endpoint': entry['endpoint'], 'method': entry['method'], **extra}
+            return ','.join(f'{key}="{_escape_label(value)}"' for key, value in values.items())
+
+        for name, field, help_text in (
+            ('requests_total', 'count', 'Calls made to the endpoint.'),
+            ('request_errors_total', 'errors', 'Calls that raised or returned an error status.'),
+            ('request_bytes_sent_total', 'bytes_sent', 'Request body bytes sent.'),
+            ('request_bytes_received_total', 'bytes_received', 'Response body bytes received.'),
+        ):
+            family(name, 'counter', help_text)
+            for entry in report['endpoints']:
+                lines.append(f'sermon_publisher_{name}{{{labels(entry)}}} {entry[field]}')
+
+        family('request_duration_seconds', 'histogram', 'Call latency, including retries.')
+        for entry in report['endpoints']:
+            cumulative = 0
+            for bound, count in entry['latency_buckets'].items():
+                cumulative += count
+                lines.append(f'sermon_publisher_request_duration_seconds_bucket{{{labels(entry, le=bound)}}} {cumulative}')
+            lines.append(f'sermon_publisher_request_duration_seconds_sum{{{labels(entry)}}} {entry["total_seconds"]}')
+            lines.append(f'sermon_publisher_request_duration_seconds_count{{{labels(entry)}}} {entry["count"]}')
+
+        family('metrics_generated_timestamp_seconds', 'gauge', 'Time the metrics were written.')
+        generated_at = datetime.fromisoformat(report['generated_at']).timestamp()
+        lines.append(f'sermon_publisher_metrics_generated_timestamp_seconds {generated_at:.3f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, path: str) -> None:
+        """
+        Saves the JSON report to a path and the Prometheus textfile next to it, with a
+        .prom extension. Both files are replaced in a single step.
+
+        :param path: Path of the JSON report.
+        """
+        report = self.report()
+        prometheus_path = os.path.splitext(path)[0] + '.prom'
+        try:
+            _write_atomic(path, json.dumps(report, indent=2))
+            _write_atomic(prometheus_path, self.to_prometheus(report))
+        except OSError as e:
+            # Losing the report must not fail the run
+            self.logger.warning(f"Failed to write metrics to {path}: {e}")
+            return
+        self.logger.debug(f"Wrote metrics of {len(report['endpoints'])} endpoints to {path} and {prometheus_path}.")
+
+    def log_summary(self, limit: int = 5) -> None:
+        """
+        Logs the endpoints that took the most time in total.
+
+        :param limit: Number of endpoints to log.
+        """
+        for entry in self.report()['endpoints'][:limit]:
+            self.logger.info(
+                f"{entry['service']}:{entry['endpoint']} {entry['method']}: {entry['count']} calls, "
+                f"{entry['total_seconds']:.1f}s total, {entry['mean_seconds'] * 1000:.0f} ms mean, "
+                f"{entry['errors']} errors, {(entry['bytes_sent'] + entry['bytes_received']) / 1_000_000:.1f} MB"
+            )
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _write_atomic(path: str, content: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        # mkstemp creates the file private; the textfile collector must be able to read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,136 @@
+# sermon_publisher/workflows/daemon.py
+
+import random
+import signal
+import logging
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional, Set
+from sermon_publisher.exceptions.custom_exceptions import WorkflowError
+
+class WorkflowDaemon:
+    """
+    Runs the strategies of one workflow repeatedly, each on its own interval.
+
+    The workflow caches its plugins, so the YouTube client, the Podbean token and
+    the WordPress caches stay warm between runs. Strategies are scheduled by name
+    and built by the workflow when they first run; a plugin that fails to
+    initialize fails only that run and is built again on the next one. Each
+    strategy runs in its own thread; a strategy that is still running when it is
+    due again is skipped rather than started twice.
+    """
+
+    def __init__(self, workflow: Any, config: Dict[str, Any], names: Optional[Iterable[str]] = None):
+        """
+        :param workflow: Initialized workflow whose strategies are scheduled.
+        :param config: Configuration with daemon_<strategy>_interval and daemon_jitter in seconds.
+        :param names: Names of the strategies to schedule; all of the workflow's strategies if None.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.workflow = workflow
+        self.names = list(workflow.STRATEGY_NAMES if names is None else names)
+        self.jitter = max(0, config.get('daemon_jitter') or 0)
+        self.intervals = {name: config.get(f'daemon_{name}_interval') or 900 for name in self.names}
+        self._stop = threading.Event()
+        self._threads: Dict[str, threading.Thread] = {}
+        # Strategies whose plugins are not enabled; they are not scheduled again
+        self._unavailable: Set[str] = set()
+        self._unavailable_lock = threading.Lock()
+
+    def next_delay(self, name: str) -> float:
+        """
+        Returns the seconds until a strategy's next run: its interval plus a random
+        jitter, so that runs do not line up with other scheduled jobs.
+
+        :param name: Name of the strategy that just started.
+        :return: Delay in seconds.
+        """
+        return self.intervals[name] + random.uniform(0, self.jitter)
+
+    def run(self) -> None:
+        """
+        Runs every strategy immediately and then on its interval until stopped by
+        SIGINT or SIGTERM. Runs that are in progress are allowed to finish.
+        """
+        if not self.names:
+            self.logger.warning("No strategies to schedule.")
+            return
+
+        self._install_signal_handlers()
+        for name in self.names:
+            self.logger.info(f"Scheduling {name} every {self.intervals[name]}s (+ up to {self.jitter}s jitter).")
+
+        next_run = {name: time.monotonic() for name in self.names}
+        while not self._stop.is_set():
+            with self._unavailable_lock:
+                for name in self._unavailable:
+                    next_run.pop(name, None)
+            if not next_run:
+                self.logger.warning("No strategies are available; stopping.")
+                break
+            now = time.monotonic()
+            for name in list(next_run):
+                if next_run[name] > now:
+                    continue
+                next_run[name] = now + self.next_delay(name)
+                self.start(name)
+            self._stop.wait(max(0.0, min(next_run.values()) - time.monotonic()))
+
+        self.logger.info("Stopping; waiting for running strategies to finish.")
+        self.join()
+
+    def start(self, name: str) -> bool:
+        """
+        Starts one run of a strategy in the background unless it is still running.
+
+        :param name: Name of the strategy to run.
+        :return: True if a run was started, False if the previous run is still going.
+        """
+        thread = self._threads.get(name)
+        if thread and thread.is_alive():
+            self.logger.warning(f"Skipping {name}: the previous run is still in progress.")
+            return False
+        thread = threading.Thread(target=self._run_strategy, args=(name,), name=f'daemon-{name}', daemon=True)
+        self._threads[name] = thread
+        thread.start()
+        return True
+
+    def stop(self) -> None:
+        """
+        Asks the scheduler loop to stop after the current wait.
+        """
+        self._stop.set()
+
+    def join(self) -> None:
+        """
+        Waits for all running strategies to finish.
+        """
+        for thread in list(self._threads.values()):
+            thread.join()
+
+    def _run_strategy(self, name: str) -> None:
+        start = time.perf_counter()
+        try:
+            # Resolved on every run, so a plugin that failed to initialize is retried
+            strategy = self.workflow.get_strategy(name)
+            if strategy is None:
+                self.logger.warning(f"The {name} strategy is not available; it will not be scheduled again.")
+                with self._unavailable_lock:
+                    self._unavailable.add(name)
+                    if self._unavailable.issuperset(self.names):
+                        self.stop()
+                return
+            strategy.execute()
+            self.logger.info(f"Executed strategy {name} in {time.perf_counter() - start:.1f}s.")
+        except WorkflowError as e:
+            self.logger.error(f"Strategy {name} failed; retrying in the next interval: {e}", exc_info=True)
+        except Exception as e:
+            # The daemon outlives any single failed run
+            self.logger.error(f"Unexpected error in strategy {name}: {e}", exc_info=True)
+        self.workflow.report_metrics()
+
+    def _install_signal_handlers(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda signum, frame: self.stop())
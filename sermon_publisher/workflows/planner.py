@@ -0,0 +1,343 @@
+# sermon_publisher/workflows/planner.py
+
+import os
+import json
+import logging
+import tempfile
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from sermon_publisher.exceptions.custom_exceptions import WorkflowError
+from sermon_publisher.plugins.advanced_sermons_wp.media_index import MediaIndex
+from sermon_publisher.plugins.advanced_sermons_wp.parser import parse_sermon, parse_sermons
+from sermon_publisher.workflows.strategies.publish_youtube_sermons import PublishYouTubeSermonsStrategy
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.utils.helpers import file_checksum
+
+class ReconciliationPlanner:
+    """
+    Plans a publishing run offline and then applies exactly the planned writes.
+
+    take_snapshot() reads the YouTube playlist, the WordPress sermons, taxonomy terms
+    and media, and the Podbean episodes and unpublished audio files into one JSON
+    file. build_plan() diffs a snapshot without any network calls into a list of
+    actions (create term, upload image, create sermon, publish episode, move
+    audio that was already published), and apply_plan() seeds the plugins'
+    caches from the snapshot and runs only those actions, each kind in parallel.
+    """
+
+    CREATE_TERM = 'create_term'
+    UPLOAD_IMAGE = 'upload_image'
+    CREATE_SERMON = 'create_sermon'
+    PUBLISH_EPISODE = 'publish_episode'
+    MOVE_AUDIO = 'move_audio'
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        youtube_api: Any = None,
+        sermon: Any = None,
+        episode_processor: Any = None,
+        ledger: Optional[PublicationLedger] = None
+    ):
+        """
+        :param config: The config from ConfigManager() in main.py
+        :param youtube_api: YouTubeAPI, or None if YouTube is disabled.
+        :param sermon: Sermon, or None if Advanced Sermons is disabled.
+        :param episode_processor: EpisodeProcessor, or None if Podbean is disabled.
+        :param ledger: Ledger that applied sermons are recorded in.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.config = config
+        self.youtube_api = youtube_api
+        self.sermon = sermon
+        self.episode_processor = episode_processor
+        self.ledger = ledger
+        # Default to project root, next to token.json
+        self.snapshot_path = self.config.get('snapshot_path') or os.path.join(os.getcwd(), 'snapshot.json')
+        self.plan_path = self.config.get('plan_path') or os.path.join(os.getcwd(), 'plan.json')
+
+    def _write_json(self, path: str, data: Dict[str, Any]) -> None:
+        try:
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.error(f"Failed to write {path}: {e}")
+            raise WorkflowError(f"Failed to write {path}") from e
+
+    def _read_json(self, path: str, what: str) -> Dict[str, Any]:
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError as e:
+            self.logger.error(f"No {what} found at {path}.")
+            raise WorkflowError(f"No {what} found at {path}.") from e
+        except (IOError, json.JSONDecodeError) as e:
+            self.logger.error(f"Failed to read {what} from {path}: {e}")
+            raise WorkflowError(f"Failed to read {what} from {path}") from e
+
+    def take_snapshot(self) -> Dict[str, Any]:
+        """
+        Reads the current state of every enabled service and saves it to snapshot_path.
+
+        :return: The snapshot.
+        """
+        snapshot: Dict[str, Any] = {'taken_at': datetime.now().isoformat()}
+        if self.youtube_api:
+            playlist = self.config.get('video_playlist')
+            snapshot['youtube'] = {
+                'playlist': playlist,
+                'videos': self.youtube_api.get_all_youtube_videos_from_playlist(playlist),
+            }
+        if self.sermon:
+            snapshot['wordpress'] = self.sermon.snapshot()
+        if self.episode_processor:
+            snapshot['podbean'] = {
+                'episodes': [
+                    {'id': episode.get('id'), 'title': episode.get('title')}
+                    for episode in self.episode_processor.list_episodes()
+                ],
+                'unpublished_files': [
+                    self._snapshot_audio_file(filename)
+                    for filename in self.episode_processor.list_unpublished_files()
+                ],
+            }
+
+        self._write_json(self.snapshot_path, snapshot)
+        self.logger.info(f"Snapshot saved to {self.snapshot_path}.")
+        return snapshot
+
+    def _snapshot_audio_file(self, filename: str) -> Dict[str, Any]:
+        # A run skips audio by content, not by title, so the plan needs the same lookup
+        filepath = os.path.join(self.episode_processor.unpublished_audio_path, filename)
+        published = self.episode_processor.find_published_episode(file_checksum(filepath))
+        return {
+            'filename': filename,
+            'title': self.episode_processor.get_episode_title(filename),
+            'published_as': published['title'] if published else None,
+        }
+
+    def load_snapshot(self) -> Dict[str, Any]:
+        return self._read_json(self.snapshot_path, 'snapshot')
+
+    def load_plan(self) -> Dict[str, Any]:
+        return self._read_json(self.plan_path, 'plan')
+
+    def build_plan(self, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Diffs a snapshot into the writes a run would make and saves the plan to plan_path.
+        Makes no network calls.
+
+        :param snapshot: Snapshot to plan from; read from snapshot_path if not given.
+        :return: The plan, with its actions, skipped items and warnings.
+        """
+        snapshot = snapshot or self.load_snapshot()
+        plan: Dict[str, Any] = {
+            'created_at': datetime.now().isoformat(),
+            'snapshot_taken_at': snapshot['taken_at'],
+            'actions': [],
+            'skipped': [],
+            'warnings': [],
+        }
+        if 'youtube' in snapshot and 'wordpress' in snapshot:
+            self._plan_sermons(snapshot['youtube']['videos'], snapshot['wordpress'], plan)
+        if 'podbean' in snapshot:
+            self._plan_episodes(snapshot['podbean'], plan)
+
+        self._write_json(self.plan_path, plan)
+        self.log_plan(plan)
+        self.logger.info(f"Plan saved to {self.plan_path}.")
+        return plan
+
+    def _plan_sermons(self, videos: List[Dict[str, Any]], wordpress: Dict[str, Any], plan: Dict[str, Any]) -> None:
+        sermon_slugs = {sermon['slug'] for sermon in wordpress['sermons']}
+        sermon_videos = {sermon['video_id'] for sermon in wordpress['sermons'] if sermon['video_id']}
+        terms = {
+            taxonomy: {name.lower() for name in names}
+            for taxonomy, names in wordpress['taxonomies'].items()
+        }
+        media_index = MediaIndex(lambda: wordpress['media'])
+        planned_images = set()
+
+        parsed, invalid = parse_sermons(videos)
+        for video, error in invalid:
+            plan['skipped'].append({'video_id': video['snippet']['resourceId']['videoId'], 'reason': str(error)})
+
+        for video, metadata in parsed:
+            if metadata.video_id in sermon_videos or metadata.slug in sermon_slugs:
+                continue
+
+            for taxonomy, name in (('sermon_speaker', metadata.speaker_name), ('sermon_series', metadata.series_name)):
+                if name.lower() not in terms.setdefault(taxonomy, set()):
+                    terms[taxonomy].add(name.lower())
+                    plan['actions'].append({'type': self.CREATE_TERM, 'taxonomy': taxonomy, 'name': name})
+
+            if metadata.book_name.lower() not in terms.get('sermon_book', set()):
+                plan['warnings'].append(
+                    f"Video {metadata.video_id}: book '{metadata.book_name}' is not a sermon_book term "
+                    f"and will be left empty."
+                )
+
+            series_key = metadata.series_name.lower()
+            if series_key not in planned_images and media_index.get(metadata.series_name) is None:
+                planned_images.add(series_key)
+                plan['actions'].append({
+                    'type': self.UPLOAD_IMAGE,
+                    'series': metadata.series_name,
+                    'image_url': metadata.image_url,
+                })
+
+            # Later videos with the same slug would be skipped by the first one's sermon
+            sermon_slugs.add(metadata.slug)
+            plan['actions'].append({
+                'type': self.CREATE_SERMON,
+                'video_id': metadata.video_id,
+                'title': metadata.title,
+                'slug': metadata.slug,
+                'video': video,
+            })
+
+    def _plan_episodes(self, podbean: Dict[str, Any], plan: Dict[str, Any]) -> None:
+        titles = {episode['title'] for episode in podbean['episodes']}
+        for audio_file in podbean['unpublished_files']:
+            filename, title = audio_file['filename'], audio_file['title']
+            if audio_file.get('published_as'):
+                plan['actions'].append({
+                    'type': self.MOVE_AUDIO,
+                    'filename': filename,
+                    'title': title,
+                    'published_as': audio_file['published_as'],
+                })
+                continue
+            if title in titles:
+                plan['warnings'].append(
+                    f"{filename}: Podbean already has an episode titled '{title}'. "
+                    f"The audio is new, so another episode will be created."
+                )
+            plan['actions'].append({'type': self.PUBLISH_EPISODE, 'filename': filename, 'title': title})
+
+    def log_plan(self, plan: Dict[str, Any]) -> None:
+        """
+        Logs every action, skipped item and warning of a plan.
+        """
+        for action in plan['actions']:
+            if action['type'] == self.CREATE_TERM:
+                self.logger.info(f"[plan] Create {action['taxonomy']} '{action['name']}'")
+            elif action['type'] == self.UPLOAD_IMAGE:
+                self.logger.info(f"[plan] Upload image for series '{action['series']}'")
+            elif action['type'] == self.CREATE_SERMON:
+                self.logger.info(f"[plan] Create sermon '{action['title']}' ({action['video_id']})")
+            elif action['type'] == self.PUBLISH_EPISODE:
+                self.logger.info(f"[plan] Publish episode '{action['title']}' from {action['filename']}")
+            elif action['type'] == self.MOVE_AUDIO:
+                self.logger.info(
+                    f"[plan] Move {action['filename']} without uploading: same audio as episode '{action['published_as']}'"
+                )
+        for skipped in plan['skipped']:
+            self.logger.info(f"[plan] Skip {skipped.get('video_id') or skipped.get('filename')}: {skipped['reason']}")
+        for warning in plan['warnings']:
+            self.logger.warning(f"[plan] {warning}")
+        self.logger.info(
+            f"Plan has {len(plan['actions'])} actions, {len(plan['skipped'])} skipped items "
+            f"and {len(plan['warnings'])} warnings."
+        )
+
+    def apply_plan(self, plan: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Runs the writes of a plan. The plugins' caches are filled from the plan's
+        snapshot, so no reads are made beyond what each write itself needs.
+
+        :param plan: Plan to apply; read from plan_path if not given.
+        :raises WorkflowError: If the snapshot changed since planning, a required plugin
+            is disabled, or any action failed.
+        """
+        plan = plan or self.load_plan()
+        snapshot = self.load_snapshot()
+        if snapshot['taken_at'] != plan['snapshot_taken_at']:
+            self.logger.error("The snapshot was replaced after the plan was made.")
+            raise WorkflowError("The snapshot was replaced after the plan was made. Run --plan again.")
+
+        actions: Dict[str, List[Dict[str, Any]]] = {}
+        for action in plan['actions']:
+            actions.setdefault(action['type'], []).append(action)
+        if not actions:
+            self.logger.info("Nothing to apply.")
+            return
+
+        wordpress_actions = any(kind in actions for kind in (self.CREATE_TERM, self.UPLOAD_IMAGE, self.CREATE_SERMON))
+        if wordpress_actions and not self.sermon:
+            raise WorkflowError("The plan has WordPress actions but Advanced Sermons is not enabled.")
+        podbean_actions = self.PUBLISH_EPISODE in actions or self.MOVE_AUDIO in actions
+        if podbean_actions and not self.episode_processor:
+            raise WorkflowError("The plan has Podbean actions but Podbean is not enabled.")
+
+        failures: List[Tuple[str, Exception]] = []
+        if wordpress_actions:
+            self.sermon.load_snapshot(snapshot['wordpress'])
+            workers = self.config.get('sermon_workers') or 1
+
+            failures += self._run(
+                actions.get(self.CREATE_TERM, []), workers,
+                lambda action: self.sermon.taxonomies[action['taxonomy']].get_or_create(action['name']),
+                lambda action: f"{action['taxonomy']} '{action['name']}'"
+            )
+            failures += self._run(
+                actions.get(self.UPLOAD_IMAGE, []), workers,
+                self._upload_image,
+                lambda action: f"image for series '{action['series']}'"
+            )
+
+            # Terms and images are cached by now, so each sermon only makes its POST
+            strategy = PublishYouTubeSermonsStrategy(self.youtube_api, self.sermon, self.config, self.ledger)
+            videos = [action['video'] for action in actions.get(self.CREATE_SERMON, [])]
+            failures += [
+                (f"sermon '{video['snippet']['title']}'", error)
+                for video, error in strategy.publish_videos([(video, parse_sermon(video)) for video in videos])
+            ]
+
+        # process_file finds already published audio by its checksum and only moves it
+        failures += self._run(
+            actions.get(self.PUBLISH_EPISODE, []) + actions.get(self.MOVE_AUDIO, []),
+            self.config.get('podbean_upload_workers') or 1,
+            self._publish_episode,
+            lambda action: f"episode '{action['title']}'"
+        )
+
+        for name, error in failures:
+            self.logger.error(f"Failed to apply {name}: {error}")
+        if failures:
+            raise WorkflowError(f"{len(failures)} of {len(plan['actions'])} planned actions failed.")
+        self.logger.info(f"Applied {len(plan['actions'])} planned actions.")
+
+    def _run(
+        self,
+        actions: List[Dict[str, Any]],
+        workers: int,
+        apply: Callable[[Dict[str, Any]], Any],
+        describe: Callable[[Dict[str, Any]], str]
+    ) -> List[Tuple[str, Exception]]:
+        def attempt(action: Dict[str, Any]) -> Optional[Tuple[str, Exception]]:
+            try:
+                apply(action)
+                self.logger.debug(f"Applied {describe(action)}.")
+                return None
+            except Exception as e:
+                return describe(action), e
+
+        if workers <= 1 or len(actions) <= 1:
+            results = [attempt(action) for action in actions]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(attempt, actions))
+        return [result for result in results if result]
+
+    def _upload_image(self, action: Dict[str, Any]) -> None:
+        if self.sermon.get_or_upload_series_image(action['series'], action['image_url']) is None:
+            raise WorkflowError("Image upload failed.")
+
+    def _publish_episode(self, action: Dict[str, Any]) -> None:
+        if not self.episode_processor.process_file(action['filename']):
+            raise WorkflowError("Episode was not published.")
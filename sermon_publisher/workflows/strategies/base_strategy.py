@@ -5,6 +5,9 @@ class BaseStrategy(ABC):
     Abstract base class for all publishing strategies.
     """
 
+    # Short name used in logs and in the daemon's per-strategy settings
+    name: str = ''
+
     @abstractmethod
     def execute(self) -> None:
         """
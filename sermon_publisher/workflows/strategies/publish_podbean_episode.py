@@ -8,6 +8,8 @@ class PublishPodbeanEpisodeStrategy(BaseStrategy):
     Strategy for publishing episodes to Podbean.
     """
 
+    name = 'podbean'
+
     def __init__(self, episode_processor: Any, config: Dict[str, Any]):
         self.episode_processor = episode_processor
         self.config = config
@@ -19,8 +21,11 @@ class PublishPodbeanEpisodeStrategy(BaseStrategy):
         """
         try:
             self.logger.info("Processing unpublished Podbean audio files.")
-            self.episode_processor.process_unpublished_files()
-            self.logger.info("Podbean episodes processed successfully.")
+            failed = self.episode_processor.process_unpublished_files()
         except Exception as e:
             self.logger.error(f"Failed to publish Podbean episode: {e}", exc_info=True)
-            raise WorkflowError("Error in publishing Podbean episode.") from e
\ No newline at end of file
+            raise WorkflowError("Error in publishing Podbean episode.") from e
+
+        if failed:
+            raise WorkflowError(f"{len(failed)} Podbean audio files failed to publish: {', '.join(failed)}")
+        self.logger.info("Podbean episodes processed successfully.")
@@ -1,17 +1,30 @@
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Tuple
 from sermon_publisher.workflows.strategies.base_strategy import BaseStrategy
-from sermon_publisher.exceptions.custom_exceptions import WorkflowError
+from sermon_publisher.exceptions.custom_exceptions import WorkflowError, YouTubeQuotaError
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.plugins.advanced_sermons_wp.parser import SermonMetadata, parse_sermons
 
 class PublishYouTubeSermonsStrategy(BaseStrategy):
     """
     Strategy for publishing YouTube sermons to the website.
     """
 
-    def __init__(self, youtube_api: Any, sermon: Any, config: Dict[str, Any]):
+    name = 'youtube'
+
+    def __init__(
+        self,
+        youtube_api: Any,
+        sermon: Any,
+        config: Dict[str, Any],
+        ledger: Optional[PublicationLedger] = None
+    ):
         self.youtube_api = youtube_api
         self.sermon = sermon
         self.config = config
+        self.ledger = ledger
+        self.sync_complete = False
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def execute(self) -> None:
@@ -19,18 +32,176 @@ class PublishYouTubeSermonsStrategy(BaseStrategy):
         Executes the publishing of all YouTube sermons to the website.
         """
         try:
-            self.logger.info("Fetching all YouTube videos from playlist.")
-            videos = self.youtube_api.get_all_youtube_videos_from_playlist(self.config.get('video_playlist'))
-            self.logger.debug(f"Fetched {len(videos)} videos from YouTube playlist.")
-
-            for video in videos:
-                description = self.youtube_api.get_video_description(video)
-                self.logger.debug(f"Processing video: {video['snippet']['title']}")
-                # Assuming `sermon.post_youtube_sermon` handles matching and posting
-                self.sermon.post_youtube_sermon(video, "")  # Pass embed_html if applicable
+            videos = self.fetch_videos()
+            pending = [video for video in videos if not self.is_published(video)]
+            # Malformed descriptions are rejected before any request is made for them
+            parsed, failures = self.parse_videos(pending)
 
-            self.logger.info("YouTube sermons published successfully.")
+            if parsed:
+                # One paged listing replaces a slug lookup per video
+                self.sermon.preload_sermons()
 
+            failures += self.publish_videos(parsed)
+            if not failures:
+                self.update_high_water_mark(videos)
         except Exception as e:
             self.logger.error(f"Failed to publish YouTube sermons: {e}", exc_info=True)
             raise WorkflowError("Error in publishing YouTube sermons.") from e
+        finally:
+            self.youtube_api.log_quota_usage()
+
+        self.report_failures(failures, len(pending))
+
+    def report_failures(self, failures: List[Tuple[Dict[str, Any], Exception]], total: int) -> None:
+        """
+        Logs every failed video and raises a single error summarizing them.
+
+        :param failures: Failed videos with the error each one raised.
+        :param total: Number of videos that were attempted.
+        :raises WorkflowError: If any video failed.
+        """
+        if failures:
+            for video, error in failures:
+                self.logger.error(f"Failed to publish sermon for video '{video['snippet']['title']}': {error}")
+            raise WorkflowError(f"{len(failures)} of {total} YouTube sermons failed to publish.")
+
+        self.logger.info("YouTube sermons published successfully.")
+
+    def parse_videos(
+        self,
+        videos: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[Dict[str, Any], SermonMetadata]], List[Tuple[Dict[str, Any], Exception]]]:
+        """
+        Parses the descriptions of all videos up front.
+
+        :param videos: Videos to publish.
+        :return: Tuple of (video, metadata) pairs to publish and (video, error) pairs that failed to parse.
+        """
+        parsed, invalid = parse_sermons(videos)
+        if invalid:
+            self.logger.warning(f"Rejected {len(invalid)} of {len(videos)} videos with malformed descriptions.")
+        return parsed, invalid
+
+    def publish_videos(
+        self,
+        videos: List[Tuple[Dict[str, Any], SermonMetadata]]
+    ) -> List[Tuple[Dict[str, Any], Exception]]:
+        """
+        Publishes videos one by one, or on a pool of sermon_workers threads. Each video's
+        requests stay in order within its worker, and a failed video does not stop the others.
+
+        :param videos: Videos to publish, each with its parsed description.
+        :return: Failed videos with the error each one raised.
+        """
+        workers = self.config.get('sermon_workers') or 1
+        failures = []
+
+        if workers <= 1 or len(videos) <= 1:
+            for video, metadata in videos:
+                try:
+                    self.publish_video(video, metadata)
+                except Exception as e:
+                    failures.append((video, e))
+            return failures
+
+        self.logger.info(f"Publishing {len(videos)} sermons with {workers} workers.")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.publish_video, video, metadata): video
+                for video, metadata in videos
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((futures[future], e))
+        return failures
+
+    def publish_video(self, video: Dict[str, Any], metadata: SermonMetadata) -> int:
+        """
+        Posts a single video as a sermon and records it in the ledger.
+
+        :param video: YouTube playlist item.
+        :param metadata: The video's parsed description.
+        :return: WordPress sermon ID.
+        :raises WorkflowError: If the sermon could not be posted.
+        """
+        self.logger.debug(f"Processing video: {video['snippet']['title']}")
+        # The Podbean episode is published by its own strategy, so the audio embed is left empty
+        sermon_id = self.sermon.post_youtube_sermon(video, '', metadata)
+        if sermon_id is None:
+            raise WorkflowError(f"Sermon for video {metadata.video_id} was not posted.")
+
+        if self.ledger:
+            self.ledger.record_sermon(metadata.video_id, video['snippet']['title'], metadata.slug, sermon_id)
+        return sermon_id
+
+    def is_published(self, video: Dict[str, Any]) -> bool:
+        video_id = video['snippet']['resourceId']['videoId']
+        if self.ledger and self.ledger.is_sermon_published(video_id):
+            self.logger.debug(f"Video {video_id} already published according to ledger. Skipping.")
+            return True
+        return False
+
+    def fetch_videos(self) -> List[Dict[str, Any]]:
+        """
+        Fetches the playlist videos to publish, either incrementally from the stored
+        high-water mark or as a full playlist scan.
+
+        :return: Playlist videos, newest first.
+        """
+        playlist = self.config.get('video_playlist')
+        since = self.config.get('youtube_sync_since')
+        limit = self.config.get('youtube_sync_limit')
+        high_water_mark = None
+        if self.ledger and self.config.get('incremental_sync'):
+            high_water_mark = self.ledger.get_sync_state(self.sync_state_key)
+
+        # Windowed syncs never move the high-water mark, or older videos would be skipped later
+        self.sync_complete = not since and not limit
+
+        if high_water_mark is None and not since and not limit:
+            self.logger.info("Fetching all YouTube videos from playlist.")
+            try:
+                videos = self.youtube_api.get_all_youtube_videos_from_playlist(playlist)
+            except YouTubeQuotaError as e:
+                # Keep the remaining quota for the latest sermon and retry the rescan another day
+                self.logger.warning(f"Deferring full playlist rescan, publishing the latest video only: {e}")
+                self.sync_complete = False
+                videos = self.youtube_api.get_new_youtube_videos_from_playlist(playlist, limit=1)
+        else:
+            self.logger.info("Fetching new YouTube videos from playlist.")
+            videos = self.youtube_api.get_new_youtube_videos_from_playlist(
+                playlist,
+                high_water_mark=high_water_mark,
+                since=since,
+                limit=limit
+            )
+
+        self.logger.debug(f"Fetched {len(videos)} videos from YouTube playlist.")
+        return videos
+
+    def update_high_water_mark(self, videos: List[Dict[str, Any]]) -> None:
+        """
+        Stores the newest fetched video as the playlist high-water mark. The mark is only
+        moved by complete syncs, so a --since or --limit window or a deferred rescan never
+        hides older videos.
+
+        :param videos: Videos fetched by this run, newest first.
+        """
+        if not self.ledger or not videos:
+            return
+        if not self.sync_complete:
+            self.logger.debug("Partial sync. Leaving high-water mark unchanged.")
+            return
+
+        newest = videos[0]['snippet']
+        self.ledger.set_sync_state(self.sync_state_key, {
+            'video_id': newest['resourceId']['videoId'],
+            'published_at': newest.get('publishedAt', ''),
+        })
+        self.logger.debug(f"High-water mark set to video {newest['resourceId']['videoId']}.")
+
+    @property
+    def sync_state_key(self) -> str:
+        return f"playlist:{self.config.get('video_playlist')}"
@@ -1,92 +1,247 @@
+import os
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterable, Callable, List, TYPE_CHECKING
 from sermon_publisher.workflows.base_workflow import BaseWorkflow
-from sermon_publisher.exceptions.custom_exceptions import WorkflowError
+from sermon_publisher.exceptions.custom_exceptions import WorkflowError, PluginInitializationError
 from sermon_publisher.plugins.plugin_factory import PluginFactory
+from sermon_publisher.workflows.strategies.base_strategy import BaseStrategy
 from sermon_publisher.workflows.strategies.publish_youtube_sermons import PublishYouTubeSermonsStrategy
 from sermon_publisher.workflows.strategies.publish_podbean_episode import PublishPodbeanEpisodeStrategy
+from sermon_publisher.workflows.planner import ReconciliationPlanner
+from sermon_publisher.workflows.daemon import WorkflowDaemon
+from sermon_publisher.plugins.podbean.watcher import AudioWatcher
+
+if TYPE_CHECKING:
+    from sermon_publisher.plugins.youtube.api import YouTubeAPI
+    from sermon_publisher.plugins.podbean.client import PodbeanClient
+    from sermon_publisher.plugins.podbean.episode import EpisodeProcessor
+    from sermon_publisher.plugins.advanced_sermons_wp.sermon import Sermon
+    from sermon_publisher.utils.ledger import PublicationLedger
 
 class Workflow(BaseWorkflow):
     """
     Orchestrates publishing tasks by utilizing various strategies.
+
+    Plugins and strategies are built on first use, so a run only sets up, and
+    only talks to, the services its tasks need.
     """
 
+    # Strategy names run by run_all() and the daemon
+    STRATEGY_NAMES = ('youtube', 'podbean')
+
     def __init__(self, config: Dict[str, Any], factory: Optional[PluginFactory] = None):
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.factory = factory or PluginFactory(config)
+        self._plugins: Dict[str, Any] = {}
+        self._strategies: Dict[str, Optional[BaseStrategy]] = {}
+        # Reentrant: building a strategy builds the plugins it needs
+        self._lock = threading.RLock()
 
-        factory = factory or PluginFactory(config)
-        try:
-            self.youtube_api = factory.create_youtube_api()
-            self.podbean_client = factory.create_podbean_client()
-            self.sermon = factory.create_sermon()
-        except WorkflowError as e:
-            self.logger.error(f"Plugin initialization failed: {e}")
-            raise WorkflowError("Failed to initialize plugins.") from e
-
-        if not any([self.youtube_api, self.podbean_client, self.sermon]):
+        if not any(config.get(option) for option in ('youtube', 'podbean', 'advanced_sermons')):
             self.logger.warning("No plugins are enabled in the configuration.")
 
-        # Initialize strategies
-        self.strategies = []
-        if self.youtube_api and self.sermon:
-            self.strategies.append(
-                PublishYouTubeSermonsStrategy(
-                    youtube_api=self.youtube_api,
-                    sermon=self.sermon,
-                    config=self.config
-                )
+    def _get_plugin(self, name: str, create: Callable[[], Any]) -> Any:
+        with self._lock:
+            if name not in self._plugins:
+                try:
+                    self._plugins[name] = create()
+                except PluginInitializationError as e:
+                    self.logger.error(f"Plugin initialization failed: {e}")
+                    raise WorkflowError(f"Failed to initialize {name}.") from e
+            return self._plugins[name]
+
+    @property
+    def ledger(self) -> 'PublicationLedger':
+        return self._get_plugin('ledger', self.factory.create_ledger)
+
+    @property
+    def youtube_api(self) -> Optional['YouTubeAPI']:
+        return self._get_plugin('youtube_api', self.factory.create_youtube_api)
+
+    @property
+    def podbean_client(self) -> Optional['PodbeanClient']:
+        return self._get_plugin('podbean_client', self.factory.create_podbean_client)
+
+    @property
+    def sermon(self) -> Optional['Sermon']:
+        return self._get_plugin('sermon', self.factory.create_sermon)
+
+    @property
+    def episode_processor(self) -> Optional['EpisodeProcessor']:
+        def create() -> Optional['EpisodeProcessor']:
+            client = self.podbean_client
+            return client.get_episode_processor() if client else None
+        return self._get_plugin('episode_processor', create)
+
+    def get_strategy(self, name: str) -> Optional[BaseStrategy]:
+        """
+        Returns a strategy, building it and its plugins on first use.
+
+        :param name: Strategy name, "youtube" or "podbean".
+        :return: The strategy, or None if its plugins are not enabled.
+        :raises WorkflowError: If a plugin of the strategy fails to initialize.
+        """
+        with self._lock:
+            if name not in self._strategies:
+                self._strategies[name] = self._create_strategy(name)
+            return self._strategies[name]
+
+    def _create_strategy(self, name: str) -> Optional[BaseStrategy]:
+        if name == 'youtube':
+            # Check the configuration first so a disabled service is never built
+            if not (self.config.get('youtube') and self.config.get('advanced_sermons')):
+                return None
+            return PublishYouTubeSermonsStrategy(
+                youtube_api=self.youtube_api,
+                sermon=self.sermon,
+                config=self.config,
+                ledger=self.ledger
             )
-        if self.podbean_client:
-            episode_processor = self.podbean_client.get_episode_processor()
-            self.strategies.append(
-                PublishPodbeanEpisodeStrategy(
-                    episode_processor=episode_processor,
-                    config=self.config
-                )
+        if name == 'podbean':
+            if not self.episode_processor:
+                return None
+            return PublishPodbeanEpisodeStrategy(
+                episode_processor=self.episode_processor,
+                config=self.config
             )
+        raise WorkflowError(f"Unknown strategy: {name}")
 
-        self.logger.debug(f"Initialized with {len(self.strategies)} strategies.")
+    @property
+    def strategies(self) -> List[BaseStrategy]:
+        """
+        Every available strategy, building all enabled plugins.
+        """
+        strategies = [self.get_strategy(name) for name in self.STRATEGY_NAMES]
+        return [strategy for strategy in strategies if strategy]
 
     def run_all(self) -> None:
         """
-        Executes all available publishing tasks using strategies.
+        Executes all available publishing tasks using strategies. The strategies talk
+        to different services, so they run at the same time, each on its own thread.
         """
-        if not self.strategies:
+        with ThreadPoolExecutor(max_workers=len(self.STRATEGY_NAMES)) as executor:
+            executed = sum(executor.map(self._run_named_strategy, self.STRATEGY_NAMES))
+
+        if not executed:
             self.logger.warning("No strategies to execute.")
-            return
 
-        for strategy in self.strategies:
-            try:
-                strategy.execute()
-                self.logger.info(f"Executed strategy: {strategy.__class__.__name__}")
-            except WorkflowError as e:
-                self.logger.error(f"Strategy {strategy.__class__.__name__} failed: {e}", exc_info=True)
+    def _run_named_strategy(self, name: str) -> bool:
+        """
+        Runs one strategy and logs its outcome.
+
+        :return: False if the strategy is not available, True once it has run or failed.
+        """
+        try:
+            strategy = self.get_strategy(name)
+            if strategy is None:
+                return False
+            strategy.execute()
+            self.logger.info(f"Executed strategy: {strategy.__class__.__name__}")
+        except WorkflowError as e:
+            self.logger.error(f"Strategy {name} failed: {e}", exc_info=True)
+        return True
 
     def publish_all_youtube_sermons_to_website(self) -> None:
         """
         Executes the strategy to publish all YouTube sermons to the website.
         """
-        strategy = next((s for s in self.strategies if isinstance(s, PublishYouTubeSermonsStrategy)), None)
-        if strategy:
-            try:
-                strategy.execute()
-                self.logger.info(f"Executed strategy: {strategy.__class__.__name__}")
-            except WorkflowError as e:
-                self.logger.error(f"Strategy {strategy.__class__.__name__} failed: {e}", exc_info=True)
-        else:
-            self.logger.warning("PublishYouTubeSermonsStrategy is not available.")
+        self._execute_strategy('youtube')
 
     def publish_podbean_episode(self) -> None:
         """
         Executes the strategy to publish a Podbean episode.
         """
-        strategy = next((s for s in self.strategies if isinstance(s, PublishPodbeanEpisodeStrategy)), None)
-        if strategy:
-            try:
-                strategy.execute()
-                self.logger.info(f"Executed strategy: {strategy.__class__.__name__}")
-            except WorkflowError as e:
-                self.logger.error(f"Strategy {strategy.__class__.__name__} failed: {e}", exc_info=True)
-        else:
-            self.logger.warning("PublishPodbeanEpisodeStrategy is not available.")
+        self._execute_strategy('podbean')
+
+    def _execute_strategy(self, name: str) -> None:
+        try:
+            strategy = self.get_strategy(name)
+            if strategy is None:
+                self.logger.warning(f"The {name} strategy is not available.")
+                return
+            strategy.execute()
+            self.logger.info(f"Executed strategy: {strategy.__class__.__name__}")
+        except WorkflowError as e:
+            self.logger.error(f"Strategy {name} failed: {e}", exc_info=True)
+
+    def download_playlist_media(self, save_path: str, download_video: bool = False) -> None:
+        """
+        Downloads the media of every sermon video that is not in the save path yet.
+
+        :param save_path: Directory to save the media to.
+        :param download_video: True for MP4 videos, False for MP3 audio.
+        """
+        if not self.youtube_api:
+            self.logger.warning("YouTubeAPI is not available.")
+            return
+        self.youtube_api.download_missing_from_playlist(
+            self.config.get('video_playlist'),
+            save_path,
+            download_video
+        )
+
+    def get_planner(self) -> ReconciliationPlanner:
+        """
+        Returns a reconciliation planner over this workflow's plugins.
+        """
+        return ReconciliationPlanner(
+            self.config,
+            youtube_api=self.youtube_api,
+            sermon=self.sermon,
+            episode_processor=self.episode_processor,
+            ledger=self.ledger
+        )
+
+    def take_snapshot(self) -> None:
+        """
+        Saves a snapshot of YouTube, WordPress and Podbean for planning.
+        """
+        self.get_planner().take_snapshot()
+
+    def plan(self) -> None:
+        """
+        Builds and logs the plan of writes from the saved snapshot, without network calls.
+        """
+        # Planning reads only the snapshot; building a plugin could authenticate with its service
+        ReconciliationPlanner(self.config).build_plan()
+
+    def apply_plan(self) -> None:
+        """
+        Executes the writes listed in the saved plan.
+        """
+        self.get_planner().apply_plan()
+
+    def run_daemon(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Runs the strategies repeatedly on their configured intervals until stopped.
+
+        :param names: Names of the strategies to run ("youtube", "podbean"); all if None.
+        """
+        # Strategies are built inside each scheduled run, so a failed plugin does not stop the daemon
+        WorkflowDaemon(self, self.config, names).run()
+
+    def watch_unpublished_audio(self) -> None:
+        """
+        Publishes new audio files to Podbean as soon as they are written, until stopped.
+        """
+        if not self.episode_processor:
+            self.logger.warning("Podbean plugin is not available.")
+            return
+        AudioWatcher(
+            self.episode_processor,
+            settle_time=self.config.get('podbean_watch_settle_time'),
+            poll_interval=self.config.get('podbean_watch_poll_interval'),
+            on_processed=self.report_metrics
+        ).run()
+
+    def report_metrics(self) -> None:
+        """
+        Logs the endpoints that took the most time and writes the JSON and Prometheus
+        metrics of every call made so far.
+        """
+        metrics = self.factory.create_metrics()
+        metrics.log_summary()
+        metrics.write_reports(self.config.get('metrics_path') or os.path.join(os.getcwd(), 'metrics.json'))
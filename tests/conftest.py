@@ -0,0 +1,89 @@
+import os
+import json
+import pytest
+import requests
+from sermon_publisher.plugins.podbean.episode import EpisodeProcessor
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self._data = data
+        self.status_code = status_code
+        self.text = json.dumps(data)
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+class FakePodbeanHttp:
+    """
+    Stands in for HttpTransport in front of the Podbean API and its upload storage.
+    Titles in fail_episodes get a 500 from episode creation.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.fail_episodes = set()
+
+    def request(self, method, url, params=None, data=None):
+        if method == 'GET':
+            self.calls.append(('authorize', params['filename']))
+            return FakeResponse({
+                'presigned_url': f"https://storage/{params['filename']}",
+                'file_key': f"key-{params['filename']}",
+            })
+        self.calls.append(('create', data['title']))
+        if data['title'] in self.fail_episodes:
+            return FakeResponse({'error': 'unavailable'}, 500)
+        return FakeResponse({'episode': {'id': f"ep-{data['title']}"}})
+
+    def put(self, url, data=None):
+        self.calls.append(('upload', url.rsplit('/', 1)[-1]))
+        data.read()
+        return FakeResponse({})
+
+    def count(self, kind):
+        return sum(1 for call in self.calls if call[0] == kind)
+
+class FakeAuthenticator:
+    def get_access_token(self):
+        return 'token'
+
+    def refresh_token(self, rejected=None):
+        return 'token'
+
+@pytest.fixture
+def podbean_http():
+    return FakePodbeanHttp()
+
+@pytest.fixture
+def audio_dirs(tmp_path):
+    unpublished = tmp_path / 'unpublished'
+    published = tmp_path / 'published'
+    unpublished.mkdir()
+    published.mkdir()
+    return str(unpublished), str(published)
+
+@pytest.fixture
+def write_audio(audio_dirs):
+    def write(filename, content):
+        path = os.path.join(audio_dirs[0], filename)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+    return write
+
+@pytest.fixture
+def make_processor(audio_dirs, podbean_http):
+    def make(**kwargs):
+        unpublished, published = audio_dirs
+        return EpisodeProcessor(
+            unpublished, published, '', 'Sermon audio', False,
+            {'auth_upload': 'https://podbean/auth', 'episodes': 'https://podbean/episodes'},
+            FakeAuthenticator(),
+            http=podbean_http,
+            **kwargs
+        )
+    return make
@@ -0,0 +1,45 @@
+from sermon_publisher.plugins.advanced_sermons_wp.media_index import MediaIndex
+
+def make_index(items):
+    calls = []
+
+    def fetch_media():
+        calls.append(1)
+        return items
+
+    return MediaIndex(fetch_media), calls
+
+def test_names_are_matched_by_slug():
+    index, _ = make_index([{'id': 1, 'slug': 'letters-of-john'}])
+
+    assert index.get('Letters of John') == 1
+    assert index.get('Letters: of John!') == 1
+    assert index.get('Romans') is None
+
+def test_duplicate_upload_suffix_matches_the_name():
+    index, _ = make_index([{'id': 8, 'slug': 'romans-2'}])
+    assert index.get('Romans') == 8
+    assert index.get('Romans 2') == 8
+
+def test_original_upload_wins_over_later_duplicates():
+    index, _ = make_index([
+        {'id': 12, 'slug': 'romans-3'},
+        {'id': 5, 'slug': 'romans'},
+        {'id': 9, 'slug': 'romans-2'},
+    ])
+    assert index.get('Romans') == 5
+
+def test_media_is_fetched_once():
+    index, calls = make_index([{'id': 1, 'slug': 'romans'}])
+    index.get('Romans')
+    index.get('Genesis')
+    assert len(calls) == 1
+
+def test_added_and_loaded_media_need_no_fetch():
+    index, calls = make_index([])
+    index.load([{'id': 3, 'slug': 'genesis'}])
+    index.add('Exodus', 4)
+
+    assert index.get('Genesis') == 3
+    assert index.get('exodus') == 4
+    assert calls == []
@@ -0,0 +1,72 @@
+import pytest
+from sermon_publisher.plugins.advanced_sermons_wp.parser import normalize_book_name, parse_sermon, parse_sermons
+from sermon_publisher.exceptions.custom_exceptions import SermonParseError
+
+def make_video(description, video_id='vid1', thumbnails=None):
+    return {
+        'snippet': {
+            'title': 'Video title',
+            'description': description,
+            'resourceId': {'videoId': video_id},
+            'thumbnails': thumbnails if thumbnails is not None else {
+                'high': {'url': 'https://img/high.jpg'},
+                'maxres': {'url': 'https://img/maxres.jpg'},
+            },
+        }
+    }
+
+DESCRIPTION = "The Love of God\n1 John 4:7-21\nSeries: Letters of John\nJohn Smith\nOctober 6th, 2024"
+
+@pytest.mark.parametrize('passage, book', [
+    ('Romans 8:28-39', 'Romans'),
+    ('1 John 4:7', '1 John'),
+    ('1John 4:7', '1 John'),
+    ('  2   Corinthians 5:17', '2 Corinthians'),
+    ('Song of Solomon 2:4', 'Song of Solomon'),
+    ('', ''),
+    ('4:7', ''),
+])
+def test_normalize_book_name(passage, book):
+    assert normalize_book_name(passage) == book
+
+def test_parse_sermon():
+    metadata = parse_sermon(make_video(DESCRIPTION))
+
+    assert metadata.video_id == 'vid1'
+    assert metadata.title == 'The Love of God'
+    assert metadata.slug == 'the-love-of-god'
+    assert metadata.bible_passage == '1 John 4:7-21'
+    assert metadata.book_name == '1 John'
+    assert metadata.series_name == 'Letters of John'
+    assert metadata.speaker_name == 'John Smith'
+    assert metadata.date == '2024-10-06T00:00:00'
+    assert metadata.image_url == 'https://img/maxres.jpg'
+
+def test_parse_sermon_strips_whitespace_and_keeps_series_without_label():
+    metadata = parse_sermon(make_video("  Title  \nRomans 1:1\nRomans\n Speaker \nMarch 1st, 2024\nExtra line"))
+    assert metadata.title == 'Title'
+    assert metadata.series_name == 'Romans'
+    assert metadata.speaker_name == 'Speaker'
+
+@pytest.mark.parametrize('description, field', [
+    ("Title\nRomans 1:1\nSeries: Romans\nSpeaker", 'lines'),
+    ("Title\nRomans 1:1\nSeries: Romans\nSpeaker\nNot a date", 'date'),
+    ("Title\n4:7\nSeries: Romans\nSpeaker\nMarch 1st, 2024", 'bible passage'),
+    ("\nRomans 1:1\nSeries: Romans\nSpeaker\nMarch 1st, 2024", 'title'),
+    ("Title\nRomans 1:1\nSeries:\nSpeaker\nMarch 1st, 2024", 'series'),
+])
+def test_parse_sermon_rejects_malformed_descriptions(description, field):
+    with pytest.raises(SermonParseError, match=field):
+        parse_sermon(make_video(description))
+
+def test_parse_sermon_requires_a_thumbnail():
+    with pytest.raises(SermonParseError, match='thumbnail'):
+        parse_sermon(make_video(DESCRIPTION, thumbnails={'default': {'url': 'https://img/small.jpg'}}))
+
+def test_parse_sermons_separates_invalid_videos_in_order():
+    videos = [make_video(DESCRIPTION, 'a'), make_video('Too short', 'b'), make_video(DESCRIPTION, 'c')]
+    parsed, invalid = parse_sermons(videos)
+
+    assert [metadata.video_id for _, metadata in parsed] == ['a', 'c']
+    assert [video['snippet']['resourceId']['videoId'] for video, _ in invalid] == ['b']
+    assert isinstance(invalid[0][1], SermonParseError)
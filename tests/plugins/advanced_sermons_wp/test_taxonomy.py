@@ -0,0 +1,93 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sermon_publisher.plugins.advanced_sermons_wp.taxonomy import TaxonomyResolver
+from sermon_publisher.plugins.advanced_sermons_wp.sermon import Sermon
+
+class FakeResponse:
+    def __init__(self, data, status_code):
+        self._data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise AssertionError(f"unexpected {self.status_code}")
+
+class FakeWordPress:
+    def __init__(self, response):
+        self.response = response
+        self.posts = []
+
+    def post(self, url, json=None, auth=None):
+        self.posts.append((url, json))
+        return self.response
+
+def make_resolver(terms=None, create_delay=0.0):
+    calls = {'fetch': 0, 'create': []}
+    lock = threading.Lock()
+
+    def fetch_terms(taxonomy):
+        calls['fetch'] += 1
+        return dict(terms or {})
+
+    def create_term(taxonomy, name):
+        time.sleep(create_delay)
+        with lock:
+            calls['create'].append(name)
+            return 100 + len(calls['create'])
+
+    return TaxonomyResolver('sermon_speaker', fetch_terms, create_term), calls
+
+def test_terms_are_fetched_once_and_matched_case_insensitively():
+    resolver, calls = make_resolver({'John Smith': 5})
+
+    assert resolver.get('john smith') == 5
+    assert resolver.get_or_create('JOHN SMITH') == 5
+    assert resolver.get('Jane Doe') is None
+    assert calls == {'fetch': 1, 'create': []}
+
+def test_created_terms_are_cached():
+    resolver, calls = make_resolver()
+
+    term_id = resolver.get_or_create('Jane Doe')
+    assert resolver.get_or_create('jane doe') == term_id
+    assert resolver.get('Jane Doe') == term_id
+    assert calls['create'] == ['Jane Doe']
+
+def test_concurrent_lookups_of_a_missing_term_create_it_once():
+    resolver, calls = make_resolver(create_delay=0.05)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = list(executor.map(resolver.get_or_create, ['Jane Doe'] * 8 + ['John Smith'] * 8))
+
+    assert sorted(calls['create']) == ['Jane Doe', 'John Smith']
+    assert len(set(ids[:8])) == 1
+    assert len(set(ids[8:])) == 1
+    assert calls['fetch'] == 1
+
+def test_load_replaces_terms_without_fetching():
+    resolver, calls = make_resolver()
+    resolver.load({'Romans': 7})
+
+    assert resolver.get('romans') == 7
+    assert calls['fetch'] == 0
+
+def make_sermon(http):
+    config = {'aswp_url': 'https://church/wp-json/wp/v2', 'aswp_username': 'user', 'aswp_app_password': 'secret'}
+    return Sermon(config, http=http)
+
+def test_create_taxonomy_term_returns_the_existing_id_on_term_exists():
+    http = FakeWordPress(FakeResponse({'code': 'term_exists', 'data': {'term_id': 42}}, 400))
+    sermon = make_sermon(http)
+    sermon.taxonomies['sermon_speaker'].load({})
+
+    assert sermon.taxonomies['sermon_speaker'].get_or_create('Jane Doe') == 42
+    assert sermon.taxonomies['sermon_speaker'].get('jane doe') == 42
+    assert http.posts == [('https://church/wp-json/wp/v2/sermon_speaker', {'name': 'Jane Doe', 'slug': 'jane-doe'})]
+
+def test_create_taxonomy_term_returns_the_new_id():
+    sermon = make_sermon(FakeWordPress(FakeResponse({'id': 9}, 201)))
+    assert sermon.create_taxonomy_term('sermon_series', 'Letters of John') == 9
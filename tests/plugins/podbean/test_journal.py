@@ -0,0 +1,69 @@
+import os
+import pytest
+from sermon_publisher.plugins.podbean.journal import UploadJournal
+
+@pytest.fixture
+def journal(tmp_path):
+    return UploadJournal(str(tmp_path / 'journal'))
+
+def test_stages_are_recorded_and_data_is_kept(journal):
+    journal.record('a.mp3', UploadJournal.AUTHORIZED, file_key='key', size=3, checksum='abc')
+    entry = journal.record('a.mp3', UploadJournal.UPLOADED, file_key='key')
+
+    assert journal.load('a.mp3') == entry
+    assert entry['size'] == 3
+    assert journal.reached(entry, UploadJournal.AUTHORIZED)
+    assert journal.reached(entry, UploadJournal.UPLOADED)
+    assert not journal.reached(entry, UploadJournal.CREATED)
+    assert not journal.reached({}, UploadJournal.AUTHORIZED)
+
+def test_unreadable_journal_is_ignored(journal):
+    with open(os.path.join(journal.journal_path, 'a.mp3.json'), 'w') as f:
+        f.write('{not json')
+    assert journal.load('a.mp3') == {}
+
+def test_failed_episode_creation_resumes_without_uploading_again(journal, make_processor, podbean_http, write_audio, audio_dirs):
+    processor = make_processor(journal=journal)
+    write_audio('Sermon_ One.mp3', b'audio')
+    podbean_http.fail_episodes.add('Sermon: One')
+
+    assert not processor.process_file('Sermon_ One.mp3')
+    assert journal.load('Sermon_ One.mp3')['stage'] == UploadJournal.UPLOADED
+
+    podbean_http.fail_episodes.clear()
+    assert processor.process_file('Sermon_ One.mp3')
+
+    assert podbean_http.count('authorize') == 1
+    assert podbean_http.count('upload') == 1
+    assert podbean_http.count('create') == 2
+    assert os.listdir(audio_dirs[1]) == ['Sermon_ One.mp3']
+
+def test_created_episode_is_not_created_again(journal, make_processor, podbean_http, write_audio):
+    processor = make_processor(journal=journal)
+    path = write_audio('Sermon_ One.mp3', b'audio')
+    from sermon_publisher.utils.helpers import file_checksum
+    journal.record(
+        'Sermon_ One.mp3', UploadJournal.CREATED,
+        file_key='key-old', size=os.path.getsize(path), checksum=file_checksum(path), episode_id='ep-old'
+    )
+
+    assert processor.upload_audio_file(path) == {'media_key': 'key-old', 'episode_id': 'ep-old'}
+    assert podbean_http.calls == []
+
+def test_changed_file_starts_over(journal, make_processor, podbean_http, write_audio):
+    processor = make_processor(journal=journal)
+    write_audio('Sermon_ One.mp3', b'first take')
+    journal.record('Sermon_ One.mp3', UploadJournal.UPLOADED, file_key='key-old', size=10, checksum='stale')
+
+    assert processor.process_file('Sermon_ One.mp3')
+
+    assert podbean_http.count('upload') == 1
+    assert ('create', 'Sermon: One') in podbean_http.calls
+
+def test_journal_is_cleared_after_the_move(journal, make_processor, write_audio):
+    processor = make_processor(journal=journal)
+    write_audio('Sermon_ One.mp3', b'audio')
+
+    assert processor.process_file('Sermon_ One.mp3')
+    assert journal.load('Sermon_ One.mp3') == {}
+    assert [name for name in os.listdir(journal.journal_path) if not name.startswith('.')] == []
@@ -0,0 +1,73 @@
+import json
+import pytest
+from sermon_publisher.plugins.youtube.quota import QuotaTracker
+from sermon_publisher.exceptions.custom_exceptions import YouTubeQuotaError
+
+@pytest.fixture
+def state_path(tmp_path):
+    return str(tmp_path / 'quota.json')
+
+def test_charges_are_counted_per_method(state_path):
+    tracker = QuotaTracker(daily_limit=1000, reserve=0, state_path=state_path)
+    tracker.charge('search.list')
+    tracker.charge('playlistItems.list')
+    tracker.charge('playlistItems.list')
+
+    summary = tracker.summary()
+    assert summary['used'] == 102
+    assert summary['remaining'] == 898
+    assert summary['by_method'] == {'search.list': 100, 'playlistItems.list': 2}
+
+def test_low_priority_calls_keep_the_reserve(state_path):
+    tracker = QuotaTracker(daily_limit=10, reserve=5, state_path=state_path)
+    for _ in range(5):
+        tracker.charge('videos.list', QuotaTracker.LOW)
+
+    with pytest.raises(YouTubeQuotaError):
+        tracker.charge('videos.list', QuotaTracker.LOW)
+
+    # The reserve is still there for high-priority work
+    for _ in range(5):
+        tracker.charge('videos.list', QuotaTracker.HIGH)
+    with pytest.raises(YouTubeQuotaError):
+        tracker.charge('videos.list', QuotaTracker.HIGH)
+    assert tracker.remaining() == 0
+
+def test_refused_calls_are_not_charged(state_path):
+    tracker = QuotaTracker(daily_limit=50, reserve=0, state_path=state_path)
+    with pytest.raises(YouTubeQuotaError):
+        tracker.charge('search.list')
+    assert tracker.summary()['used'] == 0
+
+def test_usage_is_shared_through_the_state_file(state_path):
+    first = QuotaTracker(daily_limit=100, reserve=0, state_path=state_path)
+    second = QuotaTracker(daily_limit=100, reserve=0, state_path=state_path)
+    first.charge('videos.list')
+    second.charge('videos.list')
+    first.charge('videos.list')
+
+    assert first.remaining() == 97
+    assert second.summary()['used'] == 3
+
+def test_usage_from_an_earlier_pacific_day_is_reset(state_path, monkeypatch):
+    with open(state_path, 'w') as f:
+        json.dump({'date': '2024-10-05', 'used': 90, 'by_method': {'search.list': 90}}, f)
+    monkeypatch.setattr(QuotaTracker, '_today', lambda self: '2024-10-06')
+
+    tracker = QuotaTracker(daily_limit=100, reserve=0, state_path=state_path)
+    assert tracker.summary() == {
+        'date': '2024-10-06', 'used': 0, 'remaining': 100, 'limit': 100, 'by_method': {},
+    }
+
+def test_budget_rolls_over_at_midnight_during_a_run(state_path, monkeypatch):
+    today = {'date': '2024-10-05'}
+    monkeypatch.setattr(QuotaTracker, '_today', lambda self: today['date'])
+    tracker = QuotaTracker(daily_limit=1, reserve=0, state_path=state_path)
+    tracker.charge('videos.list')
+    with pytest.raises(YouTubeQuotaError):
+        tracker.charge('videos.list')
+
+    today['date'] = '2024-10-06'
+    tracker.charge('videos.list')
+    assert tracker.summary()['date'] == '2024-10-06'
+    assert tracker.summary()['used'] == 1
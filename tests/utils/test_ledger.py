@@ -0,0 +1,70 @@
+import os
+import pytest
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.utils.helpers import file_checksum
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = PublicationLedger(str(tmp_path / 'ledger.db'))
+    yield ledger
+    ledger.close()
+
+def test_record_sermon_updates_the_same_row(ledger):
+    ledger.record_sermon('vid1', 'Sermon One', 'sermon-one', 10)
+    ledger.record_sermon('vid1', 'Sermon One (edited)', 'sermon-one', 11)
+
+    entry = ledger.get_by_video_id('vid1')
+    assert entry['title'] == 'Sermon One (edited)'
+    assert entry['wp_sermon_id'] == 11
+    assert ledger.is_sermon_published('vid1')
+    assert not ledger.is_sermon_published('vid2')
+
+def test_upsert_keeps_columns_that_are_not_given(ledger):
+    ledger.record_sermon('vid1', 'Sermon One', 'sermon-one', 10)
+    ledger.record_episode('abc123', 'Sermon: One', media_key='key', episode_id='ep1', video_id='vid1')
+
+    entry = ledger.get_by_video_id('vid1')
+    assert entry['wp_sermon_id'] == 10
+    assert entry['slug'] == 'sermon-one'
+    assert entry['podbean_media_key'] == 'key'
+    assert entry['podbean_episode_id'] == 'ep1'
+
+def test_episodes_are_keyed_by_checksum_not_title(ledger):
+    ledger.record_episode('checksum-a', 'Sermon: One', media_key='key-a')
+    ledger.record_episode('checksum-b', 'Sermon: One', media_key='key-b')
+
+    assert ledger.get_episode('checksum-a')['podbean_media_key'] == 'key-a'
+    assert ledger.get_episode('checksum-b')['podbean_media_key'] == 'key-b'
+    assert ledger.get_episode('checksum-c') is None
+
+def test_sync_state_round_trip(ledger):
+    assert ledger.get_sync_state('playlist:Sermons') is None
+    ledger.set_sync_state('playlist:Sermons', {'video_id': 'vid1'})
+    ledger.set_sync_state('playlist:Sermons', {'video_id': 'vid2'})
+    assert ledger.get_sync_state('playlist:Sermons') == {'video_id': 'vid2'}
+
+def test_same_audio_is_moved_without_uploading(ledger, make_processor, podbean_http, write_audio, audio_dirs):
+    processor = make_processor(ledger=ledger)
+    path = write_audio('Sermon_ One.mp3', b'audio one')
+    ledger.record_episode(file_checksum(path), 'Sermon: One', media_key='key-old')
+
+    assert processor.process_file('Sermon_ One.mp3')
+
+    assert podbean_http.count('upload') == 0
+    assert os.listdir(audio_dirs[1]) == ['Sermon_ One.mp3']
+    assert ledger.get_episode(file_checksum(os.path.join(audio_dirs[1], 'Sermon_ One.mp3')))['podbean_media_key'] == 'key-old'
+
+def test_new_audio_with_a_published_title_is_uploaded(ledger, make_processor, podbean_http, write_audio, audio_dirs):
+    processor = make_processor(ledger=ledger)
+    write_audio('Sermon_ One.mp3', b'first recording')
+    assert processor.process_file('Sermon_ One.mp3')
+    path = write_audio('Sermon_ One.mp3', b'second recording')
+    checksum = file_checksum(path)
+
+    assert processor.process_file('Sermon_ One.mp3')
+
+    assert podbean_http.count('upload') == 2
+    assert sorted(os.listdir(audio_dirs[1])) == ['Sermon_ One (2).mp3', 'Sermon_ One.mp3']
+    episode = ledger.get_episode(checksum)
+    assert episode['podbean_episode_id'] == 'ep-Sermon: One'
+    assert episode['audio_path'] == os.path.join(audio_dirs[1], 'Sermon_ One (2).mp3')
@@ -0,0 +1,143 @@
+import os
+import json
+import pytest
+from sermon_publisher.workflows.planner import ReconciliationPlanner
+from sermon_publisher.utils.ledger import PublicationLedger
+from sermon_publisher.utils.helpers import file_checksum
+
+def make_video(video_id, title, series='Letters of John', speaker='John Smith', passage='1 John 4:7-21'):
+    return {
+        'snippet': {
+            'title': title,
+            'description': f"{title}\n{passage}\nSeries: {series}\n{speaker}\nOctober 6th, 2024",
+            'resourceId': {'videoId': video_id},
+            'thumbnails': {'maxres': {'url': f"https://img/{video_id}.jpg"}},
+        }
+    }
+
+@pytest.fixture
+def planner(tmp_path):
+    return ReconciliationPlanner({
+        'snapshot_path': str(tmp_path / 'snapshot.json'),
+        'plan_path': str(tmp_path / 'plan.json'),
+    })
+
+def make_snapshot(videos, sermons=(), taxonomies=None, media=(), podbean=None):
+    snapshot = {
+        'taken_at': '2024-10-07T09:00:00',
+        'youtube': {'playlist': 'Sermons', 'videos': list(videos)},
+        'wordpress': {
+            'sermons': list(sermons),
+            'taxonomies': taxonomies or {'sermon_speaker': {}, 'sermon_series': {}, 'sermon_book': {}},
+            'media': list(media),
+        },
+    }
+    if podbean is not None:
+        snapshot['podbean'] = podbean
+    return snapshot
+
+def action_types(plan):
+    return [action['type'] for action in plan['actions']]
+
+def test_new_video_plans_terms_image_and_sermon(planner):
+    plan = planner.build_plan(make_snapshot([make_video('vid1', 'The Love of God')]))
+
+    assert action_types(plan) == [
+        ReconciliationPlanner.CREATE_TERM,
+        ReconciliationPlanner.CREATE_TERM,
+        ReconciliationPlanner.UPLOAD_IMAGE,
+        ReconciliationPlanner.CREATE_SERMON,
+    ]
+    assert plan['actions'][0] == {'type': 'create_term', 'taxonomy': 'sermon_speaker', 'name': 'John Smith'}
+    assert plan['actions'][1] == {'type': 'create_term', 'taxonomy': 'sermon_series', 'name': 'Letters of John'}
+    assert plan['actions'][2]['image_url'] == 'https://img/vid1.jpg'
+    assert plan['actions'][3]['slug'] == 'the-love-of-god'
+    assert plan['snapshot_taken_at'] == '2024-10-07T09:00:00'
+    assert plan['warnings'] == ["Video vid1: book '1 John' is not a sermon_book term and will be left empty."]
+
+def test_plan_is_saved_to_plan_path(planner):
+    plan = planner.build_plan(make_snapshot([make_video('vid1', 'The Love of God')]))
+    with open(planner.plan_path) as f:
+        assert json.load(f) == plan
+    assert planner.load_plan() == plan
+
+def test_existing_sermons_terms_and_media_are_not_planned(planner):
+    snapshot = make_snapshot(
+        [make_video('vid1', 'Published by Video'), make_video('vid2', 'Published By Slug'), make_video('vid3', 'New One')],
+        sermons=[
+            {'id': 1, 'slug': 'other-slug', 'video_id': 'vid1'},
+            {'id': 2, 'slug': 'published-by-slug', 'video_id': None},
+        ],
+        taxonomies={
+            'sermon_speaker': {'john smith': 3},
+            'sermon_series': {'Letters of John': 4},
+            'sermon_book': {'1 John': 5},
+        },
+        media=[{'id': 6, 'slug': 'letters-of-john-2'}],
+    )
+    plan = planner.build_plan(snapshot)
+
+    assert action_types(plan) == [ReconciliationPlanner.CREATE_SERMON]
+    assert plan['actions'][0]['video_id'] == 'vid3'
+    assert plan['warnings'] == []
+
+def test_shared_terms_images_and_slugs_are_planned_once(planner):
+    plan = planner.build_plan(make_snapshot([
+        make_video('vid1', 'Part One'),
+        make_video('vid2', 'Part Two', speaker='john smith'),
+        make_video('vid3', 'Part One'),
+    ]))
+
+    assert action_types(plan).count(ReconciliationPlanner.CREATE_TERM) == 2
+    assert action_types(plan).count(ReconciliationPlanner.UPLOAD_IMAGE) == 1
+    assert [action['video_id'] for action in plan['actions'] if action['type'] == 'create_sermon'] == ['vid1', 'vid2']
+
+def test_invalid_videos_are_skipped_with_a_reason(planner):
+    video = make_video('vid1', 'Broken')
+    video['snippet']['description'] = 'Only a title'
+    plan = planner.build_plan(make_snapshot([video]))
+
+    assert plan['actions'] == []
+    assert plan['skipped'][0]['video_id'] == 'vid1'
+    assert 'lines' in plan['skipped'][0]['reason']
+
+def test_audio_is_planned_by_content(planner):
+    podbean = {
+        'episodes': [{'id': 'ep1', 'title': 'Sermon: One'}],
+        'unpublished_files': [
+            {'filename': 'Sermon_ One.mp3', 'title': 'Sermon: One', 'published_as': 'Sermon: One'},
+            {'filename': 'Sermon_ One (2).mp3', 'title': 'Sermon: One', 'published_as': None},
+            {'filename': 'Sermon_ Two.mp3', 'title': 'Sermon: Two', 'published_as': None},
+        ],
+    }
+    plan = planner.build_plan({'taken_at': '2024-10-07T09:00:00', 'podbean': podbean})
+
+    assert plan['actions'] == [
+        {'type': 'move_audio', 'filename': 'Sermon_ One.mp3', 'title': 'Sermon: One', 'published_as': 'Sermon: One'},
+        {'type': 'publish_episode', 'filename': 'Sermon_ One (2).mp3', 'title': 'Sermon: One'},
+        {'type': 'publish_episode', 'filename': 'Sermon_ Two.mp3', 'title': 'Sermon: Two'},
+    ]
+    assert len(plan['warnings']) == 1
+    assert plan['warnings'][0].startswith('Sermon_ One (2).mp3')
+
+def test_snapshot_looks_up_audio_in_the_ledger(tmp_path, make_processor, write_audio, monkeypatch):
+    ledger = PublicationLedger(str(tmp_path / 'ledger.db'))
+    processor = make_processor(ledger=ledger)
+    monkeypatch.setattr(processor, 'list_episodes', lambda: [{'id': 'ep1', 'title': 'Sermon: One', 'permalink': 'x'}])
+    published = write_audio('Sermon_ One.mp3', b'already published')
+    write_audio('Sermon_ Two.mp3', b'new audio')
+    ledger.record_episode(file_checksum(published), 'Sermon: One', media_key='key-1', episode_id='ep1')
+    planner = ReconciliationPlanner(
+        {'snapshot_path': str(tmp_path / 'snapshot.json'), 'plan_path': str(tmp_path / 'plan.json')},
+        episode_processor=processor
+    )
+
+    planner.take_snapshot()
+    plan = planner.build_plan()
+    ledger.close()
+
+    assert sorted((action['type'], action['filename']) for action in plan['actions']) == [
+        ('move_audio', 'Sermon_ One.mp3'),
+        ('publish_episode', 'Sermon_ Two.mp3'),
+    ]
+    assert os.path.exists(planner.snapshot_path)